@@ -7,13 +7,15 @@ Automatically detects font, size, tracking, and kerning from document samples
 import cv2
 import numpy as np
 import pytesseract
-from pdf2image import convert_from_path
 from PIL import ImageFont, Image, ImageDraw
 import os
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 import json
 
+from helpers.raster_cache import load_page, page_count
+from helpers.width_cache import get_width
+
 
 class FontProfile:
     """Container for detected font parameters"""
@@ -206,10 +208,8 @@ class FontProfiler:
             Dictionary with test results
         """
         try:
-            font = ImageFont.truetype(font_path, int(font_size))
-
-            # Calculate scale factor from width
-            base_width = font.getlength(reference_word)
+            # Calculate scale factor from width (cached per font file and size)
+            base_width = get_width(font_path, int(font_size), reference_word)
             if base_width == 0:
                 return None
 
@@ -383,13 +383,14 @@ class FontProfiler:
             print(f"\n[*] Loading PDF: {pdf_path}")
 
         try:
-            pages = convert_from_path(pdf_path, dpi=dpi)
-            if page >= len(pages):
+            # Only the requested page is rasterized (grayscale, via the page cache)
+            n_pages = page_count(pdf_path)
+            if page >= n_pages:
                 if verbose:
-                    print(f"    ✗ Page {page} not found (document has {len(pages)} pages)")
+                    print(f"    ✗ Page {page} not found (document has {n_pages} pages)")
                 return None
 
-            image = np.array(pages[page])
+            image = load_page(pdf_path, dpi, page)
             return self.profile_document(image, dpi, verbose)
 
         except Exception as e:
@@ -3,12 +3,15 @@
 Complete analysis: Auto-detect font, then analyze redactions.
 """
 
-import cv2
 import numpy as np
 import pytesseract
 from pdf2image import convert_from_path
 from PIL import ImageFont
 import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from pipeline import find_bars
 
 FILE_PATH = "files/EFTA00037366.pdf"
 FONTS_DIR = "fonts/fonts/"
@@ -25,14 +28,14 @@ print("COMPLETE REDACTION ANALYSIS")
 print("="*100)
 
 # Load document
-pages = convert_from_path(FILE_PATH)
-img = np.array(pages[0])
-img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+# pdftoppm -gray: one channel serves both OCR and thresholding, no RGB/BGR copies
+pages = convert_from_path(FILE_PATH, first_page=1, last_page=1, grayscale=True)
+gray = np.array(pages[0])
 
 print(f"\n[STEP 1] Auto-detecting font...")
 
 # Get OCR data
-data = pytesseract.image_to_data(img_bgr, output_type=pytesseract.Output.DICT)
+data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
 
 # Collect visible text measurements
 visible_text = []
@@ -78,15 +81,7 @@ print(f"  ✓ Consistency: {best_consistency:.2f}%")
 print(f"\n[STEP 2] Finding redactions...")
 
 # Find redactions
-gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-_, thresh = cv2.threshold(gray, 10, 255, cv2.THRESH_BINARY_INV)
-contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-redactions = []
-for cnt in contours:
-    x, y, w, h = cv2.boundingRect(cnt)
-    if w > 30 and h > 10 and w/h > 1.5:
-        redactions.append((x, y, w, h))
+redactions = find_bars(gray)
 
 print(f"  ✓ Found {len(redactions)} redaction blocks")
 
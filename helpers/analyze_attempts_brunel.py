@@ -6,11 +6,13 @@ Target: 962px redaction at (2475, 3462) between "Attempts" (575, 3500) and "Brun
 """
 
 import cv2
-import numpy as np
-from pdf2image import convert_from_path
 from PIL import ImageFont, ImageDraw
-import pytesseract
 import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page_mmap
+from pipeline import column_extents
 
 FILE_PATH = "files/EFTA00037366.pdf"
 FONT_PATH = "fonts/fonts/times.ttf"
@@ -24,10 +26,8 @@ print("="*100)
 
 # Load at 1200 DPI
 print(f"\nLoading at 1200 DPI...")
-images = convert_from_path(FILE_PATH, dpi=1200)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+# Read-only memmap of the cached grayscale page (rasterized on first run)
+gray = load_page_mmap(FILE_PATH, dpi=1200)
 
 # Target redaction (found from previous search)
 target_x, target_y, target_w, target_h = 2475, 3462, 962, 213
@@ -98,8 +98,8 @@ left_region = gray[target_y:target_y+target_h, max(0, target_x-border):target_x]
 right_region = gray[target_y:target_y+target_h, target_x:target_x+min(gray.shape[1]-target_x, border)]
 
 # Subtract white (250-255) and black (0-10), keep artifacts (11-249)
-left_artifacts = ((left_region >= 11) & (left_region <= 249)).astype(np.uint8) * 255
-right_artifacts = ((right_region >= 11) & (right_region <= 249)).astype(np.uint8) * 255
+left_artifacts = cv2.inRange(left_region, 11, 249)
+right_artifacts = cv2.inRange(right_region, 11, 249)
 
 # Exclude corners (top/bottom 10%)
 top_cutoff = int(target_h * 0.1)
@@ -109,36 +109,24 @@ left_middle = left_artifacts[top_cutoff:bottom_cutoff, :]
 right_middle = right_artifacts[top_cutoff:bottom_cutoff, :]
 
 # Analyze left edge (first letter)
-left_artifact_count = np.sum(left_middle > 0)
-left_has_upper = False
-left_has_lower = False
-
-for col_idx in range(left_middle.shape[1]):
-    col = left_middle[:, col_idx]
-    dark_rows = np.where(col > 0)[0]
-    if len(dark_rows) > 10:
-        position = dark_rows[0]
-        mid_h = bottom_cutoff - top_cutoff
-        if position < mid_h * 0.3:
-            left_has_upper = True
-        elif position > mid_h * 0.7:
-            left_has_lower = True
+left_artifact_count = cv2.countNonZero(left_middle)
+
+# First artifact row of every column with more than 10 artifact pixels
+counts, first, _ = column_extents(left_middle)
+position = first[counts > 10]
+mid_h = bottom_cutoff - top_cutoff
+left_has_upper = bool((position < mid_h * 0.3).any())
+left_has_lower = bool((position > mid_h * 0.7).any())
 
 # Analyze right edge (last letter)
-right_artifact_count = np.sum(right_middle > 0)
-right_has_upper = False
-right_has_lower = False
-
-for col_idx in range(right_middle.shape[1]):
-    col = right_middle[:, col_idx]
-    dark_rows = np.where(col > 0)[0]
-    if len(dark_rows) > 10:
-        position = dark_rows[0]
-        mid_h = bottom_cutoff - top_cutoff
-        if position < mid_h * 0.3:
-            right_has_upper = True
-        elif position > mid_h * 0.7:
-            right_has_lower = True
+right_artifact_count = cv2.countNonZero(right_middle)
+
+# First artifact row of every column with more than 10 artifact pixels
+counts, first, _ = column_extents(right_middle)
+position = first[counts > 10]
+mid_h = bottom_cutoff - top_cutoff
+right_has_upper = bool((position < mid_h * 0.3).any())
+right_has_lower = bool((position > mid_h * 0.7).any())
 
 print(f"  LEFT edge (first letter):")
 print(f"    Artifact pixels: {left_artifact_count}")
@@ -211,7 +199,7 @@ vis_y = max(0, target_y - 50)
 vis_w = min(gray.shape[1] - vis_x, target_w + 100)
 vis_h = min(gray.shape[0] - vis_y, target_h + 100)
 
-region = gray[vis_y:vis_y+vis_h, vis_x:vis_x+vis_w].copy()
+region = gray[vis_y:vis_y+vis_h, vis_x:vis_x+vis_w]
 region_color = cv2.cvtColor(region, cv2.COLOR_GRAY2BGR)
 
 box_x = target_x - vis_x
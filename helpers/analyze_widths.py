@@ -4,38 +4,32 @@ Analyze all redaction widths across all pages to find patterns.
 Cluster by size to identify common redaction types (names, dates, etc.)
 """
 
-import cv2
-import numpy as np
-from pdf2image import convert_from_path
 from collections import Counter
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_pages
+from pipeline import find_bars
 
 FILE_PATH = "files/EFTA00513855.pdf"
 
-def find_redactions(image_cv):
-    """Locates black bars using Computer Vision contours."""
-    gray = cv2.cvtColor(image_cv, cv2.COLOR_BGR2GRAY)
-    _, thresh = cv2.threshold(gray, 10, 255, cv2.THRESH_BINARY_INV)
-    contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-    redactions = []
-    for cnt in contours:
-        x, y, w, h = cv2.boundingRect(cnt)
-        if w > 30 and h > 10 and w/h > 1.5:
-            redactions.append((x, y, w, h))
+def find_redactions(gray):
+    """Locates black bars as dark connected components."""
+    redactions = find_bars(gray)
     return redactions
 
 print(f"Loading {FILE_PATH}...")
-pages = convert_from_path(FILE_PATH)
+# Grayscale pages from the raster cache; uncached pages are rendered in a
+# single multi-threaded pdftoppm call
+pages = list(load_pages(FILE_PATH, dpi=200))
 print(f"Loaded {len(pages)} pages\n")
 
 all_widths = []
 all_redactions = []
 
 for i, page in enumerate(pages):
-    img = np.array(page)
-    img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-
-    redactions = find_redactions(img_bgr)
+    redactions = find_redactions(page)
 
     for (x, y, w, h) in redactions:
         all_widths.append(w)
@@ -94,10 +88,8 @@ print("="*100)
 from PIL import ImageFont
 
 # Calibrate with page 1
-img = np.array(pages[0])
-img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
 import pytesseract
-data = pytesseract.image_to_data(img_bgr, output_type=pytesseract.Output.DICT)
+data = pytesseract.image_to_data(pages[0], output_type=pytesseract.Output.DICT)
 target_box = None
 for i, text in enumerate(data['text']):
     if "Contacts" in text:
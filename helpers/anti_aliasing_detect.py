@@ -8,9 +8,13 @@ redaction boxes, revealing letter shapes.
 
 import cv2
 import numpy as np
-from pdf2image import convert_from_path
 from PIL import Image, ImageFont, ImageDraw
 import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page_mmap
+from pipeline import boxes_to_tuples, locate_bars
 
 FILE_PATH = "files/EFTA00037366.pdf"
 FONT_PATH = "fonts/fonts/times.ttf"
@@ -25,27 +29,18 @@ print("="*100)
 
 # Load document at HIGH DPI (critical for detecting anti-aliasing)
 print(f"\n[STEP 1] Loading document at 1200 DPI for maximum detail...")
-images = convert_from_path(FILE_PATH, dpi=1200)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+# Read-only memmap of the cached grayscale page (rasterized on first run)
+gray = load_page_mmap(FILE_PATH, dpi=1200)
 
-print(f"  ✓ Image loaded: {img.shape[1]}x{img.shape[0]}px at 1200 DPI")
+print(f"  ✓ Image loaded: {gray.shape[1]}x{gray.shape[0]}px at 1200 DPI")
 
 # Find redactions
 print(f"\n[STEP 2] Locating redaction boxes...")
 
-# Use a more sensitive threshold to find pure black
-_, black_mask = cv2.threshold(gray, 5, 255, cv2.THRESH_BINARY_INV)
-
-# Find contours
-contours, _ = cv2.findContours(black_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-redactions = []
-for cnt in contours:
-    x, y, w, h = cv2.boundingRect(cnt)
-    if 100 < w < 1500 and h > 20:  # Reasonable text redactions
-        redactions.append((x, y, w, h))
+# Pure black (<= 5) bars, located on a 150 DPI render; exact boxes come from
+# the 1200 DPI page
+boxes = locate_bars(FILE_PATH, gray, 1200, min_w=100, max_w=1500, min_h=20)  # Reasonable text redactions
+redactions = boxes_to_tuples(boxes)
 
 redactions.sort(key=lambda b: b[1])
 print(f"  ✓ Found {len(redactions)} redaction boxes")
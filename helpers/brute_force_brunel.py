@@ -32,8 +32,9 @@ for char in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz":
     width = font.getlength(char)
     char_type = "UPPER" if char.isupper() else "lower"
     letter_widths[char] = width
-    marker = "  ← NARROWEST" if width == min(font.getlength(c) for c in letter_widths) else ""
-    marker = "  ← WIDEST" if width == max(font.getlength(c) for c in letter_widths) else marker
+    # Compare against the widths measured so far instead of re-measuring every letter
+    marker = "  ← NARROWEST" if width == min(letter_widths.values()) else ""
+    marker = "  ← WIDEST" if width == max(letter_widths.values()) else marker
     print(f"{char:<10} {width:>10.1f}px   {char_type}{marker}")
 
 # Find narrowest and widest
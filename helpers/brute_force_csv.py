@@ -3,10 +3,14 @@
 TRUE BRUTE FORCE - Test all 351 names from names.csv against redactions
 """
 
-import cv2
-import numpy as np
-from pdf2image import convert_from_path
+import bisect
 from PIL import ImageFont
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page_mmap
+from pipeline import boxes_to_tuples, locate_bars
 
 FILE_PATH = "files/EFTA00037366.pdf"
 FONT_PATH = "fonts/fonts/times.ttf"
@@ -21,10 +25,8 @@ print("="*120)
 
 # Load PDF
 print(f"\nLoading PDF at 1200 DPI...")
-images = convert_from_path(FILE_PATH, dpi=1200)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+# Read-only memmap of the cached grayscale page (rasterized on first run)
+gray = load_page_mmap(FILE_PATH, dpi=1200)
 
 # Load font
 font_size = int(12 * 1200 / 72)
@@ -32,22 +34,34 @@ font = ImageFont.truetype(FONT_PATH, font_size)
 
 # Find redactions
 print(f"Finding redactions...")
-_, black_mask = cv2.threshold(gray, 5, 255, cv2.THRESH_BINARY_INV)
-contours, _ = cv2.findContours(black_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-redactions = [(x, y, w, h) for cnt in contours for x, y, w, h in [cv2.boundingRect(cnt)] if w > 200 and h > 100]
+# Located on a 150 DPI render; exact boxes come from the 1200 DPI page
+redactions = boxes_to_tuples(locate_bars(FILE_PATH, gray, 1200, min_w=200, min_h=100))
 
 print(f"Found {len(redactions)} significant redactions")
 print(f"Testing {len(redactions)} × {len(CANDIDATES)} = {len(redactions) * len(CANDIDATES):,} combinations\n")
 
 # Analyze each redaction
 best_matches = []
+candidate_widths = [font.getlength(candidate) for candidate in CANDIDATES]
+
+# The % error |expected - w| / expected only grows as expected moves away from w,
+# so the best candidate always has the nearest width just below or just above w.
+# Index the candidates by width and only score those two width values.
+by_width = sorted(range(len(CANDIDATES)), key=candidate_widths.__getitem__)
+sorted_widths = [candidate_widths[k] for k in by_width]
+
 for i, (x, y, w, h) in enumerate(redactions):
     best_candidate = None
     best_error = 100
 
-    for candidate in CANDIDATES:
-        expected_width = font.getlength(candidate)
+    pos = bisect.bisect_left(sorted_widths, w)
+    lo = sorted_widths[max(pos - 1, 0)]
+    hi = sorted_widths[min(pos, len(sorted_widths) - 1)]
+    # Original list order, so ties resolve exactly as in a full scan
+    nearest = sorted(by_width[bisect.bisect_left(sorted_widths, lo):bisect.bisect_right(sorted_widths, hi)])
+
+    for k in nearest:
+        candidate, expected_width = CANDIDATES[k], candidate_widths[k]
         diff = abs(expected_width - w)
         pct_error = diff / expected_width * 100 if expected_width > 0 else 100
 
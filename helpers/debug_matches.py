@@ -3,11 +3,15 @@
 Debug script to see predicted widths vs actual widths for each redaction.
 """
 
-import cv2
 import numpy as np
 import pytesseract
 from pdf2image import convert_from_path
 from PIL import ImageFont, ImageDraw, Image
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from pipeline import find_bars
 
 FILE_PATH = "files/EFTA00513855.pdf"
 FONT_PATH = "fonts/fonts/times.ttf"
@@ -23,15 +27,15 @@ print("WIDTH ANALYSIS - Predicted vs Actual")
 print("="*70)
 
 # Load and calibrate
-pages = convert_from_path(FILE_PATH)
-img = np.array(pages[0])
-img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+# pdftoppm -gray: one channel serves both OCR and thresholding, no RGB/BGR copies
+pages = convert_from_path(FILE_PATH, first_page=1, last_page=1, grayscale=True)
+gray = np.array(pages[0])
 
 # Load font
 font = ImageFont.truetype(FONT_PATH, 12)
 
 # Calibrate
-data = pytesseract.image_to_data(img_bgr, output_type=pytesseract.Output.DICT)
+data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
 target_box = None
 for i, text in enumerate(data['text']):
     if CONTROL_WORD.lower() in text.lower():
@@ -49,15 +53,7 @@ print(f"  Theoretical font width: {base_len:.2f}px")
 print(f"  Scale factor: {scale_factor:.4f}")
 
 # Find redactions
-gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-_, thresh = cv2.threshold(gray, 10, 255, cv2.THRESH_BINARY_INV)
-contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-redactions = []
-for cnt in contours:
-    x, y, w, h = cv2.boundingRect(cnt)
-    if w > 30 and h > 10 and w/h > 1.5:
-        redactions.append((x, y, w, h))
+redactions = find_bars(gray)
 redactions.sort(key=lambda b: b[1])
 
 print(f"\nFound {len(redactions)} redaction blocks on page 1")
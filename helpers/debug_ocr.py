@@ -6,23 +6,21 @@ Debug script to see what OCR detects on the first page of the PDF.
 import pytesseract
 import numpy as np
 from pdf2image import convert_from_path
-import cv2
 
 FILE_PATH = "files/EFTA00037366.pdf"
 
 print(f"Loading {FILE_PATH}...")
-pages = convert_from_path(FILE_PATH)
+pages = convert_from_path(FILE_PATH, grayscale=True)
 print(f"Loaded {len(pages)} pages")
 
-# Convert first page
-img = np.array(pages[0])
-img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+# First page, already 1 byte/pixel from pdftoppm -gray
+gray = np.array(pages[0])
 
-print(f"\nPage 1 size: {img.shape[1]}x{img.shape[0]}px")
+print(f"\nPage 1 size: {gray.shape[1]}x{gray.shape[0]}px")
 print("\nRunning OCR to find all text...")
 
 # Get OCR data with bounding boxes
-data = pytesseract.image_to_data(img_bgr, output_type=pytesseract.Output.DICT)
+data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
 
 print(f"\nFound {len(data['text'])} text elements")
 print("\n" + "="*60)
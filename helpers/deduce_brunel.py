@@ -2,11 +2,13 @@
 """Deduce name in 'Attempts were made to [NAME] and Brunel'"""
 
 import cv2
-import numpy as np
-from pdf2image import convert_from_path
 from PIL import ImageFont, ImageDraw
-import pytesseract
 import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page_mmap
+from ocr_cache import ocr_data
 
 FILE_PATH = "files/EFTA00037366.pdf"
 FONT_PATH = "fonts/fonts/times.ttf"
@@ -16,13 +18,11 @@ print("FORENSIC ANALYSIS: 'Attempts were made to [REDACTED] and Brunel'")
 print("="*100)
 
 # Load
-images = convert_from_path(FILE_PATH, dpi=1200)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+# Read-only memmap of the cached grayscale page (rasterized on first run)
+gray = load_page_mmap(FILE_PATH, dpi=1200)
 
 # Find words
-data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
+data = ocr_data(FILE_PATH, dpi=1200)  # Cached 300 DPI OCR, boxes in 1200 DPI pixels
 
 attempts_pos = None
 brunel_pos = None
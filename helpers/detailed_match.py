@@ -16,7 +16,7 @@ from PIL import Image, ImageFont, ImageDraw
 import os
 import sys
 sys.path.append(os.path.dirname(__file__))
-from label_utils import add_safe_header, add_multi_line_footer
+from label_utils import add_safe_header, add_multi_line_footer, hconcat_with_gutter
 
 FILE_PATH = "files/EFTA00037366.pdf"
 FONT_PATH = "fonts/fonts/times.ttf"
@@ -36,7 +36,7 @@ print("="*100)
 
 # Load document
 print(f"\n[STEP 1] Loading document at 600 DPI...")
-images = convert_from_path(FILE_PATH, dpi=600)
+images = convert_from_path(FILE_PATH, dpi=600, first_page=1, last_page=1)
 img = np.array(images[0])
 gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
 
@@ -221,11 +221,10 @@ gutter_h = 30
 gutter_v = 30
 
 # Top row with gutter
-gutter_h_img = np.ones((actual_with_header.shape[0], gutter_h, 3), dtype=np.uint8) * 255
-top_row = np.hstack([actual_with_header, gutter_h_img, template_with_header])
+top_row = hconcat_with_gutter([actual_with_header, template_with_header], gutter_h)
 
 # Bottom row with gutter
-bottom_row = np.hstack([actual_edges_with_header, gutter_h_img, template_edges_with_header])
+bottom_row = hconcat_with_gutter([actual_edges_with_header, template_edges_with_header], gutter_h)
 
 # Vertical gutter between rows
 gutter_v_img = np.ones((gutter_v, top_row.shape[1], 3), dtype=np.uint8) * 255
@@ -30,7 +30,7 @@ print("="*100)
 print(f"\n[STEP 1] Converting PDF to 600 DPI image...")
 print(f"  This captures sub-pixel details and anti-aliasing traces")
 
-images = convert_from_path(FILE_PATH, dpi=600)
+images = convert_from_path(FILE_PATH, dpi=600, first_page=1, last_page=1)
 img = np.array(images[0])
 gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
 
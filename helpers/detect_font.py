@@ -4,12 +4,15 @@ Automatic font detection - tests all fonts and finds the best match.
 Reports font, scale factor, and spacing metrics.
 """
 
-import cv2
 import numpy as np
 import pytesseract
 from pdf2image import convert_from_path
 from PIL import ImageFont
 import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from pipeline import find_bars
 
 FILE_PATH = "files/EFTA00037366.pdf"
 FONTS_DIR = "fonts/fonts/"
@@ -27,16 +30,16 @@ print("AUTOMATIC FONT DETECTION")
 print("="*100)
 
 # Load document
-pages = convert_from_path(FILE_PATH)
-img = np.array(pages[0])
-img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+# pdftoppm -gray: one channel serves both OCR and thresholding, no RGB/BGR copies
+pages = convert_from_path(FILE_PATH, grayscale=True)
+gray = np.array(pages[0])
 
 print(f"\n[*] Document: {FILE_PATH}")
 print(f"[*] Pages: {len(pages)}")
-print(f"[*] Image size: {img.shape[1]}x{img.shape[0]}px")
+print(f"[*] Image size: {gray.shape[1]}x{gray.shape[0]}px")
 
 # Get control word from OCR
-data = pytesseract.image_to_data(img_bgr, output_type=pytesseract.Output.DICT)
+data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
 
 # Find a good control word (short, confident detection)
 print(f"\n[*] Scanning for control words...")
@@ -63,15 +66,7 @@ CONTROL_HEIGHT = control_words[0][2]
 print(f"\n[*] Selected control word: '{CONTROL_WORD}' ({CONTROL_WIDTH}px wide)")
 
 # Find redactions
-gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-_, thresh = cv2.threshold(gray, 10, 255, cv2.THRESH_BINARY_INV)
-contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-redactions = []
-for cnt in contours:
-    x, y, w, h = cv2.boundingRect(cnt)
-    if w > 30 and h > 10 and w/h > 1.5:
-        redactions.append((x, y, w, h))
+redactions = find_bars(gray)
 
 print(f"[*] Found {len(redactions)} redaction blocks")
 
@@ -4,7 +4,6 @@ Better font detection - compares OCR measurements of VISIBLE text
 against each font's theoretical measurements to find the best match.
 """
 
-import cv2
 import numpy as np
 import pytesseract
 from pdf2image import convert_from_path
@@ -50,21 +49,21 @@ def detect_best_font(
     """
     # Load document
     try:
-        pages = convert_from_path(pdf_path)
+        pages = convert_from_path(pdf_path, first_page=1, last_page=1, grayscale=True)
     except Exception as e:
         if verbose:
             print(f"[ERROR] Failed to load PDF: {e}")
         return None
 
-    img = np.array(pages[0])
-    img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+    # Already 1 byte/pixel from pdftoppm -gray; Tesseract needs no color conversion
+    gray = np.array(pages[0])
 
     if verbose:
         print(f"[*] Document: {pdf_path}")
-        print(f"[*] Image size: {img.shape[1]}x{img.shape[0]}px")
+        print(f"[*] Image size: {gray.shape[1]}x{gray.shape[0]}px")
 
     # Get OCR data with measurements
-    data = pytesseract.image_to_data(img_bgr, output_type=pytesseract.Output.DICT)
+    data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
 
     # Collect high-confidence text measurements
     visible_text = []
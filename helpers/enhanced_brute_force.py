@@ -4,12 +4,15 @@ Enhanced Brute Force - Parse CSV properly, extract all name variants,
 and weight by CSV confidence markers (+, ?, ~)
 """
 
-import cv2
-import numpy as np
-from pdf2image import convert_from_path
 from PIL import ImageFont
 import csv
 import re
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page_mmap
+from pipeline import boxes_to_tuples, locate_bars
 
 FILE_PATH = "files/EFTA00037366.pdf"
 FONT_PATH = "fonts/fonts/times.ttf"
@@ -158,10 +161,8 @@ for i, c in enumerate(CANDIDATES[:20], 1):
 
 # Load PDF
 print(f"\nLoading PDF at 1200 DPI...")
-images = convert_from_path(FILE_PATH, dpi=1200)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+# Read-only memmap of the cached grayscale page (rasterized on first run)
+gray = load_page_mmap(FILE_PATH, dpi=1200)
 
 # Load font
 font_size = int(12 * 1200 / 72)
@@ -169,27 +170,25 @@ font = ImageFont.truetype(FONT_PATH, font_size)
 
 # Find redactions
 print(f"Finding redactions...")
-_, black_mask = cv2.threshold(gray, 5, 255, cv2.THRESH_BINARY_INV)
-contours, _ = cv2.findContours(black_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-redactions = [(x, y, w, h) for cnt in contours for x, y, w, h in [cv2.boundingRect(cnt)] if w > 200 and h > 100]
+# Located on a 150 DPI render; exact boxes come from the 1200 DPI page
+redactions = boxes_to_tuples(locate_bars(FILE_PATH, gray, 1200, min_w=200, min_h=100))
 
 print(f"Found {len(redactions)} significant redactions")
 print(f"Testing {len(redactions)} × {len(CANDIDATES)} = {len(redactions) * len(CANDIDATES):,} combinations\n")
 
 # Analyze each redaction
 best_matches = []
+candidate_widths = [font.getlength(item['variant']) for item in CANDIDATES]
 for i, (x, y, w, h) in enumerate(redactions):
     best_candidate = None
     best_error = 100
     best_confidence = -1
     best_raw_error = 100
 
-    for item in CANDIDATES:
+    for item, expected_width in zip(CANDIDATES, candidate_widths):
         candidate = item['variant']
         confidence = item['confidence']
 
-        expected_width = font.getlength(candidate)
         diff = abs(expected_width - w)
         pct_error = diff / expected_width * 100 if expected_width > 0 else 100
 
@@ -2,22 +2,23 @@
 """Find the sentence 'Attempts were made to [REDACTED] and Brunel'"""
 
 import cv2
-import numpy as np
-from pdf2image import convert_from_path
-import pytesseract
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page_mmap
+from ocr_cache import ocr_data
 
 FILE_PATH = "files/EFTA00037366.pdf"
 
 # Load at 1200 DPI
-images = convert_from_path(FILE_PATH, dpi=1200)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+# Read-only memmap of the cached grayscale page (rasterized on first run)
+gray = load_page_mmap(FILE_PATH, dpi=1200)
 
 print("Searching for 'Attempts' and nearby redactions...")
 
 # Get OCR
-data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
+data = ocr_data(FILE_PATH, dpi=1200)  # Cached 300 DPI OCR, boxes in 1200 DPI pixels
 
 # Find "Attempts"
 attempts_locations = []
@@ -2,16 +2,17 @@
 """Analyze redactions between 'with' and 'last'"""
 
 import cv2
-import numpy as np
-from pdf2image import convert_from_path
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page_mmap
 
 FILE_PATH = "files/EFTA00037366.pdf"
 
 # Load at 1200 DPI
-images = convert_from_path(FILE_PATH, dpi=1200)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+# Read-only memmap of the cached grayscale page (rasterized on first run)
+gray = load_page_mmap(FILE_PATH, dpi=1200)
 
 # Area of interest: between "with" (4925) and "last" (5913), around y=2600
 roi_x1, roi_y1 = 4800, 2500
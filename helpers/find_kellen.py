@@ -4,10 +4,12 @@ Find the actual "with [Kellen] last night" redaction by coordinate matching.
 """
 
 import cv2
-import numpy as np
-from pdf2image import convert_from_path
-import pytesseract
 import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page_mmap
+from ocr_cache import ocr_data
 
 FILE_PATH = "files/EFTA00037366.pdf"
 OUTPUT_DIR = "find_kellen"
@@ -19,14 +21,12 @@ print("FINDING 'with [Kellen] last night' REDACTION")
 print("="*100)
 
 # Load document
-images = convert_from_path(FILE_PATH, dpi=1200)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+# Read-only memmap of the cached grayscale page (rasterized on first run)
+gray = load_page_mmap(FILE_PATH, dpi=1200)
 
 # Get OCR data to find "with" and "last night"
 print(f"\n[STEP 1] Finding 'with' and 'last night' in document...")
-data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
+data = ocr_data(FILE_PATH, dpi=1200)  # Cached 300 DPI OCR, boxes in 1200 DPI pixels
 
 with_pos = None
 last_pos = None
@@ -87,7 +87,7 @@ if with_pos and last_pos:
         context_w = min(gray.shape[1] - context_x, (last_pos[0] + last_pos[2]) - context_x + 200)
         context_h = min(gray.shape[0] - context_y, 200)
 
-        context_region = gray[context_y:context_y+context_h, context_x:context_x+context_w].copy()
+        context_region = gray[context_y:context_y+context_h, context_x:context_x+context_w]
         context_color = cv2.cvtColor(context_region, cv2.COLOR_GRAY2BGR)
 
         # Draw red box
@@ -3,39 +3,32 @@
 Scan all pages of the PDF to find redaction blocks.
 """
 
-import cv2
-import numpy as np
-from pdf2image import convert_from_path
+import os
+import sys
 
-FILE_PATH = "files/EFTA00513855.pdf"
-
-def find_redactions(image_cv):
-    """Locates black bars using Computer Vision contours."""
-    gray = cv2.cvtColor(image_cv, cv2.COLOR_BGR2GRAY)
-    _, thresh = cv2.threshold(gray, 10, 255, cv2.THRESH_BINARY_INV)
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_pages
+from pipeline import find_bars
 
-    contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+FILE_PATH = "files/EFTA00513855.pdf"
 
-    redactions = []
-    for cnt in contours:
-        x, y, w, h = cv2.boundingRect(cnt)
-        if w > 30 and h > 10 and w/h > 1.5:
-            redactions.append((x, y, w, h))
+def find_redactions(gray):
+    """Locates black bars as dark connected components."""
+    redactions = find_bars(gray)
 
     redactions.sort(key=lambda b: b[1])
     return redactions
 
 print(f"Loading {FILE_PATH}...")
-pages = convert_from_path(FILE_PATH)
+# Grayscale pages from the raster cache; uncached pages are rendered in a
+# single multi-threaded pdftoppm call
+pages = list(load_pages(FILE_PATH, dpi=200))
 print(f"Loaded {len(pages)} pages\n")
 
 pages_with_redactions = []
 
 for i, page in enumerate(pages):
-    img = np.array(page)
-    img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-
-    redactions = find_redactions(img_bgr)
+    redactions = find_redactions(page)
 
     if redactions:
         pages_with_redactions.append((i+1, redactions))
@@ -162,19 +162,21 @@ class ForensicHaloExtractor:
         CRITICAL: Extract from the halo AREA AROUND the box, not inside it!
         """
         sides = {}
+        # The slices are views of roi; bitwise_and writes each masked side to
+        # a new array, so no explicit copies are needed
 
         # Top wall (ABOVE redaction, excluding corners)
         # Extract from box_y-pad up to box_y (the area above the redaction)
         top_start = max(0, box_y - pad)
         top_end = box_y
-        top = roi[top_start:top_end, box_x:box_x+box_w].copy()
+        top = roi[top_start:top_end, box_x:box_x+box_w]
         top_corner_mask = corner_mask[top_start:top_end, box_x:box_x+box_w]
         top = cv2.bitwise_and(top, top, mask=cv2.bitwise_not(top_corner_mask))
         sides['top'] = top
 
         # Bottom wall (BELOW redaction, excluding corners)
         # Extract from box_y+box_h to box_y+box_h+pad (the area below the redaction)
-        bottom = roi[box_y+box_h:box_y+box_h+pad, box_x:box_x+box_w].copy()
+        bottom = roi[box_y+box_h:box_y+box_h+pad, box_x:box_x+box_w]
         bottom_corner_mask = corner_mask[box_y+box_h:box_y+box_h+pad, box_x:box_x+box_w]
         bottom = cv2.bitwise_and(bottom, bottom, mask=cv2.bitwise_not(bottom_corner_mask))
         sides['bottom'] = bottom
@@ -183,14 +185,14 @@ class ForensicHaloExtractor:
         # Extract from box_x-pad up to box_x (the area left of the redaction)
         left_start = max(0, box_x - pad)
         left_end = box_x
-        left = roi[box_y:box_y+box_h, left_start:left_end].copy()
+        left = roi[box_y:box_y+box_h, left_start:left_end]
         left_corner_mask = corner_mask[box_y:box_y+box_h, left_start:left_end]
         left = cv2.bitwise_and(left, left, mask=cv2.bitwise_not(left_corner_mask))
         sides['left'] = left
 
         # Right wall (right of redaction, excluding corners)
         # Extract from box_x+box_w to box_x+box_w+pad (the area right of the redaction)
-        right = roi[box_y:box_y+box_h, box_x+box_w:box_x+box_w+pad].copy()
+        right = roi[box_y:box_y+box_h, box_x+box_w:box_x+box_w+pad]
         right_corner_mask = corner_mask[box_y:box_y+box_h, box_x+box_w:box_x+box_w+pad]
         right = cv2.bitwise_and(right, right, mask=cv2.bitwise_not(right_corner_mask))
         sides['right'] = right
@@ -243,9 +245,10 @@ class ForensicHaloExtractor:
         _, encoded = cv2.imencode('.jpg', image, encode_param)
         decoded = cv2.imdecode(encoded, cv2.IMREAD_GRAYSCALE)
 
-        # Calculate difference
-        ela = np.abs(image.astype(np.int16) - decoded.astype(np.int16))
-        ela = np.clip(ela * 10, 0, 255).astype(np.uint8)  # Amplify differences
+        # Calculate difference; absdiff and the saturating multiply stay in uint8,
+        # matching the int16 abs/clip without widening the buffers
+        ela = cv2.absdiff(image, decoded)
+        ela = cv2.multiply(ela, 10)  # Amplify differences
 
         return ela
 
@@ -388,8 +391,8 @@ class ForensicHaloExtractor:
             ]
             sheet = add_multi_line_footer(sheet, footer_lines, footer_height=80)
 
-        # Save
-        cv2.imwrite(output_path, sheet)
+        # Save; fast zlib level, the sheet is a diagnostic and PNG stays lossless
+        cv2.imwrite(output_path, sheet, [cv2.IMWRITE_PNG_COMPRESSION, 1])
 
 
 def run_forensic_analysis(
@@ -419,7 +422,7 @@ def run_forensic_analysis(
 
     # Convert PDF to image
     print(f"\n[1] Converting PDF to {extractor.dpi} DPI image...")
-    images = convert_from_path(file_path, dpi=extractor.dpi)
+    images = convert_from_path(file_path, dpi=extractor.dpi, first_page=1, last_page=1)
     img = np.array(images[0])
     gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
     print(f"    Image size: {img.shape[1]}x{img.shape[0]}px")
@@ -449,9 +452,6 @@ def run_forensic_analysis(
         # Extract halo with corner exclusion
         halo_data = extractor.extract_halo_with_corner_exclusion(gray, (x, y, w, h))
 
-        # Apply forensic enhancements
-        enhanced = extractor.apply_forensic_enhancement(halo_data['full'])
-
         # Analyze for artifacts
         artifact_metrics = extractor.analyze_halo_for_artifacts(halo_data)
 
@@ -486,6 +486,8 @@ def run_forensic_analysis(
 
         # Generate diagnostic sheet if enabled
         if diagnostic_mode and result['has_artifacts']:
+            # Enhancement views are only shown on the sheet, so only build them here
+            enhanced = extractor.apply_forensic_enhancement(halo_data['full'])
             output_path = f"{output_dir}/forensic_{i:03d}_x{x}_y{y}.png"
             extractor.create_forensic_sheet(
                 gray,
@@ -27,6 +27,7 @@ sys.path.insert(0, parent_dir)
 
 from helpers.label_utils import add_safe_header_legacy
 from helpers.forensic_halo import ForensicHaloExtractor
+from helpers.raster_cache import page_count
 from font_profiler import FontProfiler
 
 
@@ -58,12 +59,15 @@ class EvidenceCardGenerator:
             Tuple of (color_image, grayscale_image)
         """
         print(f"[*] Loading PDF: {pdf_path}")
-        images = convert_from_path(pdf_path, dpi=self.dpi)
-
-        if page >= len(images):
-            raise ValueError(f"Page {page} not found (document has {len(images)} pages)")
-
-        img = np.array(images[page])
+        n_pages = page_count(pdf_path)
+        if page >= n_pages:
+            raise ValueError(f"Page {page} not found (document has {n_pages} pages)")
+
+        # Only rasterize the requested page
+        images = convert_from_path(pdf_path, dpi=self.dpi, first_page=page + 1, last_page=page + 1)
+        img = np.array(images[0])
+        images[0].close()
+        del images
         gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
 
         print(f"    Image size: {img.shape[1]}x{img.shape[0]}px at {self.dpi} DPI")
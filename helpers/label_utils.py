@@ -12,7 +12,101 @@ artifacts or other subtle pixel patterns that may be evidentiary.
 
 import cv2
 import numpy as np
-from typing import Tuple, Optional, List
+from functools import lru_cache
+from typing import Tuple, Optional, List, Union
+
+BgColor = Union[int, Tuple[int, int, int]]
+
+
+@lru_cache(maxsize=4096)
+def _text_width(text: str, font_scale: float) -> int:
+    """Rendered pixel width of text in FONT_HERSHEY_SIMPLEX (memoized)."""
+    (width, _), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 1)
+    return width
+
+
+@lru_cache(maxsize=256)
+def _render_label(
+    text: str,
+    font_scale: float,
+    text_color: Tuple[int, ...],
+    bg_color: BgColor,
+    channels: int
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Rasterize a label once onto a bg-filled strip (memoized).
+
+    Returns the strip, its ink mask and the baseline row the text was
+    drawn on, so repeated labels become a masked copy instead of a
+    putText call.
+    """
+    (tw, th), base = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 1)
+    shape = (th + base + 4, tw + 4) + ((channels,) if channels else ())
+    strip = np.full(shape, bg_color, dtype=np.uint8)
+    cv2.putText(strip, text, (2, th + 2), cv2.FONT_HERSHEY_SIMPLEX, font_scale, text_color, 1)
+    ink = np.any(strip != np.asarray(bg_color, dtype=np.uint8), axis=-1) if channels else strip != bg_color
+    if channels:
+        ink = np.repeat(ink[:, :, None], channels, axis=2)
+    strip.setflags(write=False)
+    ink.setflags(write=False)
+    return strip, ink, th + 2
+
+
+def _blit_label(
+    result: np.ndarray,
+    text: str,
+    org: Tuple[int, int],
+    font_scale: float,
+    text_color,
+    bg_color: BgColor
+) -> None:
+    """Equivalent of cv2.putText(result, text, org, ...) using a cached strip."""
+    color = tuple(text_color) if isinstance(text_color, (tuple, list)) else (text_color,)
+    channels = result.shape[2] if result.ndim == 3 else 0
+    strip, ink, baseline = _render_label(text, font_scale, color, bg_color, channels)
+
+    y0 = org[1] - baseline
+    x0 = org[0] - 2
+    sy, sx = max(0, -y0), max(0, -x0)
+    y1 = min(result.shape[0], y0 + strip.shape[0])
+    x1 = min(result.shape[1], x0 + strip.shape[1])
+    if y1 <= y0 + sy or x1 <= x0 + sx:
+        return
+    # Copy glyph pixels only, so like putText nothing else is touched
+    np.copyto(result[y0 + sy:y1, x0 + sx:x1], strip[sy:y1 - y0, sx:x1 - x0],
+              where=ink[sy:y1 - y0, sx:x1 - x0])
+
+
+def _normalize_bg(img: np.ndarray, bg_color: BgColor) -> BgColor:
+    """Coerce bg_color to a scalar (grayscale) or per-channel tuple (color)."""
+    is_tuple = isinstance(bg_color, (tuple, list))
+    if img.ndim == 3:
+        return tuple(bg_color) if is_tuple else (bg_color,) * img.shape[2]
+    return bg_color[0] if is_tuple else bg_color
+
+
+def _pad_canvas_gray(img: np.ndarray, top: int, bottom: int, bg_color: int) -> np.ndarray:
+    """Blit a (H, W) image into a bg-filled canvas with top/bottom bands."""
+    h, w = img.shape
+    canvas = np.full((top + h + bottom, w), bg_color, dtype=img.dtype)
+    canvas[top:top + h] = img
+    return canvas
+
+
+def _pad_canvas_color(img: np.ndarray, top: int, bottom: int, bg_color: Tuple[int, ...]) -> np.ndarray:
+    """Blit an (H, W, C) image into a bg-filled canvas with top/bottom bands."""
+    h, w, c = img.shape
+    canvas = np.full((top + h + bottom, w, c), bg_color, dtype=img.dtype)
+    canvas[top:top + h] = img
+    return canvas
+
+
+def _blank_sidebar_gray(h: int, width: int, bg_color: int) -> np.ndarray:
+    return np.full((h, width), bg_color, dtype=np.uint8)
+
+
+def _blank_sidebar_color(h: int, width: int, bg_color: Tuple[int, ...]) -> np.ndarray:
+    return np.full((h, width, len(bg_color)), bg_color, dtype=np.uint8)
 
 
 def add_safe_header_legacy(
@@ -40,9 +134,9 @@ def add_safe_header_legacy(
 
     # Create header with matching dimensions and explicit dtype enforcement
     if is_color:
-        header = np.ones((header_height, w, 3), dtype=np.uint8) * 255
+        header = np.full((header_height, w, 3), 255, dtype=np.uint8)
     else:
-        header = np.ones((header_height, w), dtype=np.uint8) * 255
+        header = np.full((header_height, w), 255, dtype=np.uint8)
 
     header = np.ascontiguousarray(header)  # Ensure memory layout compatibility
 
@@ -67,7 +161,7 @@ def add_safe_header(
     header_height: int = 40,
     font_scale: float = 0.6,
     text_color: Tuple[int, int, int] = (0, 0, 0),
-    bg_color: int = 255
+    bg_color: BgColor = 255
 ) -> np.ndarray:
     """
     Adds a white header to an image so text never touches the actual forensic content.
@@ -78,26 +172,19 @@ def add_safe_header(
         header_height: Height of the header in pixels
         font_scale: Scale factor for the font
         text_color: Text color (B, G, R) for color or grayscale value for grayscale
-        bg_color: Background color (0-255)
+        bg_color: Background color (0-255), scalar or (B, G, R)
 
     Returns:
         New image with header stacked on top (header_height + H, W)
     """
-    is_color = len(base_img.shape) == 3
-    h, w = base_img.shape[:2]
-
-    # Add header using copyMakeBorder
-    if is_color:
-        result = cv2.copyMakeBorder(base_img, header_height, 0, 0, 0,
-                                    cv2.BORDER_CONSTANT, value=(bg_color, bg_color, bg_color))
-    else:
-        result = cv2.copyMakeBorder(base_img, header_height, 0, 0, 0,
-                                    cv2.BORDER_CONSTANT, value=bg_color)
+    # Dispatch once on channel layout; the canvas builders never re-check
+    pad = _pad_canvas_color if base_img.ndim == 3 else _pad_canvas_gray
+    bg = _normalize_bg(base_img, bg_color)
+    result = pad(base_img, header_height, 0, bg)
 
-    # Draw text in the header area
+    # Draw text in the header area (cached glyph strip, blitted)
     text_y = int(header_height * 0.65)
-    cv2.putText(result, label_text, (10, text_y),
-                cv2.FONT_HERSHEY_SIMPLEX, font_scale, text_color, 1)
+    _blit_label(result, label_text, (10, text_y), font_scale, text_color, bg)
 
     return result
 
@@ -108,7 +195,7 @@ def add_safe_footer(
     footer_height: int = 40,
     font_scale: float = 0.6,
     text_color: Tuple[int, int, int] = (0, 0, 0),
-    bg_color: int = 255
+    bg_color: BgColor = 255
 ) -> np.ndarray:
     """
     Adds a white footer below an image for diagnostic information.
@@ -119,26 +206,21 @@ def add_safe_footer(
         footer_height: Height of the footer in pixels
         font_scale: Scale factor for the font
         text_color: Text color (B, G, R) for color or grayscale value for grayscale
-        bg_color: Background color (0-255)
+        bg_color: Background color (0-255), scalar or (B, G, R)
 
     Returns:
         New image with footer stacked below (H + footer_height, W)
     """
-    is_color = len(base_img.shape) == 3
-    h, w = base_img.shape[:2]
+    h = base_img.shape[0]
 
-    # Add footer using copyMakeBorder
-    if is_color:
-        result = cv2.copyMakeBorder(base_img, 0, footer_height, 0, 0,
-                                    cv2.BORDER_CONSTANT, value=(bg_color, bg_color, bg_color))
-    else:
-        result = cv2.copyMakeBorder(base_img, 0, footer_height, 0, 0,
-                                    cv2.BORDER_CONSTANT, value=bg_color)
+    # Dispatch once on channel layout; the canvas builders never re-check
+    pad = _pad_canvas_color if base_img.ndim == 3 else _pad_canvas_gray
+    bg = _normalize_bg(base_img, bg_color)
+    result = pad(base_img, 0, footer_height, bg)
 
-    # Draw text in the footer area
+    # Draw text in the footer area (cached glyph strip, blitted)
     text_y = h + int(footer_height * 0.65)
-    cv2.putText(result, label_text, (10, text_y),
-                cv2.FONT_HERSHEY_SIMPLEX, font_scale, text_color, 1)
+    _blit_label(result, label_text, (10, text_y), font_scale, text_color, bg)
 
     return result
 
@@ -149,7 +231,7 @@ def add_multi_line_footer(
     footer_height: int = None,
     font_scale: float = 0.5,
     text_color: Tuple[int, int, int] = (0, 0, 0),
-    bg_color: int = 255
+    bg_color: BgColor = 255
 ) -> np.ndarray:
     """
     Adds a multi-line footer for detailed diagnostic information.
@@ -160,7 +242,7 @@ def add_multi_line_footer(
         footer_height: Height of the footer (auto-calculated if None)
         font_scale: Scale factor for the font
         text_color: Text color (B, G, R) for color or grayscale value for grayscale
-        bg_color: Background color (0-255)
+        bg_color: Background color (0-255), scalar or (B, G, R)
 
     Returns:
         New image with footer stacked below
@@ -169,24 +251,19 @@ def add_multi_line_footer(
         # Auto-calculate: ~20px per line + padding
         footer_height = len(lines) * 20 + 10
 
-    is_color = len(base_img.shape) == 3
-    h, w = base_img.shape[:2]
+    h = base_img.shape[0]
 
-    # Add footer using copyMakeBorder
-    if is_color:
-        result = cv2.copyMakeBorder(base_img, 0, footer_height, 0, 0,
-                                    cv2.BORDER_CONSTANT, value=(bg_color, bg_color, bg_color))
-    else:
-        result = cv2.copyMakeBorder(base_img, 0, footer_height, 0, 0,
-                                    cv2.BORDER_CONSTANT, value=bg_color)
+    # Dispatch once on channel layout; the canvas builders never re-check
+    pad = _pad_canvas_color if base_img.ndim == 3 else _pad_canvas_gray
+    bg = _normalize_bg(base_img, bg_color)
+    result = pad(base_img, 0, footer_height, bg)
 
-    # Draw each line in the footer area
+    # Draw each line in the footer area (cached glyph strips, blitted)
     line_height = 20
     for i, line in enumerate(lines):
         text_y = h + 15 + (i * line_height)
         if text_y < h + footer_height:
-            cv2.putText(result, line, (10, text_y),
-                       cv2.FONT_HERSHEY_SIMPLEX, font_scale, text_color, 1)
+            _blit_label(result, line, (10, text_y), font_scale, text_color, bg)
 
     return result
 
@@ -198,7 +275,7 @@ def create_labeled_grid(
     gutter_size: int = 30,
     header_height: int = 40,
     text_color: Tuple[int, int, int] = (0, 0, 0),
-    bg_color: int = 255
+    bg_color: BgColor = 255
 ) -> np.ndarray:
     """
     Creates a grid of images with headers, ensuring text never overlays content.
@@ -233,81 +310,57 @@ def create_labeled_grid(
     max_height = max(img.shape[0] for img in labeled_images)
     max_width = max(img.shape[1] for img in labeled_images)
 
-    # Pad all images to same size
-    padded_images = []
-    for img in labeled_images:
-        is_color = len(img.shape) == 3
+    # Preallocate the whole canvas filled with bg_color; the fill already
+    # provides the right/bottom padding and the gutters, so each labeled
+    # image is blitted straight into its cell with no intermediate stacking.
+    canvas_h = rows * max_height + (rows - 1) * gutter_size
+    grid_cols = min(cols, len(labeled_images))
+    canvas_w = grid_cols * max_width + (grid_cols - 1) * gutter_size
+    first = labeled_images[0]
+    canvas_shape = (canvas_h, canvas_w) + first.shape[2:]
+    canvas = np.full(canvas_shape, _normalize_bg(first, bg_color), dtype=np.uint8)
+
+    for idx, img in enumerate(labeled_images):
+        r, c = divmod(idx, cols)
+        y0 = r * (max_height + gutter_size)
+        x0 = c * (max_width + gutter_size)
         h, w = img.shape[:2]
+        canvas[y0:y0 + h, x0:x0 + w] = img
 
-        # Add white padding to match max dimensions
-        top_pad = 0
-        bottom_pad = max_height - h
-        left_pad = 0
-        right_pad = max_width - w
-
-        if is_color:
-            padded = cv2.copyMakeBorder(
-                img, top_pad, bottom_pad, left_pad, right_pad,
-                cv2.BORDER_CONSTANT, value=(bg_color, bg_color, bg_color)
-            )
-        else:
-            padded = cv2.copyMakeBorder(
-                img, top_pad, bottom_pad, left_pad, right_pad,
-                cv2.BORDER_CONSTANT, value=bg_color
-            )
-        padded_images.append(padded)
-
-    # Build grid rows
-    row_images = []
-    for r in range(rows):
-        row_images_list = []
-        for c in range(cols):
-            idx = r * cols + c
-            if idx < len(padded_images):
-                row_images_list.append(padded_images[idx])
-
-        # Add horizontal gutters between images in row
-        if row_images_list:
-            row_with_gutters = []
-            for i, img in enumerate(row_images_list):
-                row_with_gutters.append(img)
-                if i < len(row_images_list) - 1:
-                    # Create gutter
-                    next_img = row_images_list[i + 1]
-                    gutter_h = next_img.shape[0]
-                    gutter_is_color = len(next_img.shape) == 3
-                    if gutter_is_color:
-                        gutter = np.empty((gutter_h, gutter_size, 3), dtype=np.uint8)
-                        gutter.fill(bg_color)
-                    else:
-                        gutter = np.empty((gutter_h, gutter_size), dtype=np.uint8)
-                        gutter.fill(bg_color)
-                    row_with_gutters.append(gutter)
-
-            row = np.hstack(row_with_gutters)
-            row_images.append(row)
-
-    # Add vertical gutters between rows
-    if row_images:
-        final_rows = []
-        for i, row in enumerate(row_images):
-            final_rows.append(row)
-            if i < len(row_images) - 1:
-                # Create gutter
-                gutter_w = row.shape[1]
-                row_is_color = len(row.shape) == 3
-                if row_is_color:
-                    gutter = np.empty((gutter_size, gutter_w, 3), dtype=np.uint8)
-                    gutter.fill(bg_color)
-                else:
-                    gutter = np.empty((gutter_size, gutter_w), dtype=np.uint8)
-                    gutter.fill(bg_color)
-                final_rows.append(gutter)
-
-        return np.vstack(final_rows)
-
-    # Fallback for empty grid
-    return labeled_images[0] if labeled_images else np.array([])
+    return canvas
+
+
+def hconcat_with_gutter(
+    images: List[np.ndarray],
+    gutter_size: int = 30,
+    bg_color: BgColor = 255
+) -> np.ndarray:
+    """
+    Places images side by side with blank gutters between them.
+
+    One bg-filled canvas is allocated and each image copied into place once,
+    instead of np.hstack over separately allocated gutter arrays.
+
+    Args:
+        images: Images with the same number of channels
+        gutter_size: White space between images
+        bg_color: Background color for gutters and short images
+
+    Returns:
+        Composite image, as tall as the tallest input
+    """
+    height = max(img.shape[0] for img in images)
+    width = sum(img.shape[1] for img in images) + gutter_size * (len(images) - 1)
+    first = images[0]
+    canvas = np.full((height, width) + first.shape[2:], _normalize_bg(first, bg_color), dtype=np.uint8)
+
+    x0 = 0
+    for img in images:
+        h, w = img.shape[:2]
+        canvas[:h, x0:x0 + w] = img
+        x0 += w + gutter_size
+
+    return canvas
 
 
 def add_side_annotation(
@@ -317,7 +370,7 @@ def add_side_annotation(
     sidebar_width: int = 150,
     font_scale: float = 0.5,
     text_color: Tuple[int, int, int] = (0, 0, 0),
-    bg_color: int = 255
+    bg_color: BgColor = 255
 ) -> np.ndarray:
     """
     Adds a sidebar annotation to the left or right of an image.
@@ -337,30 +390,31 @@ def add_side_annotation(
     Returns:
         New image with sidebar added
     """
-    is_color = len(base_img.shape) == 3
-    h, w = base_img.shape[:2]
+    h = base_img.shape[0]
 
-    # Create sidebar
-    if is_color:
-        sidebar = np.ones((h, sidebar_width, 3), dtype=np.uint8) * bg_color
-    else:
-        sidebar = np.ones((h, sidebar_width), dtype=np.uint8) * bg_color
+    # Create sidebar (dispatch once on channel layout)
+    make_sidebar = _blank_sidebar_color if base_img.ndim == 3 else _blank_sidebar_gray
+    sidebar = make_sidebar(h, sidebar_width, _normalize_bg(base_img, bg_color))
 
     # Draw text (wrapped to fit sidebar width)
-    # Simple word wrap
+    # Greedy word wrap on measured pixel widths, leaving a 10px margin each side
     words = annotation_text.split()
     lines = []
     current_line = ""
-    max_chars_per_line = int(sidebar_width / 8)  # Approximate
+    current_w = 0
+    max_line_w = sidebar_width - 20
+    space_w = _text_width(" ", font_scale)
 
     for word in words:
-        test_line = current_line + " " + word if current_line else word
-        if len(test_line) <= max_chars_per_line:
-            current_line = test_line
+        word_w = _text_width(word, font_scale)
+        if current_line and current_w + space_w + word_w <= max_line_w:
+            current_line += " " + word
+            current_w += space_w + word_w
         else:
             if current_line:
                 lines.append(current_line)
             current_line = word
+            current_w = word_w
     if current_line:
         lines.append(current_line)
 
@@ -13,16 +13,43 @@ This ensures pixel-perfect forensic artifact integrity.
 """
 
 import cv2
+import hashlib
 import numpy as np
-from pdf2image import convert_from_path
-from PIL import Image, ImageFont, ImageDraw
+from PIL import Image, ImageDraw
 import os
 import sys
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(os.path.dirname(__file__))
 from label_utils import add_safe_header, add_multi_line_footer
 from forensic_halo import ForensicHaloExtractor
+from raster_cache import CACHE_DIR
+from pipeline import Pipeline, boxes_to_tuples, load_font, locate_bars
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Route normalize/Canny through OpenCV's T-API (OpenCL) when a device exists;
+# cv2.UMat transparently falls back to the CPU path otherwise.
+USE_UMAT = cv2.ocl.haveOpenCL()
+cv2.ocl.setUseOpenCL(USE_UMAT)
+
+
+# One row per letter; columns are read as whole arrays when scoring slots
+SIGNATURE_DTYPE = np.dtype([
+    ('letter', 'U1'),
+    ('top', 'i4'),
+    ('bottom', 'i4'),
+    ('left', 'i4'),
+    ('right', 'i4'),
+    ('total', 'i4'),
+    ('width', 'f4'),
+    ('ascender', '?'),
+    ('descender', '?'),
+])
 
 
 def verify_artifact_pattern(
@@ -75,7 +102,7 @@ def verify_artifact_pattern(
 
     # Load font for calculating letter positions
     scaled_font_size = int(font_size * dpi / 72)
-    font = ImageFont.truetype(font_path, scaled_font_size)
+    font = load_font(font_path, scaled_font_size)
 
     # Calculate expected letter positions
     # We divide the redaction width into character positions
@@ -168,12 +195,110 @@ def verify_artifact_pattern(
     }
 
 
+def _alphabet_edge_counts(font, letters: str, cell: int = 200) -> Dict[str, np.ndarray]:
+    """
+    Render all letters into one strip of fixed cells and Canny it once.
+
+    Each letter sits at (50, 50) in its own cell x cell square, exactly as
+    in a standalone 200x200 template, so per-letter quadrant counts match
+    rendering the letters one by one.
+
+    Returns per-letter arrays of 'top', 'bottom', 'left', 'right' and
+    'total' edge pixel counts, in the order of `letters`.
+    """
+    n = len(letters)
+    strip = Image.new('L', (cell * n, cell), 255)
+    draw = ImageDraw.Draw(strip)
+    for i, letter in enumerate(letters):
+        draw.text((i * cell + 50, 50), letter, font=font, fill=0)
+
+    edges = cv2.Canny(cv2.UMat(np.array(strip)), 50, 150).get() > 0
+
+    # Column counts per cell: (n, cell)
+    cols_top = np.count_nonzero(edges[:cell // 2], axis=0).reshape(n, cell)
+    cols_bottom = np.count_nonzero(edges[cell // 2:], axis=0).reshape(n, cell)
+    cols_all = cols_top + cols_bottom
+
+    return {
+        'top': cols_top.sum(axis=1),
+        'bottom': cols_bottom.sum(axis=1),
+        'left': cols_all[:, :cell // 4].sum(axis=1),
+        'right': cols_all[:, 3 * cell // 4:].sum(axis=1),
+        'total': cols_all.sum(axis=1),
+    }
+
+
+def _cached_alphabet_edge_counts(font_path: str, font_size_px: int, letters: str) -> Dict[str, np.ndarray]:
+    """
+    _alphabet_edge_counts() plus per-letter advance widths, memoized on disk.
+
+    The signatures only depend on the font file, pixel size and alphabet, so
+    they are stored as an .npz next to the raster cache and reused across runs.
+    """
+    abspath = os.path.abspath(font_path)
+    key = f"{abspath}|{os.stat(abspath).st_mtime}|{font_size_px}|{letters}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+    path = os.path.join(CACHE_DIR, f"letter_sigs_{digest}.npz")
+
+    if os.path.exists(path):
+        with np.load(path) as cached:
+            return {name: cached[name] for name in cached.files}
+
+    font = load_font(font_path, font_size_px)
+    counts = _alphabet_edge_counts(font, letters)
+    counts['widths'] = np.array([font.getlength(letter) for letter in letters], dtype=np.float64)
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(tmp_path, **counts)
+    os.replace(tmp_path, path)
+    return counts
+
+
+def _column_prefix_counts(strip: np.ndarray, width: int) -> np.ndarray:
+    """
+    Cumulative edge-pixel count over the columns of a strip, via cv2.integral.
+
+    Returns a (width + 1,) array where entry i is the number of edge pixels in
+    columns [0, i); columns past the strip's own width add nothing.
+    """
+    prefix = np.zeros(width + 1, dtype=np.int64)
+    if strip.size:
+        integ = cv2.integral((strip > 0).astype(np.uint8))  # (H+1, W+1)
+        n = min(strip.shape[1], width)
+        prefix[:n + 1] = integ[-1, :n + 1]
+        prefix[n + 1:] = prefix[n]
+    return prefix
+
+
+def _score_slot_numpy(sig_top: np.ndarray, sig_bottom: np.ndarray, sig_total: np.ndarray,
+                      top: int, bot: int) -> np.ndarray:
+    """Similarity (0-100) of one slot's top/bottom edge counts to every letter."""
+    diff = np.abs(sig_top - top) + np.abs(sig_bottom - bot)
+    max_edges = np.maximum(np.maximum(sig_total, top + bot), 1)
+    return (100 * (1 - diff / (2 * max_edges))).astype(np.float32)
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _score_slot(sig_top, sig_bottom, sig_total, top, bot):
+        # Fused diff + max + similarity, one pass over the signature table
+        similarity = np.empty(sig_top.shape[0], dtype=np.float32)
+        for k in range(sig_top.shape[0]):
+            diff = abs(sig_top[k] - top) + abs(sig_bottom[k] - bot)
+            max_edges = max(float(sig_total[k]), float(top + bot), 1.0)
+            similarity[k] = 100.0 * (1.0 - diff / (2.0 * max_edges))
+        return similarity
+else:
+    _score_slot = _score_slot_numpy
+
+
 def create_letter_signatures(
     font_path: str,
     font_size: int = 12,
     dpi: int = 600,
     scale_factor: float = 10.2346
-) -> Dict[str, Dict]:
+) -> np.ndarray:
     """
     Create letter signatures for edge pattern matching.
 
@@ -184,51 +309,231 @@ def create_letter_signatures(
         scale_factor: Scale factor for width calculations
 
     Returns:
-        Dictionary mapping letters to their signature data
+        SIGNATURE_DTYPE array with one row per letter, so scoring reads
+        whole columns (signatures['top'], ...) instead of per-letter dicts
     """
     scaled_font_size = int(font_size * dpi / 72)
-    font = ImageFont.truetype(font_path, scaled_font_size)
 
     LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
-    letter_signatures = {}
 
-    for letter in LETTERS:
-        # Render letter
-        template_size = (200, 200)
-        template = Image.new('L', template_size, 255)
-        draw = ImageDraw.Draw(template)
-        draw.text((50, 50), letter, font=font, fill=0)
+    # One render + one Canny pass for the whole alphabet, cached across runs
+    counts = _cached_alphabet_edge_counts(font_path, scaled_font_size, LETTERS)
 
-        # Convert to numpy
-        letter_np = np.array(template)
+    signatures = np.zeros(len(LETTERS), dtype=SIGNATURE_DTYPE)
+    signatures['letter'] = list(LETTERS)
+    signatures['top'] = counts['top']
+    signatures['bottom'] = counts['bottom']
+    signatures['left'] = counts['left']
+    signatures['right'] = counts['right']
+    signatures['total'] = counts['total']
+    signatures['width'] = counts['widths'] * scale_factor
+    signatures['ascender'] = signatures['top'] > signatures['bottom'] * 1.5
+    signatures['descender'] = signatures['bottom'] > signatures['top'] * 1.5
 
-        # Extract edges
-        edges = cv2.Canny(letter_np, 50, 150)
+    return signatures
 
-        # Count edge pixels in different regions
-        h, w = edges.shape
 
-        # Top half (for ascenders)
-        top_half = edges[:h//2, :]
-        top_edges = np.sum(top_half > 0)
+def analyze_redaction(
+    i: int,
+    redaction: Tuple[int, int, int, int],
+    gray: np.ndarray,
+    signatures: np.ndarray,
+    output_dir: str
+) -> List[str]:
+    """
+    Slot-by-slot letter analysis of one redaction; saves its visualization.
 
-        # Bottom half (for descenders)
-        bottom_half = edges[h//2:, :]
-        bottom_edges = np.sum(bottom_half > 0)
+    Safe to run concurrently: `gray` and the signature table are only read
+    and each redaction writes its own file. Returns the report lines so the
+    caller can print them in redaction order.
+    """
+    x, y, w, h = redaction
+    lines = []
+    log = lines.append
+
+    log(f"\n{'='*100}")
+    log(f"Redaction #{i+1} at ({x}, {y}), size: {w}x{h}px")
+    log(f"{'='*100}")
+
+    # Extract artifact region with more padding
+    padding = 20
+    roi_x = max(0, x - padding)
+    roi_y = max(0, y - padding)
+    roi_w = min(gray.shape[1] - roi_x, w + padding * 2)
+    roi_h = min(gray.shape[0] - roi_y, h + padding * 2)
+
+    roi = gray[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]
+
+    # Enhance and extract edges on a UMat, downloading both once
+    enhanced_u = cv2.normalize(cv2.UMat(roi), None, 0, 255, cv2.NORM_MINMAX)
+    edges = cv2.Canny(enhanced_u, 20, 80).get()
+    enhanced = enhanced_u.get()
+
+    # The redaction box position within the ROI
+    box_x = x - roi_x
+    box_y = y - roi_y
+
+    # Analyze the top edge (where ascenders would show)
+    top_strip = edges[max(0, box_y - 8):box_y, box_x:box_x + w]
+
+    # Analyze the bottom edge (where descenders would show)
+    bottom_strip = edges[box_y + h:min(edges.shape[0], box_y + h + 8), box_x:box_x + w]
+
+    # Save visualization
+    vis = cv2.cvtColor(enhanced, cv2.COLOR_GRAY2BGR)
+    cv2.rectangle(vis, (box_x, box_y), (box_x + w, box_y + h), (0, 0, 255), 1)
+
+    # Divide the width into segments to identify individual letter positions
+    # Estimate letter count
+    avg_letter_width = 55  # At 600 DPI
+    num_letters = int(round(w / avg_letter_width))
+    num_letters = max(3, min(15, num_letters))
+
+    log(f"\nEstimated letter count: {num_letters}")
+
+    # Divide into letter slots
+    slot_width = w / num_letters
+
+    log(f"\nAnalyzing {num_letters} letter positions...")
+
+    # Analyze each letter position
+    letter_candidates = []
+
+    # Integral images once, then every slot count is a two-point lookup
+    strip_w = top_strip.shape[1]
+    cum_top = _column_prefix_counts(top_strip, strip_w)
+    cum_bot = _column_prefix_counts(bottom_strip, strip_w)
+    slot_starts = np.minimum((np.arange(num_letters) * slot_width).astype(int), strip_w)
+    slot_ends = np.minimum((np.arange(1, num_letters + 1) * slot_width).astype(int), strip_w)
+    top_per_slot = cum_top[slot_ends] - cum_top[slot_starts]
+    bot_per_slot = cum_bot[slot_ends] - cum_bot[slot_starts]
+
+    for slot in range(num_letters):
+        slot_start = int(slot * slot_width)
+        slot_end = int((slot + 1) * slot_width)
+
+        # Read this slot's counts from the precomputed arrays
+        if slot_start < top_strip.shape[1] and slot_end <= top_strip.shape[1]:
+            top_edges_count = int(top_per_slot[slot])
+            bottom_edges_count = int(bot_per_slot[slot])
+
+            # Score every letter against this pattern at once
+            similarity = _score_slot(signatures['top'], signatures['bottom'], signatures['total'],
+                                     top_edges_count, bottom_edges_count)
+
+            # Get top matches; a stable sort keeps letter order among equal
+            # scores, as the original sorted() did (only 26-52 letters)
+            best = np.argsort(-similarity, kind='stable')[:3]
+            top_3 = [(k, float(similarity[k])) for k in best]
+
+            total_width = slot_end - slot_start
+
+            # Print analysis
+            log(f"\n  Position {slot + 1} ({slot_start}-{slot_end}px, width: {total_width}px):")
+            log(f"    Edges - Top: {top_edges_count}, Bottom: {bottom_edges_count}")
+
+            for k, score in top_3:
+                if score > 50:
+                    letter = str(signatures['letter'][k])
+                    features = []
+                    if signatures['ascender'][k]:
+                        features.append("ascender")
+                    if signatures['descender'][k]:
+                        features.append("descender")
+
+                    log(f"      '{letter}': {score:.1f}% ({', '.join(features) if features else 'normal'})")
+                    letter_candidates.append((slot, letter, score))
+
+    # Best letter per slot in one pass; each slot's candidates arrive
+    # best-first from the stable sort above, so the first one wins
+    best_per_slot = {}
+    for slot, letter, score in letter_candidates:
+        best_per_slot.setdefault(slot, (letter, score))
+
+    # Try to reconstruct from candidates
+    reconstruction = []
+    if letter_candidates:
+        # Get best letter for each position
+        for slot in range(num_letters):
+            best = best_per_slot.get(slot)
+            if best:
+                if best[1] > 60:
+                    reconstruction.append(best[0])
+                else:
+                    reconstruction.append('?')
+
+        if reconstruction:
+            log(f"\n  Best reconstruction: {''.join(reconstruction)}")
+
+    # Create slot map visualization (BELOW the image, not overlaying)
+    # This shows the letter position analysis without obscuring artifacts
+    # IMPORTANT: Match color space to vis to prevent dimension mismatch
+    slot_map_h = 100
+    is_color = len(vis.shape) == 3
+    if is_color:
+        slot_map = np.ones((slot_map_h, roi_w, 3), dtype=np.uint8) * 255
+    else:
+        slot_map = np.ones((slot_map_h, roi_w), dtype=np.uint8) * 255
 
-        # Total edges
-        total_edges = np.sum(edges > 0)
+    # Determine text color based on color space
+    if is_color:
+        color_divider = (200, 200, 200)
+        color_text = (0, 0, 0)
+        color_score = (128, 128, 128)
+    else:
+        color_divider = 200
+        color_text = 0
+        color_score = 128
+
+    # Draw slot dividers
+    for slot in range(num_letters + 1):
+        slot_x = int(slot * slot_width)
+        cv2.line(slot_map, (slot_x, 0), (slot_x, slot_map_h), color_divider, 1)
+
+    # Draw slot numbers and labels
+    for slot in range(num_letters):
+        slot_start = int(slot * slot_width)
+        slot_end = int((slot + 1) * slot_width)
+        slot_center = (slot_start + slot_end) // 2
+
+        # Get best letter for this slot
+        if slot in best_per_slot:
+            best_letter, best_score = best_per_slot[slot]
+            if best_score > 60:
+                label = f"{best_letter}"
+                score_text = f"{best_score:.0f}%"
+            else:
+                label = "?"
+                score_text = "?"
+        else:
+            label = "?"
+            score_text = "N/A"
+
+        # Draw slot number
+        cv2.putText(slot_map, f"#{slot+1}", (slot_start + 5, 20),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, color_text, 1)
+
+        # Draw letter
+        cv2.putText(slot_map, label, (slot_center - 10, 50),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, color_text, 2)
+
+        # Draw score
+        cv2.putText(slot_map, score_text, (slot_center - 15, 80),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, color_score, 1)
 
-        letter_signatures[letter] = {
-            'width': font.getlength(letter) * scale_factor,
-            'top_edges': top_edges,
-            'bottom_edges': bottom_edges,
-            'total_edges': total_edges,
-            'ascender': top_edges > bottom_edges * 1.5,
-            'descender': bottom_edges > top_edges * 1.5,
-        }
+    # Stack image and slot map vertically
+    vis_with_slotmap = np.vstack([vis, slot_map])
 
-    return letter_signatures
+    # Add header with analysis summary
+    header_text = f"REDACTION #{i+1} - Estimated {num_letters} letters - Reconstruction: {''.join(reconstruction) if reconstruction else 'N/A'}"
+    vis_final = add_safe_header(vis_with_slotmap, header_text, header_height=50)
+
+    # Save analysis image
+    cv2.imwrite(f"{output_dir}/redaction_{i+1}_analysis.png", vis_final,
+                [cv2.IMWRITE_PNG_COMPRESSION, 1])  # Fast encode for debug output
+    log(f"\n  Visualization saved: {output_dir}/redaction_{i+1}_analysis.png")
+
+    return lines
 
 
 if __name__ == "__main__":
@@ -244,271 +549,38 @@ if __name__ == "__main__":
 
     # Load document
     print(f"\n[STEP 1] Loading document at 600 DPI...")
-    images = convert_from_path(FILE_PATH, dpi=600)
-    img = np.array(images[0])
-    gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+    pipeline = Pipeline(FILE_PATH, dpi=600)
+    gray = pipeline.gray
 
     # Find redactions
     print(f"\n[STEP 2] Locating redactions...")
-    _, black_mask = cv2.threshold(gray, 15, 255, cv2.THRESH_BINARY_INV)
-    contours, _ = cv2.findContours(black_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-    redactions = []
-    for cnt in contours:
-        x, y, w, h = cv2.boundingRect(cnt)
-        if 150 < w < 800 and h > 10:  # Focus on name-sized redactions
-            redactions.append((x, y, w, h))
+    # Focus on name-sized redactions; boxes are snapped to the full-DPI page so
+    # the edge strips just outside each bar really start at its border
+    redactions = boxes_to_tuples(locate_bars(pipeline.pdf_path, gray, pipeline.dpi, threshold=15,
+                                             min_w=150, max_w=800, min_h=10,
+                                             page=pipeline.page))
 
     print(f"  ✓ Found {len(redactions)} target redactions")
 
     # Font calibration
     SCALE_FACTOR = 10.2346  # From 600 DPI calibration
-    scaled_font_size = int(12 * 600 / 72)
-    font = ImageFont.truetype(FONT_PATH, scaled_font_size)
-
-    # Letter templates with their distinctive edge patterns
-    LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
 
     # Get letter widths and edge signatures
     print(f"\n[STEP 3] Building letter signature database...")
-
-    letter_signatures = {}
-
-    for letter in LETTERS:
-        # Render letter
-        template_size = (200, 200)
-        template = Image.new('L', template_size, 255)
-        draw = ImageDraw.Draw(template)
-        draw.text((50, 50), letter, font=font, fill=0)
-
-        # Convert to numpy
-        letter_np = np.array(template)
-
-        # Extract edges
-        edges = cv2.Canny(letter_np, 50, 150)
-
-        # Count edge pixels in different regions
-        h, w = edges.shape
-
-        # Top half (for ascenders)
-        top_half = edges[:h//2, :]
-        top_edges = np.sum(top_half > 0)
-
-        # Bottom half (for descenders)
-        bottom_half = edges[h//2:, :]
-        bottom_edges = np.sum(bottom_half > 0)
-
-        # Left side
-        left_quarter = edges[:, :w//4]
-        left_edges = np.sum(left_quarter > 0)
-
-        # Right side
-        right_quarter = edges[:, 3*w//4:]
-        right_edges = np.sum(right_quarter > 0)
-
-        # Total edges
-        total_edges = np.sum(edges > 0)
-
-        letter_signatures[letter] = {
-            'width': font.getlength(letter) * SCALE_FACTOR,
-            'top_edges': top_edges,
-            'bottom_edges': bottom_edges,
-            'left_edges': left_edges,
-            'right_edges': right_edges,
-            'total_edges': total_edges,
-            'ascender': top_edges > bottom_edges * 1.5,
-            'descender': bottom_edges > top_edges * 1.5,
-        }
-
-    print(f"  ✓ Built signatures for {len(letter_signatures)} letters")
+    signatures = create_letter_signatures(FONT_PATH, 12, pipeline.dpi, SCALE_FACTOR)
+    print(f"  ✓ Built signatures for {len(signatures)} letters")
 
     # Analyze each redaction
     print(f"\n[STEP 4] Analyzing redaction artifact patterns...")
 
-    for i, (x, y, w, h) in enumerate(redactions[:5]):  # Analyze first 5
-        print(f"\n{'='*100}")
-        print(f"Redaction #{i+1} at ({x}, {y}), size: {w}x{h}px")
-        print(f"{'='*100}")
-
-        # Extract artifact region with more padding
-        padding = 20
-        roi_x = max(0, x - padding)
-        roi_y = max(0, y - padding)
-        roi_w = min(gray.shape[1] - roi_x, w + padding * 2)
-        roi_h = min(gray.shape[0] - roi_y, h + padding * 2)
-
-        roi = gray[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]
-
-        # Enhance
-        enhanced = cv2.normalize(roi, None, 0, 255, cv2.NORM_MINMAX)
-
-        # Extract edges
-        edges = cv2.Canny(enhanced, 20, 80)
-
-        # The redaction box position within the ROI
-        box_x = x - roi_x
-        box_y = y - roi_y
-
-        # Analyze the top edge (where ascenders would show)
-        top_strip = edges[max(0, box_y - 8):box_y, box_x:box_x + w]
-
-        # Analyze the bottom edge (where descenders would show)
-        bottom_strip = edges[box_y + h:min(edges.shape[0], box_y + h + 8), box_x:box_x + w]
-
-        # Save visualization
-        vis = cv2.cvtColor(enhanced, cv2.COLOR_GRAY2BGR)
-        cv2.rectangle(vis, (box_x, box_y), (box_x + w, box_y + h), (0, 0, 255), 1)
-
-        # Divide the width into segments to identify individual letter positions
-        # Estimate letter count
-        avg_letter_width = 55  # At 600 DPI
-        num_letters = int(round(w / avg_letter_width))
-        num_letters = max(3, min(15, num_letters))
-
-        print(f"\nEstimated letter count: {num_letters}")
-
-        # Divide into letter slots
-        slot_width = w / num_letters
-
-        print(f"\nAnalyzing {num_letters} letter positions...")
-
-        # Analyze each letter position
-        letter_candidates = []
-
-        for slot in range(num_letters):
-            slot_start = int(slot * slot_width)
-            slot_end = int((slot + 1) * slot_width)
-
-            # Extract this slot from top and bottom strips
-            if slot_start < top_strip.shape[1] and slot_end <= top_strip.shape[1]:
-                slot_top = top_strip[:, slot_start:slot_end]
-                slot_bottom = bottom_strip[:, slot_start:slot_end] if slot_start < bottom_strip.shape[1] else np.array([])
-
-                # Count edge pixels in this slot
-                top_edges_count = np.sum(slot_top > 0)
-                bottom_edges_count = np.sum(slot_bottom > 0) if slot_bottom.size > 0 else 0
-
-                # Score each letter against this pattern
-                letter_scores = []
-
-                for letter, sig in letter_signatures.items():
-                    # Compare edge patterns
-                    top_diff = abs(sig['top_edges'] - top_edges_count)
-                    bottom_diff = abs(sig['bottom_edges'] - bottom_edges_count)
-
-                    # Normalize
-                    max_edges = max(sig['total_edges'], top_edges_count + bottom_edges_count, 1)
-                    similarity = 100 * (1 - (top_diff + bottom_diff) / (2 * max_edges))
-
-                    letter_scores.append((letter, similarity))
-
-                # Get top matches
-                letter_scores.sort(key=lambda x: x[1], reverse=True)
-                top_3 = letter_scores[:3]
-
-                total_width = slot_end - slot_start
-
-                # Print analysis
-                print(f"\n  Position {slot + 1} ({slot_start}-{slot_end}px, width: {total_width}px):")
-                print(f"    Edges - Top: {top_edges_count}, Bottom: {bottom_edges_count}")
-
-                for letter, score in top_3:
-                    if score > 50:
-                        sig = letter_signatures[letter]
-                        features = []
-                        if sig['ascender']:
-                            features.append("ascender")
-                        if sig['descender']:
-                            features.append("descender")
-
-                        print(f"      '{letter}': {score:.1f}% ({', '.join(features) if features else 'normal'})")
-                        letter_candidates.append((slot, letter, score))
-
-        # Try to reconstruct from candidates
-        if letter_candidates:
-            # Get best letter for each position
-            reconstruction = []
-            for slot in range(num_letters):
-                slot_letters = [(l, s) for pos, l, s in letter_candidates if pos == slot]
-                if slot_letters:
-                    slot_letters.sort(key=lambda x: x[1], reverse=True)
-                    best = slot_letters[0]
-                    if best[1] > 60:
-                        reconstruction.append(best[0])
-                    else:
-                        reconstruction.append('?')
-
-            if reconstruction:
-                print(f"\n  Best reconstruction: {''.join(reconstruction)}")
-
-        # Create slot map visualization (BELOW the image, not overlaying)
-        # This shows the letter position analysis without obscuring artifacts
-        # IMPORTANT: Match color space to vis to prevent dimension mismatch
-        slot_map_h = 100
-        is_color = len(vis.shape) == 3
-        if is_color:
-            slot_map = np.ones((slot_map_h, roi_w, 3), dtype=np.uint8) * 255
-        else:
-            slot_map = np.ones((slot_map_h, roi_w), dtype=np.uint8) * 255
-
-        # Determine text color based on color space
-        if is_color:
-            color_divider = (200, 200, 200)
-            color_text = (0, 0, 0)
-            color_score = (128, 128, 128)
-        else:
-            color_divider = 200
-            color_text = 0
-            color_score = 128
-
-        # Draw slot dividers
-        for slot in range(num_letters + 1):
-            slot_x = int(slot * slot_width)
-            cv2.line(slot_map, (slot_x, 0), (slot_x, slot_map_h), color_divider, 1)
-
-        # Draw slot numbers and labels
-        for slot in range(num_letters):
-            slot_start = int(slot * slot_width)
-            slot_end = int((slot + 1) * slot_width)
-            slot_center = (slot_start + slot_end) // 2
-
-            # Get best letter for this slot
-            slot_letters = [(l, s) for pos, l, s in letter_candidates if pos == slot]
-            if slot_letters:
-                slot_letters.sort(key=lambda x: x[1], reverse=True)
-                best_letter, best_score = slot_letters[0]
-                if best_score > 60:
-                    label = f"{best_letter}"
-                    score_text = f"{best_score:.0f}%"
-                else:
-                    label = "?"
-                    score_text = "?"
-            else:
-                label = "?"
-                score_text = "N/A"
-
-            # Draw slot number
-            cv2.putText(slot_map, f"#{slot+1}", (slot_start + 5, 20),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, color_text, 1)
-
-            # Draw letter
-            cv2.putText(slot_map, label, (slot_center - 10, 50),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, color_text, 2)
-
-            # Draw score
-            cv2.putText(slot_map, score_text, (slot_center - 15, 80),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, color_score, 1)
-
-        # Stack image and slot map vertically
-        vis_with_slotmap = np.vstack([vis, slot_map])
-
-        # Add header with analysis summary
-        header_text = f"REDACTION #{i+1} - Estimated {num_letters} letters - Reconstruction: {''.join(reconstruction) if reconstruction else 'N/A'}"
-        vis_final = add_safe_header(vis_with_slotmap, header_text, header_height=50)
-
-        # Save analysis image
-        cv2.imwrite(f"{OUTPUT_DIR}/redaction_{i+1}_analysis.png", vis_final)
-        print(f"\n  Visualization saved: {OUTPUT_DIR}/redaction_{i+1}_analysis.png")
+    # Redactions are independent; OpenCV releases the GIL, so threads scale
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        reports = executor.map(
+            lambda item: analyze_redaction(item[0], item[1], gray, signatures, OUTPUT_DIR),
+            enumerate(redactions[:5])  # Analyze first 5
+        )
+        for lines in reports:
+            print("\n".join(lines))
 
     print(f"\n{'='*100}")
     print(f"ANALYSIS COMPLETE")
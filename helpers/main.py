@@ -5,12 +5,17 @@ Locally adapted from the Google Colab notebook.
 """
 
 import cv2
+import functools
 import numpy as np
 import pytesseract
 import pandas as pd
-from pdf2image import convert_from_path
 from PIL import Image, ImageFont, ImageDraw
 import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_pages
+from pipeline import find_bars, ink_width
 
 
 class RedactionCracker:
@@ -22,40 +27,92 @@ class RedactionCracker:
         except:
             raise ValueError(f"Could not load font: {font_path}")
 
+        # Memoized text width: the same suspect strings are measured repeatedly
+        self.text_length = functools.lru_cache(maxsize=None)(self.font.getlength)
+
         self.px_per_pt = 0 # Will be calibrated
         self.tracking_px = 0 # Will be calibrated
 
-    def calibrate(self, image_cv, control_word):
+    def _render_control_word(self, control_word, font_px):
+        """
+        Renders the control word at a given pixel size, cropped to its ink.
+        """
+        font = ImageFont.truetype(self.font_path, font_px)
+        left, top, right, bottom = font.getbbox(control_word)
+        canvas = Image.new('L', (right - left, bottom - top), 255)
+        ImageDraw.Draw(canvas).text((-left, -top), control_word, font=font, fill=0)
+        return np.array(canvas)
+
+    def match_control_word(self, gray, control_word, dpi):
+        """
+        Locates the control word by template matching renders of it at a few
+        scales around the expected size. Returns (box, score).
+        """
+        nominal_px = self.font_size_pt * dpi / 72
+        best_box, best_score = None, -1.0
+        for scale in (0.9, 0.95, 1.0, 1.05, 1.1):
+            tpl = self._render_control_word(control_word, max(1, round(nominal_px * scale)))
+            if tpl.shape[0] > gray.shape[0] or tpl.shape[1] > gray.shape[1]:
+                continue
+            res = cv2.matchTemplate(gray, tpl, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, (mx, my) = cv2.minMaxLoc(res)
+            if max_val > best_score:
+                best_score = max_val
+                best_box = (mx, my, tpl.shape[1], tpl.shape[0])
+        return best_box, best_score
+
+    def control_word_ink_width(self, control_word, ref_px=1000):
+        """
+        Ink width of the control word at font_size_pt pixels, from a large
+        render so neither pixel rounding nor getbbox() (which can include
+        side bearings) skews it.
+        """
+        font = ImageFont.truetype(self.font_path, ref_px)
+        left, top, right, bottom = font.getbbox(control_word)
+        margin = ref_px // 10
+        canvas = Image.new('L', (right - left + 2 * margin, bottom - top + 2), 255)
+        ImageDraw.Draw(canvas).text((margin - left, 1 - top), control_word, font=font, fill=0)
+        cols = np.flatnonzero(np.array(canvas).min(axis=0) < 255)
+        return (cols[-1] - cols[0] + 1) * self.font_size_pt / ref_px
+
+    def calibrate(self, image_cv, control_word, dpi=200):
         """
         Finds a known word in the image to determine exact DPI and Tracking.
         """
         print(f"Calibrating using control word: '{control_word}'...")
 
-        # 1. OCR to find the word's bounding box
-        h, w, _ = image_cv.shape
-        data = pytesseract.image_to_data(image_cv, output_type=pytesseract.Output.DICT)
-
-        target_box = None
-        for i, text in enumerate(data['text']):
-            if control_word.lower() in text.lower():
-                # Found it
-                (x, y, w_box, h_box) = (data['left'][i], data['top'][i], data['width'][i], data['height'][i])
-                target_box = (x, y, w_box, h_box)
-                print(f"   -> Found '{text}' at width {w_box}px")
-                break
+        # 1. Template match a rendered copy of the word; OCR only as a fallback
+        if image_cv.ndim == 3:
+            gray = cv2.cvtColor(image_cv, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = image_cv
+        target_box, score = self.match_control_word(gray, control_word, dpi)
+        if target_box and score >= 0.6:
+            print(f"   -> Matched '{control_word}' at width {target_box[2]}px (score {score:.2f})")
+        else:
+            target_box = None
+            data = pytesseract.image_to_data(image_cv, output_type=pytesseract.Output.DICT)
+            for i, text in enumerate(data['text']):
+                if control_word.lower() in text.lower():
+                    # Found it
+                    (x, y, w_box, h_box) = (data['left'][i], data['top'][i], data['width'][i], data['height'][i])
+                    target_box = (x, y, w_box, h_box)
+                    print(f"   -> Found '{text}' at width {w_box}px")
+                    break
 
         if not target_box:
-            print("ERROR: Calibration Failed - Control word not found via OCR.")
+            print("ERROR: Calibration Failed - Control word not found.")
             return False
 
         # 2. Reverse Engineer the DPI/Scale
         # We assume the font size is 12pt (standard).
-        # Theoretical width without tracking:
-        base_len = self.font.getlength(control_word)
+        # Theoretical ink width of the word:
+        base_len = self.control_word_ink_width(control_word)
 
-        # If the real box is wider, the difference is Tracking (or Scale error)
-        # We assume standard scale first to find tracking.
-        real_width = target_box[2]
+        # Measure the ink on the page itself; the matched box is only as wide
+        # as the closest preset template scale
+        real_width = ink_width(gray, target_box) or target_box[2]
+        print(f"   -> Measured ink width: {real_width:.2f}px")
 
         # Simple Calibration: Calculate a global scaling factor
         # (This combines DPI and Tracking into one 'Effective Pixel Width' ratio)
@@ -63,23 +120,11 @@ class RedactionCracker:
         print(f"   -> Calibration Locked. Scale Factor: {self.scale_factor:.4f}")
         return True
 
-    def find_redactions(self, image_cv):
+    def find_redactions(self, gray):
         """
-        Locates black bars using Computer Vision contours.
+        Locates black bars in a grayscale page using connected-component stats.
         """
-        # Grayscale & Threshold
-        gray = cv2.cvtColor(image_cv, cv2.COLOR_BGR2GRAY)
-        _, thresh = cv2.threshold(gray, 10, 255, cv2.THRESH_BINARY_INV) # Invert: Black becomes White
-
-        # Find Contours
-        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-        redactions = []
-        for cnt in contours:
-            x, y, w, h = cv2.boundingRect(cnt)
-            # Filter noise: Must be wider than high, and decent size
-            if w > 30 and h > 10 and w/h > 1.5:
-                redactions.append((x, y, w, h))
+        redactions = find_bars(gray)
 
         # Sort by Y position (reading order)
         redactions.sort(key=lambda b: b[1])
@@ -90,7 +135,7 @@ class RedactionCracker:
         Checks if a name fits the width using the Calibrated Scale.
         """
         # Calculate theoretical width in standard font
-        base_width = self.font.getlength(name)
+        base_width = self.text_length(name)
 
         # Apply our calibrated scale factor
         predicted_width = base_width * self.scale_factor
@@ -144,17 +189,17 @@ def run_investigation():
     # 1. Load Document
     print(f"\n[*] Loading document...")
     if FILE_PATH.lower().endswith('.pdf'):
-        pages = convert_from_path(FILE_PATH)
+        # pdf2image's default 200 DPI; the pipeline only needs grayscale
+        pages = list(load_pages(FILE_PATH, dpi=200))
         print(f"    -> PDF loaded: {len(pages)} pages")
     else:
-        img = cv2.imread(FILE_PATH)
+        img = cv2.imread(FILE_PATH, cv2.IMREAD_GRAYSCALE)
         pages = [img]
         print(f"    -> Image loaded")
 
     # 2. Initialize Engine (calibrate on first page)
     print(f"\n[*] Initializing forensic engine...")
-    img = np.array(pages[0])
-    img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+    img = pages[0]
 
     try:
         engine = RedactionCracker(FONT_PATH, font_size_pt=12)  # Times New Roman 12pt
@@ -169,15 +214,17 @@ def run_investigation():
         print("    -> Calibration failed - cannot proceed")
         return
 
+    # Predicted widths of every name variant, computed once for all boxes
+    variants = [v for name in SUSPECT_LIST for v in (name, name.upper())]
+    pred_widths = np.fromiter((engine.text_length(v) for v in variants),
+                              dtype=np.float64, count=len(variants)) * engine.scale_factor
+
     # 4. Analyze all pages
     print(f"\n[*] Scanning all pages for redactions...")
     all_matches = []
 
-    for page_num, page in enumerate(pages, 1):
-        img = np.array(page)
-        img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-
-        redactions = engine.find_redactions(img)
+    for page_num, gray in enumerate(pages, 1):
+        redactions = engine.find_redactions(gray)
 
         if len(redactions) == 0:
             continue
@@ -188,14 +235,9 @@ def run_investigation():
         for box in redactions:
             x, y, w, h = box
 
-            matches = []
-            for name in SUSPECT_LIST:
-                variations = [name, name.upper()]
-
-                for variant in variations:
-                    match, pred_w = engine.check_width_match(variant, w, tolerance=15.0)
-                    if match:
-                        matches.append((variant, pred_w))
+            # Same test as check_width_match(variant, w, tolerance=15.0), for all variants at once
+            hits = np.flatnonzero(np.abs(pred_widths - w) <= 15.0)
+            matches = [(variants[k], float(pred_widths[k])) for k in hits]
 
             if matches:
                 for variant, pred_w in matches:
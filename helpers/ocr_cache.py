@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of Tesseract word boxes for a PDF page.
+
+Several helper scripts OCR the same unchanged page at 1200 DPI just to find
+a few anchor words, and Tesseract is the slowest step in each of them. This
+module OCRs a 300 DPI render (Tesseract's sweet spot) once, stores the
+image_to_data() dictionary as JSON next to the cached page rasters, and
+scales the word boxes to whatever DPI the caller works at.
+"""
+
+import json
+import os
+import sys
+import pytesseract
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import CACHE_DIR, _cache_path, load_page
+
+OCR_DPI = 300
+
+
+def ocr_data(pdf_path: str, dpi: int = OCR_DPI, page: int = 0) -> dict:
+    """
+    pytesseract.image_to_data() output for one page, reusing the on-disk cache.
+
+    Args:
+        pdf_path: Path to the PDF
+        dpi: DPI of the returned coordinates; OCR itself always runs at OCR_DPI
+        page: Zero-based page index
+
+    Returns:
+        Output.DICT dictionary with left/top/width/height scaled to `dpi`
+    """
+    path = _cache_path(pdf_path, OCR_DPI, page, grayscale=True, ext="ocr.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            data = json.load(f)
+    else:
+        gray = load_page(pdf_path, OCR_DPI, page)
+        data = pytesseract.image_to_data(gray, config=f'--dpi {OCR_DPI}',
+                                         output_type=pytesseract.Output.DICT)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temp name first so an interrupted run never leaves a bad cache entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    if dpi != OCR_DPI:
+        scale = dpi / OCR_DPI
+        for key in ('left', 'top', 'width', 'height'):
+            data[key] = [int(round(v * scale)) for v in data[key]]
+    return data
@@ -11,9 +11,20 @@ This script:
 
 import cv2
 import numpy as np
-from pdf2image import convert_from_path
-from PIL import Image, ImageFont, ImageDraw
+from PIL import Image, ImageDraw
 import os
+import sys
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(__file__))
+from pipeline import Pipeline, boxes_to_tuples, load_font, locate_bars
+
+# Route normalize/Canny through OpenCV's T-API (OpenCL) when a device exists;
+# cv2.UMat transparently falls back to the CPU path otherwise.
+USE_UMAT = cv2.ocl.haveOpenCL()
+cv2.ocl.setUseOpenCL(USE_UMAT)
 
 FILE_PATH = "files/EFTA00037366.pdf"
 FONT_PATH = "fonts/fonts/times.ttf"
@@ -35,85 +46,84 @@ SUSPECT_NAMES = [
     "Nadia Marcinkova"
 ]
 
-print("="*100)
-print("PATTERN MATCHING - Comparing Rendered Names to Artifacts")
-print("="*100)
-
-# Load document at high DPI
-print(f"\n[STEP 1] Loading document at 600 DPI...")
-images = convert_from_path(FILE_PATH, dpi=600)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-
-print(f"  ✓ Image loaded: {img.shape[1]}x{img.shape[0]}px")
+# Scale font for 600 DPI (12pt at 72 DPI * 600/72 = 100)
+SCALED_FONT_SIZE = int(FONT_SIZE * 600 / 72)
+SCALED_FONT = load_font(FONT_PATH, SCALED_FONT_SIZE)
 
-# Find redactions
-print(f"\n[STEP 2] Locating redaction boxes...")
-_, black_mask = cv2.threshold(gray, 15, 255, cv2.THRESH_BINARY_INV)
-contours, _ = cv2.findContours(black_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
-redactions = []
-for cnt in contours:
-    x, y, w, h = cv2.boundingRect(cnt)
-    if w > 30 and h > 10 and w/h > 1.5:
-        redactions.append((x, y, w, h))
+# Margin around each rendered name, enough to keep Canny's border handling
+# away from the glyphs
+TEMPLATE_MARGIN = 10
 
-print(f"  ✓ Found {len(redactions)} redaction boxes")
+# One canvas sized for the widest suspect, reused for every template render
+_bboxes = [SCALED_FONT.getbbox(name) for name in SUSPECT_NAMES]
+_TEMPLATE_CANVAS = Image.new('L', (max(b[2] - b[0] for b in _bboxes) + 2 * TEMPLATE_MARGIN,
+                                   max(b[3] - b[1] for b in _bboxes) + 2 * TEMPLATE_MARGIN), 255)
+_TEMPLATE_DRAW = ImageDraw.Draw(_TEMPLATE_CANVAS)
+_TEMPLATE_LOCK = threading.Lock()
 
-# For each suspect name, create a template and match
-print(f"\n[STEP 3] Pattern matching suspect names to artifacts...")
 
-font = ImageFont.truetype(FONT_PATH, FONT_SIZE)
+@lru_cache(maxsize=None)
+def _template_edges(name):
+    """
+    Render a name at 600 DPI on a tight canvas and count its Canny edge pixels.
 
-results = []
+    The canvas is the text bounding box plus TEMPLATE_MARGIN on each side,
+    drawn into the shared buffer when it fits.
 
-for name in SUSPECT_NAMES:
-    print(f"\n--- Analyzing: '{name}' ---")
+    Returns (edge_pixels, width, height).
+    """
+    bbox = SCALED_FONT.getbbox(name)
+    width = bbox[2] - bbox[0] + 2 * TEMPLATE_MARGIN
+    height = bbox[3] - bbox[1] + 2 * TEMPLATE_MARGIN
+    origin = (TEMPLATE_MARGIN - bbox[0], TEMPLATE_MARGIN - bbox[1])
 
-    # Calculate expected width in document at 600 DPI
-    text_width_theoretical = font.getlength(name)
-    expected_width = text_width_theoretical * SCALE_FACTOR
+    if width <= _TEMPLATE_CANVAS.width and height <= _TEMPLATE_CANVAS.height:
+        with _TEMPLATE_LOCK:
+            _TEMPLATE_DRAW.rectangle((0, 0, width - 1, height - 1), fill=255)
+            _TEMPLATE_DRAW.text(origin, name, font=SCALED_FONT, fill=0)
+            template = np.asarray(_TEMPLATE_CANVAS)[:height, :width].copy()
+    else:
+        canvas = Image.new('L', (width, height), 255)
+        ImageDraw.Draw(canvas).text(origin, name, font=SCALED_FONT, fill=0)
+        template = np.array(canvas)
 
-    # Find redactions with similar width
-    matching_redactions = []
-    for x, y, w, h in redactions:
-        if abs(w - expected_width) < expected_width * 0.1:  # Within 10%
-            matching_redactions.append((x, y, w, h))
+    template_edges = cv2.Canny(cv2.UMat(template), 50, 150).get()
+    return int(np.count_nonzero(template_edges)), width, height
 
-    if len(matching_redactions) == 0:
-        print(f"  No redactions match expected width of {expected_width:.0f}px")
-        continue
 
-    print(f"  Found {len(matching_redactions)} redactions with matching width")
+def analyze_suspect(name, gray, redactions, font):
+    """
+    Match one suspect name against every width-compatible redaction.
 
-    # Create a template of this name at 600 DPI
-    template_height = 200
-    template_width = int(expected_width + 100)
-    template = Image.new('L', (template_width, template_height), 255)
-    draw = ImageDraw.Draw(template)
+    `redactions` is an (N, 4) array of x, y, w, h boxes. Only reads `gray`,
+    so suspects can run concurrently. Returns the report lines and the best
+    {'name', 'match'} result (or None).
+    """
+    lines = []
+    log = lines.append
 
-    # Scale font for 600 DPI (12pt at 72 DPI * 600/72 = 100)
-    scaled_font_size = int(FONT_SIZE * 600 / 72)
-    scaled_font = ImageFont.truetype(FONT_PATH, scaled_font_size)
+    log(f"\n--- Analyzing: '{name}' ---")
 
-    # Draw text centered
-    bbox = draw.textbbox((0, 0), name, font=scaled_font)
-    text_w = bbox[2] - bbox[0]
-    text_h = bbox[3] - bbox[1]
+    # Calculate expected width in document at 600 DPI
+    text_width_theoretical = font.getlength(name)
+    expected_width = text_width_theoretical * SCALE_FACTOR
 
-    draw.text((50, (template_height - text_h)//2), name, font=scaled_font, fill=0)
+    # Find redactions with similar width (within 10%), all boxes at once
+    width_ok = np.abs(redactions[:, 2] - expected_width) < expected_width * 0.1
+    matching_redactions = boxes_to_tuples(redactions[width_ok])
 
-    # Convert to numpy
-    template_np = np.array(template)
+    if len(matching_redactions) == 0:
+        log(f"  No redactions match expected width of {expected_width:.0f}px")
+        return lines, None
 
-    # Extract edges from template
-    template_edges = cv2.Canny(template_np, 50, 150)
+    log(f"  Found {len(matching_redactions)} redactions with matching width")
 
-    # Count edge pixels
-    template_edge_pixels = np.sum(template_edges > 0)
+    # Template of this name at 600 DPI (memoized per name)
+    template_edge_pixels, template_width, template_height = _template_edges(name)
 
-    print(f"  Template created: {template_width}x{template_height}px")
-    print(f"  Edge pixels in template: {template_edge_pixels}")
+    log(f"  Template created: {template_width}x{template_height}px")
+    log(f"  Edge pixels in template: {template_edge_pixels}")
 
     # Compare to each matching redaction
     best_match = None
@@ -129,23 +139,18 @@ for name in SUSPECT_NAMES:
 
         artifact_roi = gray[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]
 
-        # Enhance contrast
-        artifact_enhanced = cv2.normalize(artifact_roi, None, 0, 255, cv2.NORM_MINMAX)
-
-        # Extract edges
-        artifact_edges = cv2.Canny(artifact_enhanced, 30, 100)
+        # Enhance contrast and extract edges without leaving the UMat
+        artifact_enhanced = cv2.normalize(cv2.UMat(artifact_roi), None, 0, 255, cv2.NORM_MINMAX)
+        artifact_edges = cv2.Canny(artifact_enhanced, 30, 100).get()
 
         # Count edge pixels in the halo (outside the redaction box)
         box_x = x - roi_x
         box_y = y - roi_y
 
-        # Create mask for halo region
-        halo_mask = np.ones_like(artifact_edges, dtype=np.uint8) * 255
-        halo_mask[box_y:box_y+h, box_x:box_x+w] = 0
-
-        # Get edges in halo only
-        halo_edges = cv2.bitwise_and(artifact_edges, artifact_edges, mask=halo_mask)
-        artifact_edge_pixels = np.sum(halo_edges > 0)
+        # Edges in halo only = all edges minus those inside the box
+        total_nz = np.count_nonzero(artifact_edges)
+        inside_nz = np.count_nonzero(artifact_edges[box_y:box_y+h, box_x:box_x+w])
+        artifact_edge_pixels = total_nz - inside_nz
 
         # Calculate similarity score
         if template_edge_pixels > 0 and artifact_edge_pixels > 0:
@@ -172,16 +177,49 @@ for name in SUSPECT_NAMES:
                 }
 
     if best_match:
-        results.append({
-            'name': name,
-            'match': best_match
-        })
-
-        print(f"  Best match at ({best_match['x']}, {best_match['y']}):")
-        print(f"    Width: {best_match['w']}px (expected: {expected_width:.0f}px)")
-        print(f"    Template edges: {best_match['template_edges']}")
-        print(f"    Artifact edges: {best_match['artifact_edges']}")
-        print(f"    Match score: {best_match['score']*100:.1f}%")
+        log(f"  Best match at ({best_match['x']}, {best_match['y']}):")
+        log(f"    Width: {best_match['w']}px (expected: {expected_width:.0f}px)")
+        log(f"    Template edges: {best_match['template_edges']}")
+        log(f"    Artifact edges: {best_match['artifact_edges']}")
+        log(f"    Match score: {best_match['score']*100:.1f}%")
+
+    return lines, ({'name': name, 'match': best_match} if best_match else None)
+
+
+print("="*100)
+print("PATTERN MATCHING - Comparing Rendered Names to Artifacts")
+print("="*100)
+
+# Load document at high DPI
+print(f"\n[STEP 1] Loading document at 600 DPI...")
+pipeline = Pipeline(FILE_PATH, dpi=600)
+gray = pipeline.gray
+
+print(f"  ✓ Image loaded: {gray.shape[1]}x{gray.shape[0]}px")
+
+# Find redactions
+print(f"\n[STEP 2] Locating redaction boxes...")
+# Exact full-DPI boxes, so the halo ring and the bar interior line up with the page
+boxes = locate_bars(pipeline.pdf_path, gray, pipeline.dpi, threshold=15, min_w=30, min_h=10,
+                   page=pipeline.page)
+redactions = boxes[boxes[:, 2] > 1.5 * boxes[:, 3]]  # (N, 4) x, y, w, h
+
+print(f"  ✓ Found {len(redactions)} redaction boxes")
+
+# For each suspect name, create a template and match
+print(f"\n[STEP 3] Pattern matching suspect names to artifacts...")
+
+font = load_font(FONT_PATH, FONT_SIZE)
+
+results = []
+
+# Suspects are independent; OpenCV releases the GIL, so threads scale
+with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+    for lines, result in executor.map(lambda name: analyze_suspect(name, gray, redactions, font),
+                                      SUSPECT_NAMES):
+        print("\n".join(lines))
+        if result:
+            results.append(result)
 
 # Print summary
 print(f"\n{'='*100}")
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Shared front end for the single-page analysis scripts.
+
+letter_reconstruction.py, pattern_match.py and main.py all start the same
+way: rasterize the page, load the document font, and find the dark
+connected components that may be redaction bars. This module holds those
+shared steps, so each script only adds its own box filter and analysis.
+"""
+
+import cv2
+import functools
+import numpy as np
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from PIL import ImageFont
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page, load_page_mmap
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+@functools.lru_cache(maxsize=None)
+def load_font(font_path: str, size_px: int) -> ImageFont.FreeTypeFont:
+    """Load a TrueType font once per (path, pixel size)."""
+    return ImageFont.truetype(font_path, size_px)
+
+
+def dark_component_stats(gray: np.ndarray, threshold: int = 15) -> np.ndarray:
+    """
+    Bounding boxes of every dark blob on a grayscale page.
+
+    Args:
+        gray: Grayscale page
+        threshold: Pixels darker than this count as ink
+
+    Returns:
+        (N, 5) connectedComponentsWithStats rows without the background row,
+        indexed with cv2.CC_STAT_*
+    """
+    _, black_mask = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY_INV)
+    _, _, stats, _ = cv2.connectedComponentsWithStats(black_mask, connectivity=8)
+    return stats[1:]  # Drop the background component
+
+
+def refine_box(gray: np.ndarray, box, threshold: int, pad: int) -> tuple:
+    """
+    Exact full-resolution bounding box for a box found on a low-DPI render.
+
+    Labels the dark pixels in a window `pad` pixels larger than the scaled
+    box and keeps the largest component, so nearby text cannot widen it.
+    Only the window is read, which keeps memory-mapped pages cheap.
+    """
+    x, y, w, h = box
+    x0, y0 = max(0, x - pad), max(0, y - pad)
+    x1, y1 = min(gray.shape[1], x + w + pad), min(gray.shape[0], y + h + pad)
+    # One compare straight off the (possibly memory-mapped) window, no contiguous copy;
+    # labelling only needs non-zero, and <= keeps THRESH_BINARY_INV's boundary
+    black_mask = np.less_equal(gray[y0:y1, x0:x1], threshold).view(np.uint8)
+    n, _, stats, _ = cv2.connectedComponentsWithStats(black_mask, connectivity=8)
+    if n < 2:
+        return box
+    best = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+    bx, by, bw, bh = (int(v) for v in stats[best, :4])
+    return (x0 + bx, y0 + by, bw, bh)
+
+
+def ink_width(gray: np.ndarray, box, threshold: int = 250) -> float:
+    """
+    Sub-pixel width of the ink of a word located by `box` on a grayscale page.
+
+    The box only locates the word (template match, scaled OCR box): the
+    window is widened on each side to absorb its error, and dark column runs
+    are kept only if they overlap the box and are not separated from it by a
+    word space. The two outermost columns count by their ink coverage.
+
+    Returns:
+        Width in pixels, or None when there is no ink under the box
+    """
+    x, y, w, h = box
+    pad = w // 8 + 2
+    x0, y0 = max(0, x - pad), max(0, y - h // 8)
+    col_min = gray[y0:y + h + h // 8, x0:x + w + pad].min(axis=0)
+    cols = np.flatnonzero(col_min < threshold)
+    if cols.size == 0:
+        return None
+
+    # Runs of dark columns separated by gaps wider than a letter gap
+    max_gap = max(2, h // 4)
+    breaks = np.flatnonzero(np.diff(cols) > max_gap)
+    starts = np.r_[cols[0], cols[breaks + 1]]
+    ends = np.r_[cols[breaks], cols[-1]]
+    inside = (ends >= x - x0) & (starts < x - x0 + w)
+    if not inside.any():
+        return None
+    first, last = starts[inside].min(), ends[inside].max()
+    coverage = (255 - col_min[[first, last]].astype(np.float64)) / 255
+    return float(last - first - 1 + coverage.sum())
+
+
+# column_extents(dark) -> (counts, first, last): per-column dark pixel count
+# and first/last dark row of a 0/255 edge-strip mask, replacing per-column
+# np.where loops. first/last are only meaningful where counts > 0.
+def _column_extents_numpy(dark):
+    """Per-column dark count and first/last dark row of a 0/255 mask."""
+    counts = cv2.reduce(dark, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S)[0] // 255
+    hit = dark > 0
+    first = hit.argmax(axis=0).astype(np.int32)
+    last = (hit.shape[0] - 1 - hit[::-1].argmax(axis=0)).astype(np.int32)
+    return counts, first, last
+
+
+if njit is not None:
+    @njit(cache=True, boundscheck=False)
+    def column_extents(dark):
+        # Fused count + first/last dark row in one row-major pass over the mask
+        n_rows, n_cols = dark.shape
+        counts = np.zeros(n_cols, dtype=np.int32)
+        first = np.zeros(n_cols, dtype=np.int32)
+        last = np.zeros(n_cols, dtype=np.int32)
+        for r in range(n_rows):
+            for c in range(n_cols):
+                if dark[r, c]:
+                    if counts[c] == 0:
+                        first[c] = r
+                    last[c] = r
+                    counts[c] += 1
+        return counts, first, last
+else:
+    column_extents = _column_extents_numpy
+
+
+def locate_bars(pdf_path: str, gray: np.ndarray, dpi: int, threshold: int = 5, pad: int = 16,
+                min_w: int = 0, max_w: int = None, min_h: int = 0,
+                coarse_dpi: int = 150, page: int = 0) -> np.ndarray:
+    """
+    Exact boxes of the redaction bars on a high-DPI page.
+
+    Bars are labelled on a cached `coarse_dpi` render of `page`, which
+    must be the page `gray` was rendered from, and only the boxes
+    that could still pass the size filter are refined with refine_box() on
+    `gray`, so a memory-mapped page is only read around the bars.
+
+    Returns:
+        (N, 4) int array of x, y, w, h with min_w < w < max_w and h > min_h,
+        in raster order
+    """
+    scale = dpi / coarse_dpi
+    stats = dark_component_stats(load_page(pdf_path, coarse_dpi, page), threshold)
+    boxes = np.rint(stats[:, :4] * scale).astype(stats.dtype)
+
+    # Coarse boxes can be off by a couple of low-res pixels per side
+    slack = int(np.ceil(4 * scale))
+    keep = (boxes[:, 2] > min_w - slack) & (boxes[:, 3] > min_h - slack)
+    if max_w is not None:
+        keep &= boxes[:, 2] < max_w + slack
+    boxes = np.array([refine_box(gray, box, threshold, pad) for box in boxes[keep]]).reshape(-1, 4)
+
+    keep = (boxes[:, 2] > min_w) & (boxes[:, 3] > min_h)
+    if max_w is not None:
+        keep &= boxes[:, 2] < max_w
+    return boxes[keep]
+
+
+def find_bars(gray: np.ndarray, threshold: int = 10) -> list:
+    """
+    Redaction bars on a 200 DPI page, labelled at full resolution.
+
+    Keeps dark blobs wider than 30px, taller than 10px and at least 1.5x
+    wider than tall, as (x, y, w, h) tuples in raster order.
+    """
+    stats = dark_component_stats(gray, threshold)
+    w = stats[:, cv2.CC_STAT_WIDTH]
+    h = stats[:, cv2.CC_STAT_HEIGHT]
+    return boxes_to_tuples(stats[(w > 30) & (h > 10) & (w > 1.5 * h)])
+
+
+# Page opened once per worker process by redaction_pool(); read with worker_page()
+_WORKER_PAGE = None
+
+
+def _init_worker(pdf_path, dpi, page, initializer, initargs):
+    global _WORKER_PAGE
+    if pdf_path is not None:
+        # Reopen the cached page as a memmap instead of pickling it to each worker
+        _WORKER_PAGE = load_page_mmap(pdf_path, dpi, page)
+    # One OpenCV thread per process to avoid oversubscribing the cores
+    cv2.setNumThreads(1)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def worker_page() -> np.ndarray:
+    """The read-only page memmap opened for this worker by redaction_pool()."""
+    return _WORKER_PAGE
+
+
+def redaction_pool(pdf_path: str = None, dpi: int = None, page: int = 0,
+                   max_workers: int = None, initializer=None, initargs=()) -> ProcessPoolExecutor:
+    """
+    Process pool for independent per-redaction work.
+
+    With `pdf_path`, each worker opens the cached page once as a memmap that
+    the mapped function reads through worker_page(). `initializer(*initargs)`
+    then sets up any per-script worker state.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                               initargs=(pdf_path, dpi, page, initializer, initargs))
+
+
+def boxes_to_tuples(stats: np.ndarray) -> list:
+    """(x, y, w, h) int tuples from component stats rows."""
+    return [tuple(int(v) for v in box) for box in stats[:, :4]]
+
+
+class Pipeline:
+    """
+    One rasterized page plus the state every analysis of it shares.
+
+    Attributes:
+        gray: Grayscale page at `dpi`
+    """
+
+    def __init__(self, pdf_path: str, dpi: int = 600, page: int = 0):
+        self.pdf_path = pdf_path
+        self.dpi = dpi
+        self.page = page
+        self.gray = load_page(pdf_path, dpi, page)
@@ -8,53 +8,87 @@ under the redaction box, like the vertical line of 'K' or the curve of 'n'.
 
 import cv2
 import numpy as np
-from pdf2image import convert_from_path
 from PIL import Image, ImageFont, ImageDraw
 import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page_mmap
+from pipeline import boxes_to_tuples, column_extents, locate_bars, redaction_pool, worker_page
 
 FILE_PATH = "files/EFTA00037366.pdf"
 FONT_PATH = "fonts/fonts/times.ttf"
 OUTPUT_DIR = "protrusion_analysis"
 
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-print("="*100)
-print("PROTRUSION DETECTION - Finding Letter Parts Extending Beyond Redactions")
-print("="*100)
-
-# Load at very high DPI to catch small protrusions
-print(f"\n[STEP 1] Loading document at 1200 DPI...")
-images = convert_from_path(FILE_PATH, dpi=1200)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
-
-print(f"  ✓ Image loaded: {img.shape[1]}x{img.shape[0]}px")
-
-# Find redactions
-print(f"\n[STEP 2] Locating redaction boxes...")
-_, black_mask = cv2.threshold(gray, 5, 255, cv2.THRESH_BINARY_INV)
-contours, _ = cv2.findContours(black_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
-redactions = []
-for cnt in contours:
-    x, y, w, h = cv2.boundingRect(cnt)
-    if 300 < w < 1500 and h > 50:  # Name-sized redactions
-        redactions.append((x, y, w, h))
+def report_protrusions(log, region, dark, h, prefix, side):
+    """
+    Classify the dark columns of one boundary strip and log each protrusion.
 
-print(f"  ✓ Found {len(redactions)} target redactions")
+    `dark` is the strip's 0/255 mask. Every column with more than 5 dark
+    pixels is reported, and all of them are saved side by side in a single
+    `<prefix>_cols.png` sprite.
+    """
+    counts, first, last = column_extents(dark)
 
-# Font for template matching
-scaled_font_size = int(12 * 1200 / 72)
-font = ImageFont.truetype(FONT_PATH, scaled_font_size)
-
-print(f"\n[STEP 3] Analyzing redaction boundaries for protrusions...")
-
-# Analyze left and right edges specifically
-for i, (x, y, w, h) in enumerate(redactions[:8]):  # First 8
-    print(f"\n{'='*100}")
-    print(f"Redaction #{i+1} at ({x}, {y}), size: {w}x{h}px")
-    print(f"{'='*100}")
+    # Find columns with significant dark pixels (potential protrusions)
+    protrusion_cols = np.flatnonzero(counts > 5)
+
+    if len(protrusion_cols) == 0:
+        log(f"  No significant protrusions on {side} edge")
+        return
+
+    log(f"  Found {len(protrusion_cols)} columns with potential protrusions")
+
+    # Analyze the vertical distribution of dark pixels
+    saved_cols = []
+    for col_idx in protrusion_cols:
+        num_dark = int(counts[col_idx])
+
+        if num_dark > 3:  # Need at least a few pixels
+            # Check the SHAPE of the protrusion
+            row_span = last[col_idx] - first[col_idx]
+            top_protrusion = first[col_idx] < h * 0.3  # Is it near the top?
+            bottom_protrusion = last[col_idx] > h * 0.7  # Near the bottom?
+            middle_protrusion = not (top_protrusion or bottom_protrusion)  # In the middle
+
+            log(f"    Column at {col_idx}px from edge: {num_dark} dark pixels")
+            log(f"      Position: Top={top_protrusion}, Middle={middle_protrusion}, Bottom={bottom_protrusion}")
+            log(f"      Span: {row_span}px vertically")
+
+            # Determine likely letter based on position
+            if top_protrusion and row_span > h * 0.5:
+                log(f"      → Likely: tall letter (b, d, f, h, k, l, t)")
+            elif bottom_protrusion:
+                log(f"      → Likely: descender (g, j, p, q, y)")
+            elif middle_protrusion:
+                log(f"      → Likely: middle letter (a, c, e, m, n, o, r, s, u, v, w, x)")
+
+            # Extract and visualize this protrusion
+            if num_dark > 5:
+                saved_cols.append(int(col_idx))
+
+    # Save all protrusion columns for inspection as one sprite (one PNG encode)
+    if saved_cols:
+        cv2.imwrite(f"{OUTPUT_DIR}/{prefix}_cols.png", region[:, saved_cols])
+        log(f"    Protrusion columns {saved_cols} saved: {OUTPUT_DIR}/{prefix}_cols.png")
+
+
+def analyze_redaction(i, box):
+    """
+    Left/right boundary protrusion analysis for one redaction.
+
+    Runs in a worker process against the shared page memmap and writes its
+    own images. Returns the report lines so the caller prints them in order.
+    """
+    x, y, w, h = box
+    gray = worker_page()
+    lines = []
+    log = lines.append
+
+    log(f"\n{'='*100}")
+    log(f"Redaction #{i+1} at ({x}, {y}), size: {w}x{h}px")
+    log(f"{'='*100}")
 
     # Extract the immediate boundary regions (just outside the box)
     boundary_width = 30  # How many pixels outside to look
@@ -69,89 +103,18 @@ for i, (x, y, w, h) in enumerate(redactions[:8]):  # First 8
     right_end = min(gray.shape[1], x + w + boundary_width)
     right_region = gray[y:y+h, right_start:right_end]
 
-    print(f"\nLeft edge analysis ({left_region.shape[1]}px wide strip):")
+    log(f"\nLeft edge analysis ({left_region.shape[1]}px wide strip):")
 
     # Look for dark pixels in the left region (protrusions from letters under the box)
     # These would be pixels that are NOT white but also not pure black
-    left_dark = left_region < 150
-    left_columns = np.sum(left_dark, axis=0)  # Count dark pixels per column
+    left_dark = cv2.inRange(left_region, 0, 149)  # 255 where dark
+    report_protrusions(log, left_region, left_dark, h, f"r{i+1}_left", "left")
 
-    # Find columns with significant dark pixels (potential protrusions)
-    protrusion_cols = np.where(left_columns > 5)[0]
-
-    if len(protrusion_cols) > 0:
-        print(f"  Found {len(protrusion_cols)} columns with potential protrusions")
-
-        # Analyze the vertical distribution of dark pixels
-        for col_idx in protrusion_cols:
-            col_pixels = left_dark[:, col_idx]
-            dark_rows = np.where(col_pixels)[0]
-
-            if len(dark_rows) > 3:  # Need at least a few pixels
-                # Check the SHAPE of the protrusion
-                row_span = dark_rows[-1] - dark_rows[0]
-                top_protrusion = dark_rows[0] < h * 0.3  # Is it near the top?
-                bottom_protrusion = dark_rows[-1] > h * 0.7  # Near the bottom?
-                middle_protrusion = not (top_protrusion or bottom_protrusion)  # In the middle
-
-                print(f"    Column at {col_idx}px from edge: {len(dark_rows)} dark pixels")
-                print(f"      Position: Top={top_protrusion}, Middle={middle_protrusion}, Bottom={bottom_protrusion}")
-                print(f"      Span: {row_span}px vertically")
-
-                # Determine likely letter based on position
-                if top_protrusion and row_span > h * 0.5:
-                    print(f"      → Likely: tall letter (b, d, f, h, k, l, t)")
-                elif bottom_protrusion:
-                    print(f"      → Likely: descender (g, j, p, q, y)")
-                elif middle_protrusion:
-                    print(f"      → Likely: middle letter (a, c, e, m, n, o, r, s, u, v, w, x)")
-
-                # Extract and visualize this protrusion
-                if len(dark_rows) > 5:
-                    protrusion_img = left_region[:, col_idx:col_idx+1]
-                    # Save for inspection
-                    cv2.imwrite(f"{OUTPUT_DIR}/r{i+1}_left_col{col_idx}.png", protrusion_img)
-
-    else:
-        print(f"  No significant protrusions on left edge")
-
-    print(f"\nRight edge analysis ({right_region.shape[1]}px wide strip):")
+    log(f"\nRight edge analysis ({right_region.shape[1]}px wide strip):")
 
     # Same analysis for right edge
-    right_dark = right_region < 150
-    right_columns = np.sum(right_dark, axis=0)
-    protrusion_cols = np.where(right_columns > 5)[0]
-
-    if len(protrusion_cols) > 0:
-        print(f"  Found {len(protrusion_cols)} columns with potential protrusions")
-
-        for col_idx in protrusion_cols:
-            col_pixels = right_dark[:, col_idx]
-            dark_rows = np.where(col_pixels)[0]
-
-            if len(dark_rows) > 3:
-                row_span = dark_rows[-1] - dark_rows[0]
-                top_protrusion = dark_rows[0] < h * 0.3
-                bottom_protrusion = dark_rows[-1] > h * 0.7
-                middle_protrusion = not (top_protrusion or bottom_protrusion)
-
-                print(f"    Column at {col_idx}px from edge: {len(dark_rows)} dark pixels")
-                print(f"      Position: Top={top_protrusion}, Middle={middle_protrusion}, Bottom={bottom_protrusion}")
-                print(f"      Span: {row_span}px vertically")
-
-                if top_protrusion and row_span > h * 0.5:
-                    print(f"      → Likely: tall letter (b, d, f, h, k, l, t)")
-                elif bottom_protrusion:
-                    print(f"      → Likely: descender (g, j, p, q, y)")
-                elif middle_protrusion:
-                    print(f"      → Likely: middle letter (a, c, e, m, n, o, r, s, u, v, w, x)")
-
-                if len(dark_rows) > 5:
-                    protrusion_img = right_region[:, col_idx:col_idx+1]
-                    cv2.imwrite(f"{OUTPUT_DIR}/r{i+1}_right_col{col_idx}.png", protrusion_img)
-
-    else:
-        print(f"  No significant protrusions on right edge")
+    right_dark = cv2.inRange(right_region, 0, 149)
+    report_protrusions(log, right_region, right_dark, h, f"r{i+1}_right", "right")
 
     # Create a visualization of the edges
     vis_edges = np.zeros((h, boundary_width * 2), dtype=np.uint8)
@@ -169,11 +132,8 @@ for i, (x, y, w, h) in enumerate(redactions[:8]):  # First 8
     vis_edges_color = cv2.cvtColor(vis_edges, cv2.COLOR_GRAY2BGR)
 
     # Highlight protrusions in red
-    left_protrusions = left_region < 150
-    right_protrusions = right_region < 150
-
-    vis_edges_color[:, :boundary_width][left_protrusions] = [0, 0, 255]
-    vis_edges_color[:, boundary_width:][right_protrusions] = [0, 0, 255]
+    vis_edges_color[:, :boundary_width][left_dark > 0] = [0, 0, 255]
+    vis_edges_color[:, boundary_width:][right_dark > 0] = [0, 0, 255]
 
     # Add labels
     cv2.putText(vis_edges_color, "LEFT EDGE", (10, 25),
@@ -182,14 +142,50 @@ for i, (x, y, w, h) in enumerate(redactions[:8]):  # First 8
                 cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
 
     cv2.imwrite(f"{OUTPUT_DIR}/r{i+1}_edges.png", vis_edges_color)
-    print(f"\n  Edge visualization saved: {OUTPUT_DIR}/r{i+1}_edges.png")
-
-# Summary
-print(f"\n{'='*100}")
-print(f"ANALYSIS COMPLETE")
-print(f"{'='*100}")
-print(f"\nEdge images and protrusion samples saved to: {OUTPUT_DIR}/")
-print(f"\nLook at the images to identify specific letter parts:")
-print(f"  - Vertical lines suggest: b, d, f, h, i, j, k, l, t")
-print(f"  - Curves suggest: a, c, e, m, n, o, r, s, u, v, w, x")
-print(f"  - Descenders suggest: g, j, p, q, y")
+    log(f"\n  Edge visualization saved: {OUTPUT_DIR}/r{i+1}_edges.png")
+
+    return lines
+
+
+if __name__ == "__main__":
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    print("="*100)
+    print("PROTRUSION DETECTION - Finding Letter Parts Extending Beyond Redactions")
+    print("="*100)
+
+    # Load at very high DPI to catch small protrusions
+    print(f"\n[STEP 1] Loading document at 1200 DPI...")
+    # Read-only memmap of the cached grayscale page (rasterized on first run)
+    gray = load_page_mmap(FILE_PATH, dpi=1200)
+
+    print(f"  ✓ Image loaded: {gray.shape[1]}x{gray.shape[0]}px")
+
+    # Find redactions
+    print(f"\n[STEP 2] Locating redaction boxes...")
+    # Find the name-sized bars on a 150 DPI render, then read exact boxes from the 1200 DPI page
+    redactions = boxes_to_tuples(locate_bars(FILE_PATH, gray, 1200, min_w=300, max_w=1500, min_h=50))
+
+    print(f"  ✓ Found {len(redactions)} target redactions")
+
+    # Font for template matching
+    scaled_font_size = int(12 * 1200 / 72)
+    font = ImageFont.truetype(FONT_PATH, scaled_font_size)
+
+    print(f"\n[STEP 3] Analyzing redaction boundaries for protrusions...")
+
+    # Analyze left and right edges specifically; redactions are independent
+    with redaction_pool(FILE_PATH, 1200, max_workers=min(8, os.cpu_count() or 1)) as executor:
+        targets = redactions[:8]  # First 8
+        for lines in executor.map(analyze_redaction, range(len(targets)), targets):
+            print("\n".join(lines))
+
+    # Summary
+    print(f"\n{'='*100}")
+    print(f"ANALYSIS COMPLETE")
+    print(f"{'='*100}")
+    print(f"\nEdge images and protrusion samples saved to: {OUTPUT_DIR}/")
+    print(f"\nLook at the images to identify specific letter parts:")
+    print(f"  - Vertical lines suggest: b, d, f, h, i, j, k, l, t")
+    print(f"  - Curves suggest: a, c, e, m, n, o, r, s, u, v, w, x")
+    print(f"  - Descenders suggest: g, j, p, q, y")
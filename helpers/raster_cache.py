@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+On-disk cache for rasterized PDF pages.
+
+Poppler rasterization at 600+ DPI dominates the runtime of most helper
+scripts, and the same page is rendered again on every run. This module
+memoizes each rendered page as a PNG under ~/.cache/unredactron, keyed by
+the PDF's absolute path, modification time, DPI and page index, so later
+runs only pay for a PNG decode.
+"""
+
+import cv2
+import hashlib
+import numpy as np
+import os
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "unredactron")
+
+
+def _cache_path(pdf_path: str, dpi: int, page: int, grayscale: bool, ext: str = "png") -> str:
+    """Cache file for one rendered page; changes whenever the PDF is modified."""
+    abspath = os.path.abspath(pdf_path)
+    mtime = os.stat(abspath).st_mtime
+    # Grayscale pages come from pdftoppm -gray, not an RGB render + cvtColor
+    mode = "pdftoppm-gray" if grayscale else "bgr"
+    key = f"{abspath}|{mtime}|{dpi}|{page}|{mode}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.{ext}")
+
+
+def _read_cached(path: str, grayscale: bool):
+    """The cached page at `path`, or None when absent or unreadable."""
+    if not os.path.exists(path):
+        return None
+    flags = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+    return cv2.imread(path, flags)
+
+
+def _store(path: str, pil_page, grayscale: bool) -> np.ndarray:
+    """Convert a rendered PIL page to OpenCV layout and write it to the cache."""
+    if grayscale:
+        # pdftoppm already rendered 1 byte/pixel; one writable copy, no cvtColor
+        img = np.array(pil_page)
+    else:
+        # asarray skips a copy; cvtColor produces the writable BGR result
+        img = cv2.cvtColor(np.asarray(pil_page), cv2.COLOR_RGB2BGR)
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Write to a temp name first so an interrupted run never leaves a bad cache entry
+    tmp_path = f"{path}.{os.getpid()}.tmp.png"
+    cv2.imwrite(tmp_path, img, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+    os.replace(tmp_path, path)
+    return img
+
+
+def page_count(pdf_path: str) -> int:
+    """Number of pages in the PDF (reads the header only, no rasterization)."""
+    return pdfinfo_from_path(pdf_path)["Pages"]
+
+
+def load_page(pdf_path: str, dpi: int, page: int = 0, grayscale: bool = True) -> np.ndarray:
+    """
+    Rasterize one PDF page, reusing the on-disk cache when possible.
+
+    Args:
+        pdf_path: Path to the PDF
+        dpi: Rasterization DPI
+        page: Zero-based page index
+        grayscale: Return (H, W) grayscale if True, else (H, W, 3) BGR
+
+    Returns:
+        The rendered page as a uint8 OpenCV image
+    """
+    path = _cache_path(pdf_path, dpi, page, grayscale)
+    cached = _read_cached(path, grayscale)
+    if cached is not None:
+        return cached
+
+    # Only rasterize the requested page
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=page + 1, last_page=page + 1,
+                               grayscale=grayscale)
+    return _store(path, images[0], grayscale)
+
+
+def load_pages(pdf_path: str, dpi: int, grayscale: bool = True):
+    """
+    Yield every page of the PDF in order.
+
+    Pages missing from the cache are rasterized in a single pdftoppm call
+    spread over several threads, instead of one call per page.
+    """
+    paths = [_cache_path(pdf_path, dpi, page, grayscale) for page in range(page_count(pdf_path))]
+    missing = [page for page, path in enumerate(paths) if not os.path.exists(path)]
+
+    rendered = {}
+    if missing:
+        first, last = missing[0], missing[-1]
+        images = convert_from_path(pdf_path, dpi=dpi, first_page=first + 1, last_page=last + 1,
+                                   thread_count=min(8, os.cpu_count() or 1), grayscale=grayscale)
+        rendered = dict(zip(range(first, last + 1), images))
+
+    for page, path in enumerate(paths):
+        if page in rendered:
+            yield _store(path, rendered.pop(page), grayscale)
+        else:
+            yield load_page(pdf_path, dpi, page, grayscale)
+
+
+def load_page_mmap(pdf_path: str, dpi: int, page: int = 0) -> np.ndarray:
+    """
+    Grayscale page as a read-only memory map of a cached .npy file.
+
+    For 1200 DPI pages, where even a PNG decode is a multi-hundred-MB copy:
+    the OS pages in only the rows that are actually read. Callers must not
+    write to the returned array.
+    """
+    path = _cache_path(pdf_path, dpi, page, grayscale=True, ext="npy")
+    if not os.path.exists(path):
+        gray = load_page(pdf_path, dpi, page)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, gray)
+        os.replace(tmp_path, path)
+        del gray
+    return np.load(path, mmap_mode="r")
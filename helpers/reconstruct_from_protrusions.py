@@ -5,38 +5,17 @@ Text Reconstruction from Protrusions - Match detected letter features to words.
 
 import cv2
 import numpy as np
-from pdf2image import convert_from_path
 from PIL import ImageFont, ImageDraw
 import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page_mmap
+from pipeline import boxes_to_tuples, column_extents, locate_bars, redaction_pool, worker_page
 
 FILE_PATH = "files/EFTA00037366.pdf"
 FONT_PATH = "fonts/fonts/times.ttf"
 
-print("="*100)
-print("TEXT RECONSTRUCTION FROM PROTRUSION PATTERNS")
-print("="*100)
-
-# Load document at 1200 DPI
-print(f"\nLoading document at 1200 DPI...")
-images = convert_from_path(FILE_PATH, dpi=1200)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
-
-# Find redactions
-_, black_mask = cv2.threshold(gray, 5, 255, cv2.THRESH_BINARY_INV)
-contours, _ = cv2.findContours(black_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-redactions = []
-for cnt in contours:
-    x, y, w, h = cv2.boundingRect(cnt)
-    if 400 < w < 800:  # Focus on name-sized
-        redactions.append((x, y, w, h))
-
-# Font for rendering
-scaled_font_size = int(12 * 1200 / 72)
-font = ImageFont.truetype(FONT_PATH, scaled_font_size)
-
 # Common first names
 NAMES = [
     "Sarah", "Kellen", "Ghislaine", "Maxwell", "Nadia", "Marcinkova",
@@ -45,12 +24,39 @@ NAMES = [
     "John", "Jane", "David", "Michael", "Jennifer"
 ]
 
-print(f"Testing {len(NAMES)} common names against protrusion patterns...")
+# Ascender/descender flags of each name's first and last letter, which only
+# depend on the name: (first_upper, first_lower, last_upper, last_lower)
+NAME_FEATURES = [(name[0] in 'bdfhklt', name[0] in 'gjpqy',
+                  name[-1] in 'bdfhklt', name[-1] in 'gjpqy') for name in NAMES]
 
-for i, (x, y, w, h) in enumerate(redactions[:5]):
-    print(f"\n{'='*100}")
-    print(f"Redaction #{i+1} at ({x}, {y}), size: {w}x{h}px")
-    print(f"{'='*100}")
+
+def edge_features(middle, mid_h):
+    """Upper/lower protrusion flags and protrusion count for one edge strip."""
+    counts, first, _ = column_extents(cv2.inRange(middle, 0, 99))  # Dark: < 100
+    position = first[(counts > 0) & (counts < 30)]
+    return {
+        'upper': bool((position < mid_h * 0.3).any()),
+        'lower': bool((position > mid_h * 0.7).any()),
+        'count': len(position),
+    }
+
+
+def analyze_redaction(i, box, name_widths, width_matches):
+    """
+    Edge features of one redaction and the NAMES consistent with them.
+
+    Runs in a worker process against the shared page memmap; name widths
+    and this redaction's row of the width match table come from the
+    caller. Returns the report lines so the caller prints them in order.
+    """
+    x, y, w, h = box
+    gray = worker_page()
+    lines = []
+    log = lines.append
+
+    log(f"\n{'='*100}")
+    log(f"Redaction #{i+1} at ({x}, {y}), size: {w}x{h}px")
+    log(f"{'='*100}")
 
     # Detect protrusions
     left_start = max(0, x - 15)
@@ -69,66 +75,22 @@ for i, (x, y, w, h) in enumerate(redactions[:5]):
     left_middle = left_region[top_cutoff:bottom_cutoff, :]
     right_middle = right_region[top_cutoff:bottom_cutoff, :]
 
-    # Detect features
-    left_features = {'upper': False, 'lower': False, 'count': 0}
-    right_features = {'upper': False, 'lower': False, 'count': 0}
-
-    # Analyze left edge
-    for col_idx in range(left_middle.shape[1]):
-        col = left_middle[:, col_idx]
-        dark_rows = np.where(col < 100)[0]
-
-        if len(dark_rows) > 0 and len(dark_rows) < 30:
-            position = dark_rows[0]
-            left_features['count'] += 1
-
-            if position < mid_h * 0.3:
-                left_features['upper'] = True
-            elif position > mid_h * 0.7:
-                left_features['lower'] = True
-
-    # Analyze right edge
-    for col_idx in range(right_middle.shape[1]):
-        col = right_middle[:, col_idx]
-        dark_rows = np.where(col < 100)[0]
+    # Detect features (small protrusions: 1-29 dark pixels in a column)
+    left_features = edge_features(left_middle, mid_h)
+    right_features = edge_features(right_middle, mid_h)
 
-        if len(dark_rows) > 0 and len(dark_rows) < 30:
-            position = dark_rows[0]
-            right_features['count'] += 1
-
-            if position < mid_h * 0.3:
-                right_features['upper'] = True
-            elif position > mid_h * 0.7:
-                right_features['lower'] = True
-
-    print(f"\nDetected features:")
-    print(f"  Left edge:  upper={left_features['upper']}, lower={left_features['lower']}, protrusions={left_features['count']}")
-    print(f"  Right edge: upper={right_features['upper']}, lower={right_features['lower']}, protrusions={right_features['count']}")
+    log(f"\nDetected features:")
+    log(f"  Left edge:  upper={left_features['upper']}, lower={left_features['lower']}, protrusions={left_features['count']}")
+    log(f"  Right edge: upper={right_features['upper']}, lower={right_features['lower']}, protrusions={right_features['count']}")
 
     # Match names against these features
-    print(f"\nMatching names...")
-
-    for name in NAMES:
-        # Calculate expected width
-        expected_width = font.getlength(name)
-
-        # Check width match
-        width_diff = abs(expected_width - w)
-        width_match = width_diff < expected_width * 0.15  # Within 15%
-
-        # Analyze name features
-        name_has_upper = any(c in 'bdfhklt' for c in name)
-        name_has_lower = any(c in 'gjpqy' for c in name)
+    log(f"\nMatching names...")
 
-        # First letter
-        if len(name) > 0:
-            first_has_upper = name[0] in 'bdfhklt'
-            first_has_lower = name[0] in 'gjpqy'
-
-        # Last letter
-        if len(name) > 0:
-            last_has_upper = name[-1] in 'bdfhklt'
-            last_has_lower = name[-1] in 'gjpqy'
+    for name, features, expected_width, width_match in zip(NAMES, NAME_FEATURES, name_widths,
+                                                          width_matches):
+        if not width_match:
+            continue
+        first_has_upper, first_has_lower, last_has_upper, last_has_lower = features
 
         # Check if features match
         left_match = True
@@ -145,7 +107,7 @@ for i, (x, y, w, h) in enumerate(redactions[:5]):
             if right_features['lower'] and not last_has_lower:
                 right_match = False
 
-        if width_match and left_match and right_match:
+        if left_match and right_match:
             score = 100
             if left_features['count'] > 0:
                 if ((left_features['upper'] and first_has_upper) or
@@ -157,8 +119,42 @@ for i, (x, y, w, h) in enumerate(redactions[:5]):
                     (right_features['lower'] and last_has_lower)):
                     score += 20
 
-            print(f"  ★ '{name}' - Width: {expected_width:.0f}px (actual: {w}px), Score: {score}")
+            log(f"  ★ '{name}' - Width: {expected_width:.0f}px (actual: {w}px), Score: {score}")
+
+    return lines
+
+
+if __name__ == "__main__":
+    print("="*100)
+    print("TEXT RECONSTRUCTION FROM PROTRUSION PATTERNS")
+    print("="*100)
 
-print(f"\n{'='*100}")
-print(f"RECONSTRUCTION COMPLETE")
-print(f"{'='*100}")
+    # Load document at 1200 DPI
+    print(f"\nLoading document at 1200 DPI...")
+    # Read-only memmap of the cached grayscale page (rasterized on first run)
+    gray = load_page_mmap(FILE_PATH, dpi=1200)
+
+    # Find redactions
+    # Located on a 150 DPI render; exact boxes come from the 1200 DPI page
+    boxes = locate_bars(FILE_PATH, gray, 1200, min_w=400, max_w=800)[:5]  # Focus on name-sized
+    redactions = boxes_to_tuples(boxes)
+
+    # Font for rendering
+    scaled_font_size = int(12 * 1200 / 72)
+    font = ImageFont.truetype(FONT_PATH, scaled_font_size)
+
+    print(f"Testing {len(NAMES)} common names against protrusion patterns...")
+
+    # 15% width match for every (redaction, name) pair
+    name_widths = np.array([font.getlength(name) for name in NAMES])
+    width_match_table = np.abs(name_widths[None, :] - boxes[:, 2:3]) < name_widths * 0.15
+
+    # Redactions are independent, so each one runs in a worker process
+    with redaction_pool(FILE_PATH, 1200, max_workers=min(8, os.cpu_count() or 1)) as executor:
+        for lines in executor.map(analyze_redaction, range(len(redactions)), redactions,
+                                  [name_widths] * len(redactions), width_match_table):
+            print("\n".join(lines))
+
+    print(f"\n{'='*100}")
+    print(f"RECONSTRUCTION COMPLETE")
+    print(f"{'='*100}")
@@ -1,21 +1,22 @@
 #!/usr/bin/env python3
 """Search for any occurrence of 'Brunel' or find the redaction near 'Attempts'"""
 
-import cv2
-import numpy as np
-from pdf2image import convert_from_path
-import pytesseract
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page_mmap
+from ocr_cache import ocr_data
+from pipeline import boxes_to_tuples, locate_bars
 
 FILE_PATH = "files/EFTA00037366.pdf"
 
 # Load at 1200 DPI
-images = convert_from_path(FILE_PATH, dpi=1200)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+# Read-only memmap of the cached grayscale page (rasterized on first run)
+gray = load_page_mmap(FILE_PATH, dpi=1200)
 
 # Get OCR
-data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
+data = ocr_data(FILE_PATH, dpi=1200)  # Cached 300 DPI OCR, boxes in 1200 DPI pixels
 
 print("Searching for 'Brunel' or the redaction after 'were made to'...")
 
@@ -41,10 +42,8 @@ for i in range(len(data['text'])):
 
 # Find ALL redactions and show them with context
 print(f"\nAll redactions in the document:")
-_, black_mask = cv2.threshold(gray, 5, 255, cv2.THRESH_BINARY_INV)
-contours, _ = cv2.findContours(black_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+# Located on a 150 DPI render; exact boxes come from the 1200 DPI page
+boxes = locate_bars(FILE_PATH, gray, 1200, min_w=200, max_w=800)
 
-for cnt in contours:
-    x, y, w, h = cv2.boundingRect(cnt)
-    if 200 < w < 800:
-        print(f"  Redaction at ({x}, {y}), size: {w}x{h}px")
+for x, y, w, h in boxes_to_tuples(boxes):
+    print(f"  Redaction at ({x}, {y}), size: {w}x{h}px")
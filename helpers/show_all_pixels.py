@@ -4,78 +4,89 @@ Show ALL pixel values at the redaction edge - no filtering.
 This will reveal the exact anti-aliasing pattern.
 """
 
+import argparse
 import cv2
 import numpy as np
-from pdf2image import convert_from_path
 import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page_mmap
+from pipeline import boxes_to_tuples, locate_bars
 
 FILE_PATH = "files/EFTA00037366.pdf"
 OUTPUT_DIR = "pixel_edges"
 
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+parser = argparse.ArgumentParser(description='Complete pixel analysis at redaction edges')
+parser.add_argument('--visualize', action='store_true', help='Save the pixel intensity colormap')
+args = parser.parse_args()
+
+if args.visualize:
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+LEVELS = np.arange(256)
+
+
+def report_column_values(region, max_cols=5):
+    """
+    Print the value distribution of the first `max_cols` columns of an edge region.
+
+    Min, max, mean and the non-white count all come from one 256-bin
+    histogram per column, i.e. a single pass over each column's pixels.
+    """
+    for col in range(min(max_cols, region.shape[1])):
+        col_data = region[:, col]
+        hist = np.bincount(col_data, minlength=256)
+        col_min = int(np.argmax(hist > 0))
+        col_max = 255 - int(np.argmax(hist[::-1] > 0))
+        col_mean = (LEVELS @ hist) / col_data.size
+
+        print(f"  Column {col}px from edge:")
+        print(f"    Min: {col_min}, Max: {col_max}, Mean: {col_mean:.1f}")
+
+        # Show sample values
+        sample_rows = [0, 50, 100, 150, 211]
+        print(f"    Sample values: ", end="")
+        for row in sample_rows:
+            if row < len(col_data):
+                print(f"{col_data[row]:3d} ", end="")
+        print()
+
+        # Count non-white pixels
+        non_white = int(hist[:250].sum())
+        if non_white > 0:
+            print(f"    → {non_white} pixels are NOT white (<250)")
+
 
 print("="*100)
 print("COMPLETE PIXEL ANALYSIS - Showing ALL pixel values at edges")
 print("="*100)
 
 # Load at 1200 DPI
-images = convert_from_path(FILE_PATH, dpi=1200)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+# Read-only memmap of the cached grayscale page (rasterized on first run)
+gray = load_page_mmap(FILE_PATH, dpi=1200)
 
 # Find the 525px redaction
-_, black_mask = cv2.threshold(gray, 5, 255, cv2.THRESH_BINARY_INV)
-contours, _ = cv2.findContours(black_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-for cnt in contours:
-    x, y, w, h = cv2.boundingRect(cnt)
-    if 520 < w < 530:
-        print(f"\n{'='*100}")
-        print(f"525px REDACTION at ({x}, {y}) - Analyzing ALL edge pixels")
-        print(f"{'='*100}")
-
-        # Extract edge regions
-        border = 20
-        left_region = gray[y:y+h, max(0, x-border):x]
-        right_region = gray[y:y+h, x:x+min(gray.shape[1]-x, border)]
-
-        print(f"\nLEFT EDGE - Pixel value distribution (first 5 columns):")
-        for col in range(min(5, left_region.shape[1])):
-            col_data = left_region[:, col]
-            print(f"  Column {col}px from edge:")
-            print(f"    Min: {np.min(col_data)}, Max: {np.max(col_data)}, Mean: {np.mean(col_data):.1f}")
-
-            # Show sample values
-            sample_rows = [0, 50, 100, 150, 211]
-            print(f"    Sample values: ", end="")
-            for row in sample_rows:
-                if row < len(col_data):
-                    print(f"{col_data[row]:3d} ", end="")
-            print()
-
-            # Count non-white pixels
-            non_white = np.sum(col_data < 250)
-            if non_white > 0:
-                print(f"    → {non_white} pixels are NOT white (<250)")
-
-        print(f"\nRIGHT EDGE - Pixel value distribution (first 5 columns):")
-        for col in range(min(5, right_region.shape[1])):
-            col_data = right_region[:, col]
-            print(f"  Column {col}px from edge:")
-            print(f"    Min: {np.min(col_data)}, Max: {np.max(col_data)}, Mean: {np.mean(col_data):.1f}")
-
-            sample_rows = [0, 50, 100, 150, 211]
-            print(f"    Sample values: ", end="")
-            for row in sample_rows:
-                if row < len(col_data):
-                    print(f"{col_data[row]:3d} ", end="")
-            print()
-
-            non_white = np.sum(col_data < 250)
-            if non_white > 0:
-                print(f"    → {non_white} pixels are NOT white (<250)")
+# Located on a 150 DPI render; exact boxes come from the 1200 DPI page
+boxes = locate_bars(FILE_PATH, gray, 1200, min_w=520, max_w=530)
+
+for x, y, w, h in boxes_to_tuples(boxes):
+    print(f"\n{'='*100}")
+    print(f"525px REDACTION at ({x}, {y}) - Analyzing ALL edge pixels")
+    print(f"{'='*100}")
+
+    # Extract edge regions
+    border = 20
+    left_region = gray[y:y+h, max(0, x-border):x]
+    right_region = gray[y:y+h, x:x+min(gray.shape[1]-x, border)]
+
+    print(f"\nLEFT EDGE - Pixel value distribution (first 5 columns):")
+    report_column_values(left_region)
+
+    print(f"\nRIGHT EDGE - Pixel value distribution (first 5 columns):")
+    report_column_values(right_region)
 
+    if args.visualize:
         # Create visualization showing pixel intensity
         combined = np.hstack([left_region[:, :5], right_region[:, :5]])
         combined_norm = cv2.normalize(combined, None, 0, 255, cv2.NORM_MINMAX)
@@ -90,6 +101,6 @@ for cnt in contours:
         print(f"\nPixel intensity visualization saved: {OUTPUT_DIR}/kellen_pixels_intensity.png")
         print(f"(Red/Warm = dark pixels, Blue/Cool = light pixels)")
 
-        break
+    break
 
 print(f"\n{'='*100}")
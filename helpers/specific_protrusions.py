@@ -3,46 +3,36 @@
 Specific Protrusion Detection - Look for small letter parts, ignoring corners.
 """
 
+import argparse
 import cv2
 import numpy as np
-from pdf2image import convert_from_path
 import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page_mmap
+from pipeline import boxes_to_tuples, column_extents, locate_bars, redaction_pool, worker_page
 
 FILE_PATH = "files/EFTA00037366.pdf"
 OUTPUT_DIR = "specific_protrusions"
 
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-print("="*100)
-print("SPECIFIC PROTRUSION DETECTION - Finding Letter Tips, Ignoring Corners")
-print("="*100)
-
-# Load at 1200 DPI
-print(f"\n[STEP 1] Loading document at 1200 DPI...")
-images = convert_from_path(FILE_PATH, dpi=1200)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
-
-# Find redactions
-print(f"\n[STEP 2] Locating redaction boxes...")
-_, black_mask = cv2.threshold(gray, 5, 255, cv2.THRESH_BINARY_INV)
-contours, _ = cv2.findContours(black_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-redactions = []
-for cnt in contours:
-    x, y, w, h = cv2.boundingRect(cnt)
-    if 300 < w < 1500 and h > 50:
-        redactions.append((x, y, w, h))
 
-print(f"  ✓ Found {len(redactions)} target redactions")
+def analyze_redaction(i, box, visualize):
+    """
+    Corner-excluded edge protrusion report for one redaction.
 
-print(f"\n[STEP 3] Looking for SMALL protrusions (letter tips), excluding corners...")
+    Runs in a worker process against the shared page memmap and writes its
+    own image when `visualize` is set. Returns the report lines so the
+    caller prints them in order.
+    """
+    x, y, w, h = box
+    gray = worker_page()
+    lines = []
+    log = lines.append
 
-for i, (x, y, w, h) in enumerate(redactions[:8]):
-    print(f"\n{'='*100}")
-    print(f"Redaction #{i+1} at ({x}, {y}), size: {w}x{h}px")
-    print(f"{'='*100}")
+    log(f"\n{'='*100}")
+    log(f"Redaction #{i+1} at ({x}, {y}), size: {w}x{h}px")
+    log(f"{'='*100}")
 
     # Extract left edge (15px strip)
     left_start = max(0, x - 15)
@@ -58,106 +48,136 @@ for i, (x, y, w, h) in enumerate(redactions[:8]):
     top_cutoff = int(h * 0.1)  # Exclude top 10%
     bottom_cutoff = int(h * 0.9)  # Exclude bottom 10%
 
-    print(f"\nLeft edge (excluding corners, looking at middle {h - 2*top_cutoff}px):")
+    log(f"\nLeft edge (excluding corners, looking at middle {h - 2*top_cutoff}px):")
 
     # Analyze left edge, excluding corners
     left_middle = left_region[top_cutoff:bottom_cutoff, :]
 
     # Look for very specific, small protrusions
-    # Use adaptive threshold to find pixels that are darker than surrounding area
-    for col_idx in range(left_middle.shape[1]):
-        col = left_middle[:, col_idx]
-
-        # Find dark pixels (actual letter tips, not anti-aliasing)
-        dark_threshold = 100  # Tighter threshold
-        dark_mask = col < dark_threshold
-        dark_rows = np.where(dark_mask)[0]
-
-        if len(dark_rows) > 0 and len(dark_rows) < 30:  # Small protrusion, not full height
-            # Check the vertical SPAN of the protrusion
-            span = dark_rows[-1] - dark_rows[0] + 1
-
-            # Check position within the middle section
-            position = dark_rows[0] + top_cutoff
-
-            print(f"  Column {col_idx}px from edge: {len(dark_rows)} dark pixels, span={span}px")
-            print(f"    Position: {position}px from top of redaction")
-
-            # Identify likely letter part based on span and position
-            if span < 10:
-                print(f"    → Small tip - likely serif or stroke end")
-            elif span < 30:
-                if position < h * 0.4:
-                    print(f"    → Upper protrusion - likely b, d, f, h, k, l, t")
-                elif position > h * 0.6:
-                    print(f"    → Lower protrusion - likely descender (g, j, p, q, y)")
-                else:
-                    print(f"    → Middle protrusion - likely x-height letter")
+    # Find dark pixels (actual letter tips, not anti-aliasing)
+    dark_threshold = 100  # Tighter threshold
+    counts, first, last = column_extents(cv2.inRange(left_middle, 0, dark_threshold - 1))
+
+    # Small protrusion, not full height
+    for col_idx in np.flatnonzero((counts > 0) & (counts < 30)):
+        # Check the vertical SPAN of the protrusion
+        span = last[col_idx] - first[col_idx] + 1
+
+        # Check position within the middle section
+        position = first[col_idx] + top_cutoff
+
+        log(f"  Column {col_idx}px from edge: {counts[col_idx]} dark pixels, span={span}px")
+        log(f"    Position: {position}px from top of redaction")
+
+        # Identify likely letter part based on span and position
+        if span < 10:
+            log(f"    → Small tip - likely serif or stroke end")
+        elif span < 30:
+            if position < h * 0.4:
+                log(f"    → Upper protrusion - likely b, d, f, h, k, l, t")
+            elif position > h * 0.6:
+                log(f"    → Lower protrusion - likely descender (g, j, p, q, y)")
             else:
-                print(f"    → Larger feature - unclear")
+                log(f"    → Middle protrusion - likely x-height letter")
+        else:
+            log(f"    → Larger feature - unclear")
 
-    print(f"\nRight edge (excluding corners):")
+    log(f"\nRight edge (excluding corners):")
 
     # Same for right edge
     right_middle = right_region[top_cutoff:bottom_cutoff, :]
 
-    for col_idx in range(right_middle.shape[1]):
-        col = right_middle[:, col_idx]
+    counts, first, last = column_extents(cv2.inRange(right_middle, 0, 99))
+
+    for col_idx in np.flatnonzero((counts > 0) & (counts < 30)):
+        span = last[col_idx] - first[col_idx] + 1
+        position = first[col_idx] + top_cutoff
 
-        dark_mask = col < 100
-        dark_rows = np.where(dark_mask)[0]
+        log(f"  Column {col_idx}px from edge: {counts[col_idx]} dark pixels, span={span}px")
+        log(f"    Position: {position}px from top of redaction")
+
+        if span < 10:
+            log(f"    → Small tip - likely serif or stroke end")
+        elif span < 30:
+            if position < h * 0.4:
+                log(f"    → Upper protrusion - likely b, d, f, h, k, l, t")
+            elif position > h * 0.6:
+                log(f"    → Lower protrusion - likely descender (g, j, p, q, y)")
+            else:
+                log(f"    → Middle protrusion - likely x-height letter")
 
-        if len(dark_rows) > 0 and len(dark_rows) < 30:
-            span = dark_rows[-1] - dark_rows[0] + 1
-            position = dark_rows[0] + top_cutoff
+    if visualize:
+        # Create visualization highlighting the middle section only
+        vis_height = h
+        vis_width = 30  # 15px on each side
+        vis = np.zeros((vis_height, vis_width), dtype=np.uint8)
 
-            print(f"  Column {col_idx}px from edge: {len(dark_rows)} dark pixels, span={span}px")
-            print(f"    Position: {position}px from top of redaction")
+        # Copy left middle section
+        vis[top_cutoff:bottom_cutoff, :15] = left_middle
 
-            if span < 10:
-                print(f"    → Small tip - likely serif or stroke end")
-            elif span < 30:
-                if position < h * 0.4:
-                    print(f"    → Upper protrusion - likely b, d, f, h, k, l, t")
-                elif position > h * 0.6:
-                    print(f"    → Lower protrusion - likely descender (g, j, p, q, y)")
-                else:
-                    print(f"    → Middle protrusion - likely x-height letter")
+        # Copy right middle section
+        vis[top_cutoff:bottom_cutoff, 15:] = right_middle
 
-    # Create visualization highlighting the middle section only
-    vis_height = h
-    vis_width = 30  # 15px on each side
-    vis = np.zeros((vis_height, vis_width), dtype=np.uint8)
+        # Enhance contrast
+        vis = cv2.normalize(vis, None, 0, 255, cv2.NORM_MINMAX)
 
-    # Copy left middle section
-    vis[top_cutoff:bottom_cutoff, :15] = left_middle
+        # Highlight protrusions in green
+        vis_color = cv2.cvtColor(vis, cv2.COLOR_GRAY2BGR)
 
-    # Copy right middle section
-    vis[top_cutoff:bottom_cutoff, 15:] = right_middle
+        # Mark corners as grayed out
+        corner_mask = np.zeros((vis_height, vis_width, 3), dtype=np.uint8)
+        corner_mask[:top_cutoff, :] = [128, 128, 128]
+        corner_mask[bottom_cutoff:, :] = [128, 128, 128]
 
-    # Enhance contrast
-    vis = cv2.normalize(vis, None, 0, 255, cv2.NORM_MINMAX)
+        vis_color = cv2.addWeighted(vis_color, 1, corner_mask, 0.3, 0)
 
-    # Highlight protrusions in green
-    vis_color = cv2.cvtColor(vis, cv2.COLOR_GRAY2BGR)
+        # Highlight dark pixels
+        dark_pixels = vis < 100
+        vis_color[dark_pixels] = [0, 255, 0]  # Green
 
-    # Mark corners as grayed out
-    corner_mask = np.zeros((vis_height, vis_width, 3), dtype=np.uint8)
-    corner_mask[:top_cutoff, :] = [128, 128, 128]
-    corner_mask[bottom_cutoff:, :] = [128, 128, 128]
+        cv2.imwrite(f"{OUTPUT_DIR}/r{i+1}_protrusions.png", vis_color)
+        log(f"\n  Protrusion visualization saved: {OUTPUT_DIR}/r{i+1}_protrusions.png")
 
-    vis_color = cv2.addWeighted(vis_color, 1, corner_mask, 0.3, 0)
+    return lines
 
-    # Highlight dark pixels
-    dark_pixels = vis < 100
-    vis_color[dark_pixels] = [0, 255, 0]  # Green
 
-    cv2.imwrite(f"{OUTPUT_DIR}/r{i+1}_protrusions.png", vis_color)
-    print(f"\n  Protrusion visualization saved: {OUTPUT_DIR}/r{i+1}_protrusions.png")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Specific protrusion detection')
+    parser.add_argument('--visualize', action='store_true', help='Save a protrusion image per redaction')
+    args = parser.parse_args()
 
-print(f"\n{'='*100}")
-print(f"ANALYSIS COMPLETE")
-print(f"{'='*100}")
-print(f"\nProtrusion visualizations saved to: {OUTPUT_DIR}/")
-print(f"Gray areas = excluded corners")
-print(f"Green pixels = detected letter protrusions")
+    if args.visualize:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    print("="*100)
+    print("SPECIFIC PROTRUSION DETECTION - Finding Letter Tips, Ignoring Corners")
+    print("="*100)
+
+    # Load at 1200 DPI
+    print(f"\n[STEP 1] Loading document at 1200 DPI...")
+    # Read-only memmap of the cached grayscale page (rasterized on first run)
+    gray = load_page_mmap(FILE_PATH, dpi=1200)
+
+    # Find redactions
+    print(f"\n[STEP 2] Locating redaction boxes...")
+    # Located on a 150 DPI render; exact boxes come from the 1200 DPI page
+    redactions = boxes_to_tuples(locate_bars(FILE_PATH, gray, 1200, min_w=300, max_w=1500, min_h=50))
+
+    print(f"  ✓ Found {len(redactions)} target redactions")
+
+    print(f"\n[STEP 3] Looking for SMALL protrusions (letter tips), excluding corners...")
+
+    # Redactions are independent, so each one runs in a worker process
+    with redaction_pool(FILE_PATH, 1200, max_workers=min(8, os.cpu_count() or 1)) as executor:
+        targets = redactions[:8]
+        for lines in executor.map(analyze_redaction, range(len(targets)), targets,
+                                  [args.visualize] * len(targets)):
+            print("\n".join(lines))
+
+    print(f"\n{'='*100}")
+    print(f"ANALYSIS COMPLETE")
+    print(f"{'='*100}")
+    if args.visualize:
+        print(f"\nProtrusion visualizations saved to: {OUTPUT_DIR}/")
+        print(f"Gray areas = excluded corners")
+        print(f"Green pixels = detected letter protrusions")
@@ -3,11 +3,14 @@
 Find the TOP 10 redaction detections across the entire document
 """
 
-import cv2
 import numpy as np
-from pdf2image import convert_from_path
 from PIL import ImageFont
-import pytesseract
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import load_page_mmap
+from pipeline import boxes_to_tuples, locate_bars
 
 FILE_PATH = "files/EFTA00037366.pdf"
 FONT_PATH = "fonts/fonts/times.ttf"
@@ -39,10 +42,8 @@ print("="*100)
 
 # Load PDF
 print(f"\nLoading PDF at 1200 DPI...")
-images = convert_from_path(FILE_PATH, dpi=1200)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+# Read-only memmap of the cached grayscale page (rasterized on first run)
+gray = load_page_mmap(FILE_PATH, dpi=1200)
 
 # Load font
 font_size = int(12 * 1200 / 72)
@@ -50,14 +51,9 @@ font = ImageFont.truetype(FONT_PATH, font_size)
 
 # Find all redactions
 print(f"Finding redactions...")
-_, black_mask = cv2.threshold(gray, 5, 255, cv2.THRESH_BINARY_INV)
-contours, _ = cv2.findContours(black_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-redactions = []
-for cnt in contours:
-    x, y, w, h = cv2.boundingRect(cnt)
-    if w > 200 and h > 100:  # Only significant redactions
-        redactions.append((x, y, w, h))
+# Located on a 150 DPI render; exact boxes come from the 1200 DPI page
+boxes = locate_bars(FILE_PATH, gray, 1200, min_w=200, min_h=100)  # Only significant redactions
+redactions = boxes_to_tuples(boxes)
 
 print(f"Found {len(redactions)} significant redactions")
 
@@ -67,30 +63,31 @@ print(f"{'='*100}")
 
 all_matches = []
 
-for i, (x, y, w, h) in enumerate(redactions):
-    # Test each candidate
-    for candidate in CANDIDATES:
-        expected_width = font.getlength(candidate)
-        diff = abs(expected_width - w)
-        pct_error = diff / expected_width * 100 if expected_width > 0 else 100
-
-        # Calculate match score (inverse of error percentage, capped at 100)
-        width_score = max(0, 100 - pct_error)
-
-        # Only keep matches within 30% error
-        if pct_error < 30:
-            all_matches.append({
-                'redaction_id': i,
-                'position': (x, y),
-                'size': (w, h),
-                'candidate': candidate,
-                'expected_width': expected_width,
-                'actual_width': w,
-                'diff': diff,
-                'pct_error': pct_error,
-                'width_score': width_score,
-                'letters': len(candidate.replace(" ", ""))
-            })
+# Measure each candidate once, then compare every redaction against every
+# candidate as one (redactions x candidates) error matrix
+widths = np.array([font.getlength(candidate) for candidate in CANDIDATES])
+diffs = np.abs(widths[None, :] - boxes[:, 2:3])
+pct_errors = diffs / widths[None, :] * 100
+
+# Only keep matches within 30% error
+for i, k in np.argwhere(pct_errors < 30):
+    x, y, w, h = redactions[i]
+    candidate = CANDIDATES[k]
+    pct_error = float(pct_errors[i, k])
+
+    all_matches.append({
+        'redaction_id': int(i),
+        'position': (x, y),
+        'size': (w, h),
+        'candidate': candidate,
+        'expected_width': float(widths[k]),
+        'actual_width': w,
+        'diff': float(diffs[i, k]),
+        'pct_error': pct_error,
+        # Match score: inverse of error percentage, capped at 100
+        'width_score': max(0, 100 - pct_error),
+        'letters': len(candidate.replace(" ", ""))
+    })
 
 # Sort by percentage error (ascending)
 all_matches.sort(key=lambda m: m['pct_error'])
@@ -100,6 +97,8 @@ print(f"\nTOP 10 BEST MATCHES:")
 print(f"{'Rank':<6} {'Candidate':<25} {'Position':<15} {'Size':<12} {'Width':<12} {'Diff':<10} {'Error':<10} {'Score'}")
 print("-"*120)
 
+# Build each table and print it in one call instead of one terminal write per row
+rows = []
 for rank, match in enumerate(all_matches[:10], 1):
     pos_str = f"({match['position'][0]}, {match['position'][1]})"
     size_str = f"{match['size'][0]}x{match['size'][1]}"
@@ -115,8 +114,9 @@ for rank, match in enumerate(all_matches[:10], 1):
     else:
         rating = "→"
 
-    print(f"{rank:<6} {match['candidate']:<25} {pos_str:<15} {size_str:<12} {width_str:<12} "
-          f"{match['diff']:>5.1f}px   {match['pct_error']:>5.1f}%     {match['width_score']:>5.1f} {rating}")
+    rows.append(f"{rank:<6} {match['candidate']:<25} {pos_str:<15} {size_str:<12} {width_str:<12} "
+                f"{match['diff']:>5.1f}px   {match['pct_error']:>5.1f}%     {match['width_score']:>5.1f} {rating}")
+print("\n".join(rows))
 
 print(f"\n{'='*100}")
 print(f"SUMMARY:")
@@ -142,10 +142,12 @@ for match in all_matches:
 # Sort by error
 sorted_redactions = sorted(by_redaction.values(), key=lambda m: m['pct_error'])
 
+rows = []
 for match in sorted_redactions[:15]:
     pos_str = f"({match['position'][0]}, {match['position'][1]})"
     size_str = f"{match['size'][0]}x{match['size'][1]}"
-    print(f"{pos_str:<15} {size_str:<12} {match['candidate']:<25} {match['pct_error']:>5.1f}%      "
-          f"{match['letters']:>3}")
+    rows.append(f"{pos_str:<15} {size_str:<12} {match['candidate']:<25} {match['pct_error']:>5.1f}%      "
+                f"{match['letters']:>3}")
+print("\n".join(rows))
 
 print(f"\n{'='*100}")
@@ -17,18 +17,20 @@ Usage:
     python unredactron_forensic.py --file files/document.pdf --diagnostic-mode
 """
 
-import cv2
+import functools
 import numpy as np
-from pdf2image import convert_from_path
-from PIL import Image, ImageFont, ImageDraw
-import pandas as pd
+from PIL import ImageFont
 import argparse
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Add helpers to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from helpers.forensic_halo import ForensicHaloExtractor
+from helpers.ocr_cache import ocr_data
+from helpers.pipeline import boxes_to_tuples, ink_width, locate_bars
+from helpers.raster_cache import load_page_mmap
 
 
 class ForensicRedactionAnalyzer:
@@ -62,6 +64,8 @@ class ForensicRedactionAnalyzer:
         self.diagnostic_mode = diagnostic_mode
         self.control_word = control_word
         self.tolerance = tolerance
+        # Redaction bars are located on a cheaper render at this DPI
+        self.contour_dpi = min(300, dpi)
 
         # Initialize halo extractor
         self.halo_extractor = ForensicHaloExtractor(
@@ -76,13 +80,17 @@ class ForensicRedactionAnalyzer:
         # Load font
         self.font = self._load_font()
 
+        # Memoized ink width: the same candidate names are measured for every redaction
+        self.text_extent = functools.lru_cache(maxsize=None)(self._measure_text)
+
     def _load_document(self):
         """Convert PDF to high-DPI image."""
         print(f"[INFO] Converting PDF to {self.dpi} DPI...")
-        images = convert_from_path(self.file_path, dpi=self.dpi)
-        self.image = np.array(images[0])
-        self.gray = cv2.cvtColor(self.image, cv2.COLOR_RGB2GRAY)
-        print(f"[INFO] Image size: {self.image.shape[1]}x{self.image.shape[0]}px")
+        # Read-only memmap of the cached grayscale page: only the first run pays for
+        # Poppler, and later runs map it instead of decoding a PNG. Nothing here
+        # writes to the page; the halo extractor copies its ROI.
+        self.gray = load_page_mmap(self.file_path, self.dpi)
+        print(f"[INFO] Image size: {self.gray.shape[1]}x{self.gray.shape[0]}px")
 
     def _load_font(self) -> ImageFont.FreeTypeFont:
         """Load the TrueType font with proper scaling."""
@@ -95,6 +103,11 @@ class ForensicRedactionAnalyzer:
             print(f"[ERROR] Failed to load font: {e}")
             raise
 
+    def _measure_text(self, text: str) -> int:
+        """Ink width of text in the unscaled font (same box as ImageDraw.textbbox at the origin)."""
+        left, _, right, _ = self.font.getbbox(text)
+        return right - left
+
     def calibrate_with_control_word(self, control_word: str) -> float:
         """
         Calibrate using a visible control word.
@@ -103,15 +116,9 @@ class ForensicRedactionAnalyzer:
         """
         print(f"\n[INFO] Calibrating with control word: '{control_word}'")
 
-        # Use OCR to find the control word
-        import pytesseract
-        from pytesseract import Output
-
-        # Get OCR data with bounding boxes
-        d = pytesseract.image_to_data(
-            self.gray,
-            output_type=Output.DICT
-        )
+        # Get OCR data with bounding boxes; cached 300 DPI OCR, boxes in page pixels,
+        # used only to locate the word
+        d = ocr_data(self.file_path, dpi=self.dpi)
 
         # Find the control word
         scale_factor = 1.0
@@ -120,17 +127,17 @@ class ForensicRedactionAnalyzer:
         for i, text in enumerate(d['text']):
             if control_word.lower() in text.lower():
                 x, y, w, h = d['left'][i], d['top'][i], d['width'][i], d['height'][i]
+                # The box is scaled up from the OCR resolution; measure the
+                # word's ink on the full-DPI page instead
+                w = ink_width(self.gray, (x, y, w, h)) or w
 
                 # Calculate expected width
-                temp_img = Image.new('RGB', (1000, 100), 'white')
-                temp_draw = ImageDraw.Draw(temp_img)
-                bbox = temp_draw.textbbox((0, 0), control_word, font=self.font)
-                expected_width = bbox[2] - bbox[0]
+                expected_width = self.text_extent(control_word)
 
                 # Calculate scale factor
                 scale_factor = w / expected_width
                 found = True
-                print(f"[INFO] Control word found at ({x}, {y}), actual width: {w}px")
+                print(f"[INFO] Control word found at ({x}, {y}), actual width: {w:.1f}px")
                 print(f"[INFO] Expected width: {expected_width}px, scale factor: {scale_factor:.2f}")
                 break
 
@@ -152,22 +159,12 @@ class ForensicRedactionAnalyzer:
         """
         print(f"\n[INFO] Locating redaction boxes...")
 
-        # Threshold to find black areas
-        _, black_mask = cv2.threshold(self.gray, 15, 255, cv2.THRESH_BINARY_INV)
-
-        # Find contours
-        contours, _ = cv2.findContours(
-            black_mask,
-            cv2.RETR_EXTERNAL,
-            cv2.CHAIN_APPROX_SIMPLE
-        )
-
-        # Extract and filter redactions
-        redactions = []
-        for cnt in contours:
-            x, y, w, h = cv2.boundingRect(cnt)
-            if w > min_width and h > min_height:
-                redactions.append((x, y, w, h))
+        # Black areas are labelled on a cached contour_dpi render; only the
+        # boxes that can pass the size filter are snapped to exact bounds on
+        # the full-DPI page
+        boxes = locate_bars(self.file_path, self.gray, self.dpi, threshold=15,
+                            min_w=min_width, min_h=min_height, coarse_dpi=self.contour_dpi)
+        redactions = boxes_to_tuples(boxes)
 
         redactions.sort(key=lambda b: b[1])
         print(f"[INFO] Found {len(redactions)} redaction boxes")
@@ -185,18 +182,17 @@ class ForensicRedactionAnalyzer:
         Returns:
             Expected width in pixels
         """
-        temp_img = Image.new('RGB', (1000, 100), 'white')
-        temp_draw = ImageDraw.Draw(temp_img)
-        bbox = temp_draw.textbbox((0, 0), text, font=self.font)
-        width = bbox[2] - bbox[0]
-
-        return int(width * scale_factor)
+        if scale_factor == 1.0:
+            # Uncalibrated runs: the cached extent is already an integer width
+            return self.text_extent(text)
+        return int(self.text_extent(text) * scale_factor)
 
     def match_candidates_to_redactions(
         self,
         candidates: list,
         redactions: list,
-        scale_factor: float = 1.0
+        scale_factor: float = 1.0,
+        verbose: bool = True
     ) -> list:
         """
         Match candidate names to redactions based on width.
@@ -211,151 +207,196 @@ class ForensicRedactionAnalyzer:
             candidates: List of candidate names or dict with 'name' key
             redactions: List of (x, y, w, h) redaction boxes
             scale_factor: Calibration scale factor
+            verbose: Print the per-redaction report
 
         Returns:
             List of match dictionaries with width and artifact analysis
         """
-        print(f"\n[INFO] Matching {len(candidates)} candidates to {len(redactions)} redactions...")
-        print(f"[INFO] Using DYNAMIC tolerance (5% of expected width, min 3.0px)")
+        if verbose:
+            print(f"\n[INFO] Matching {len(candidates)} candidates to {len(redactions)} redactions...")
+            print(f"[INFO] Using DYNAMIC tolerance (5% of expected width, min 3.0px)")
 
         matches = []
 
-        for redaction_idx, (rx, ry, rw, rh) in enumerate(redactions):
-            print(f"\n{'-'*80}")
-            print(f"Redaction #{redaction_idx + 1} at ({rx}, {ry}), size: {rw}x{rh}px")
-
-            # Check for contextual clues (OCR-based anchor word detection)
-            context_boost = 0.0
-            try:
-                import pytesseract
-                from pytesseract import Output
-
-                # Extract region before redaction for context
-                context_x = max(0, rx - 200)
-                context_y = max(0, ry - 20)
-                context_w = min(200, rx)
-                context_h = min(rh + 40, self.gray.shape[0] - context_y)
-
-                if context_w > 50 and context_h > 20:
-                    context_roi = self.gray[context_y:context_y+context_h, context_x:context_x+context_w]
-                    d = pytesseract.image_to_data(context_roi, output_type=Output.DICT)
-
-                    # Check for anchor words like "with", "and", "including"
-                    for i, text in enumerate(d['text']):
-                        if any(anchor in text.lower() for anchor in ['with', 'and', 'including', 'among']):
-                            print(f"  [CONTEXT] Found anchor word '{text}' before redaction")
-                            context_boost = 2.0
-                            break
-            except Exception as e:
-                pass  # OCR contextual analysis is optional
-
-            best_match = None
-            best_score = 0
-
-            for candidate in candidates:
-                # Handle both string and dict formats
-                if isinstance(candidate, dict):
-                    name = candidate['name']
-                    confidence = candidate.get('confidence', 1.0)
-                else:
-                    name = candidate
-                    confidence = 1.0
+        # Candidate names, confidences and expected widths do not depend on the
+        # redaction; build them once and score every candidate with array ops
+        names = []
+        confidences = []
+        for candidate in candidates:
+            # Handle both string and dict formats
+            if isinstance(candidate, dict):
+                names.append(candidate['name'])
+                confidences.append(candidate.get('confidence', 1.0))
+            else:
+                names.append(candidate)
+                confidences.append(1.0)
+        confidences = np.array(confidences, dtype=np.float64)
+        expected_widths = np.array([self.calculate_text_width(name, scale_factor) for name in names],
+                                   dtype=np.int64)
+
+        # DYNAMIC TOLERANCE: 5% of expected width, minimum 3.0px
+        # This allows "Kellen" (267px expected, 262px actual, 5px error, 1.9%)
+        # to pass while still filtering out unrelated names
+        dynamic_tolerances = np.maximum(3.0, expected_widths * 0.05)
+
+        # Redactions are independent; overlap their OCR and OpenCV work in threads
+        match_redaction = functools.partial(self._match_redaction, names=names,
+                                            confidences=confidences,
+                                            expected_widths=expected_widths,
+                                            dynamic_tolerances=dynamic_tolerances,
+                                            verbose=verbose)
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            for lines, best_match in executor.map(match_redaction, range(len(redactions)), redactions):
+                if verbose:
+                    print("\n".join(lines))
+                if best_match:
+                    matches.append(best_match)
 
-                # Calculate expected width
-                expected_width = self.calculate_text_width(name, scale_factor)
-                width_error = abs(rw - expected_width)
-
-                # DYNAMIC TOLERANCE: 5% of expected width, minimum 3.0px
-                # This allows "Kellen" (267px expected, 262px actual, 5px error, 1.9%)
-                # to pass while still filtering out unrelated names
-                dynamic_tolerance = max(3.0, expected_width * 0.05)
-
-                # Check if within dynamic tolerance
-                if width_error <= dynamic_tolerance:
-                    # Calculate match score
-                    width_score = 100 - (width_error / expected_width * 100)
-
-                    # Apply contextual boost if applicable
-                    adjusted_confidence = confidence + (context_boost / 10.0)
-                    combined_score = width_score * adjusted_confidence
-
-                    if combined_score > best_score:
-                        best_score = combined_score
-                        best_match = {
-                            'name': name,
-                            'confidence': adjusted_confidence,
-                            'expected_width': expected_width,
-                            'actual_width': rw,
-                            'width_error': width_error,
-                            'score': combined_score,
-                            'tolerance_used': dynamic_tolerance,
-                            'context_boost': context_boost
-                        }
-
-            # Perform artifact analysis for best match
-            if best_match:
-                print(f"  BEST MATCH: {best_match['name']}")
-                print(f"    Expected width: {best_match['expected_width']}px")
-                print(f"    Actual width: {best_match['actual_width']}px")
-                print(f"    Width error: {best_match['width_error']:.2f}px")
-                print(f"    Tolerance used: {best_match['tolerance_used']:.2f}px (dynamic)")
-                if best_match.get('context_boost', 0) > 0:
-                    print(f"    Context boost: +{best_match['context_boost']:.1f} (anchor word detected)")
-                print(f"    Match score: {best_match['score']:.1f}%")
+        return matches
 
-                # Extract and analyze halo
-                halo_data = self.halo_extractor.extract_halo_with_corner_exclusion(
-                    self.gray, (rx, ry, rw, rh)
-                )
+    def _match_redaction(self, redaction_idx: int, box: tuple, names: list,
+                         confidences: np.ndarray, expected_widths: np.ndarray,
+                         dynamic_tolerances: np.ndarray, verbose: bool = True) -> tuple:
+        """
+        Context check, width match and halo analysis for one redaction.
+
+        Runs in a worker thread; Tesseract and OpenCV release the GIL, and the
+        report is returned as lines so the caller prints redactions in order.
+
+        Returns:
+            (lines, best_match) with best_match None when no candidate fits;
+            lines is empty unless `verbose`, so quiet runs format nothing
+        """
+        rx, ry, rw, rh = box
+        lines = []
+        log = lines.append
+
+        if verbose:
+            log(f"\n{'-'*80}")
+            log(f"Redaction #{redaction_idx + 1} at ({rx}, {ry}), size: {rw}x{rh}px")
 
+        # Check for contextual clues (OCR-based anchor word detection)
+        context_boost = 0.0
+        try:
+            import pytesseract
+            from pytesseract import Output
+
+            # Extract region before redaction for context
+            context_x = max(0, rx - 200)
+            context_y = max(0, ry - 20)
+            context_w = min(200, rx)
+            context_h = min(rh + 40, self.gray.shape[0] - context_y)
+
+            if context_w > 50 and context_h > 20:
+                context_roi = self.gray[context_y:context_y+context_h, context_x:context_x+context_w]
+                d = pytesseract.image_to_data(context_roi, output_type=Output.DICT)
+
+                # Check for anchor words like "with", "and", "including"
+                for i, text in enumerate(d['text']):
+                    if any(anchor in text.lower() for anchor in ['with', 'and', 'including', 'among']):
+                        if verbose:
+                            log(f"  [CONTEXT] Found anchor word '{text}' before redaction")
+                        context_boost = 2.0
+                        break
+        except Exception as e:
+            pass  # OCR contextual analysis is optional
+
+        best_match = None
+
+        width_errors = np.abs(rw - expected_widths)
+        # Check if within dynamic tolerance
+        within = width_errors <= dynamic_tolerances
+        if within.any():
+            # Calculate match scores
+            width_scores = 100 - (width_errors / expected_widths * 100)
+
+            # Apply contextual boost if applicable
+            adjusted_confidences = confidences + (context_boost / 10.0)
+            scores = width_scores * adjusted_confidences
+            # Blank confidences are NaN; NaN > 0 is False, so like out-of-tolerance
+            # candidates they can never win (argmax would otherwise stop at a NaN)
+            combined_scores = np.where(within & (scores > 0), scores, -np.inf)
+
+            # First candidate with the highest positive score, as in a scan with strict >
+            best = int(np.argmax(combined_scores))
+            if np.isfinite(combined_scores[best]):
+                best_match = {
+                    'name': names[best],
+                    'confidence': float(adjusted_confidences[best]),
+                    'expected_width': int(expected_widths[best]),
+                    'actual_width': rw,
+                    'width_error': int(width_errors[best]),
+                    'score': float(combined_scores[best]),
+                    'tolerance_used': float(dynamic_tolerances[best]),
+                    'context_boost': context_boost
+                }
+
+        # Perform artifact analysis for best match
+        if best_match:
+            if verbose:
+                log(f"  BEST MATCH: {best_match['name']}")
+                log(f"    Expected width: {best_match['expected_width']}px")
+                log(f"    Actual width: {best_match['actual_width']}px")
+                log(f"    Width error: {best_match['width_error']:.2f}px")
+                log(f"    Tolerance used: {best_match['tolerance_used']:.2f}px (dynamic)")
+                if best_match.get('context_boost', 0) > 0:
+                    log(f"    Context boost: +{best_match['context_boost']:.1f} (anchor word detected)")
+                log(f"    Match score: {best_match['score']:.1f}%")
+
+            # Extract and analyze halo
+            halo_data = self.halo_extractor.extract_halo_with_corner_exclusion(
+                self.gray, (rx, ry, rw, rh)
+            )
+
+            artifact_metrics = self.halo_extractor.analyze_halo_for_artifacts(halo_data)
+
+            # Calculate artifact confidence
+            artifact_confidence = (
+                artifact_metrics.get('top_artifact_score', 0) * 0.3 +
+                artifact_metrics.get('bottom_artifact_score', 0) * 0.3 +
+                artifact_metrics.get('left_artifact_score', 0) * 0.2 +
+                artifact_metrics.get('right_artifact_score', 0) * 0.2
+            )
+
+            best_match['artifact_metrics'] = artifact_metrics
+            best_match['artifact_confidence'] = artifact_confidence
+            best_match['has_artifacts'] = artifact_confidence > 1.0
+
+            if verbose:
+                log(f"\n  ARTIFACT ANALYSIS:")
+                log(f"    Top wall:    {artifact_metrics.get('top_dark_pixels', 0)} dark pixels")
+                log(f"    Bottom wall: {artifact_metrics.get('bottom_dark_pixels', 0)} dark pixels")
+                log(f"    Left wall:   {artifact_metrics.get('left_dark_pixels', 0)} dark pixels")
+                log(f"    Right wall:  {artifact_metrics.get('right_dark_pixels', 0)} dark pixels")
+                log(f"    Artifact confidence: {artifact_confidence:.2f}%")
+
+            # Generate forensic sheet if diagnostic mode enabled
+            if self.diagnostic_mode and artifact_confidence > 1.0:
+                output_dir = "forensic_output"
+                os.makedirs(output_dir, exist_ok=True)
+                # Enhancement views are only shown on the sheet, so only build them here
                 enhanced = self.halo_extractor.apply_forensic_enhancement(halo_data['full'])
-                artifact_metrics = self.halo_extractor.analyze_halo_for_artifacts(halo_data)
-
-                # Calculate artifact confidence
-                artifact_confidence = (
-                    artifact_metrics.get('top_artifact_score', 0) * 0.3 +
-                    artifact_metrics.get('bottom_artifact_score', 0) * 0.3 +
-                    artifact_metrics.get('left_artifact_score', 0) * 0.2 +
-                    artifact_metrics.get('right_artifact_score', 0) * 0.2
+
+                output_path = f"{output_dir}/match_{redaction_idx:03d}_{best_match['name'].replace(' ', '_')}.png"
+                self.halo_extractor.create_forensic_sheet(
+                    self.gray,
+                    halo_data,
+                    enhanced,
+                    (rx, ry, rw, rh),
+                    candidate_name=best_match['name'],
+                    output_path=output_path
                 )
+                if verbose:
+                    log(f"    ✓ Forensic sheet saved: {output_path}")
 
-                best_match['artifact_metrics'] = artifact_metrics
-                best_match['artifact_confidence'] = artifact_confidence
-                best_match['has_artifacts'] = artifact_confidence > 1.0
-
-                print(f"\n  ARTIFACT ANALYSIS:")
-                print(f"    Top wall:    {artifact_metrics.get('top_dark_pixels', 0)} dark pixels")
-                print(f"    Bottom wall: {artifact_metrics.get('bottom_dark_pixels', 0)} dark pixels")
-                print(f"    Left wall:   {artifact_metrics.get('left_dark_pixels', 0)} dark pixels")
-                print(f"    Right wall:  {artifact_metrics.get('right_dark_pixels', 0)} dark pixels")
-                print(f"    Artifact confidence: {artifact_confidence:.2f}%")
-
-                # Generate forensic sheet if diagnostic mode enabled
-                if self.diagnostic_mode and artifact_confidence > 1.0:
-                    output_dir = "forensic_output"
-                    os.makedirs(output_dir, exist_ok=True)
-
-                    output_path = f"{output_dir}/match_{redaction_idx:03d}_{best_match['name'].replace(' ', '_')}.png"
-                    self.halo_extractor.create_forensic_sheet(
-                        self.gray,
-                        halo_data,
-                        enhanced,
-                        (rx, ry, rw, rh),
-                        candidate_name=best_match['name'],
-                        output_path=output_path
-                    )
-                    print(f"    ✓ Forensic sheet saved: {output_path}")
-
-                best_match['redaction_idx'] = redaction_idx
-                best_match['redaction_coords'] = (rx, ry, rw, rh)
-
-                matches.append(best_match)
-            else:
-                # Show dynamic tolerance even when no match found
-                avg_tolerance = max(3.0, rw * 0.05)
-                print(f"  No match within tolerance (dynamic: ~{avg_tolerance:.2f}px)")
+            best_match['redaction_idx'] = redaction_idx
+            best_match['redaction_coords'] = (rx, ry, rw, rh)
+        elif verbose:
+            # Show dynamic tolerance even when no match found
+            avg_tolerance = max(3.0, rw * 0.05)
+            log(f"  No match within tolerance (dynamic: ~{avg_tolerance:.2f}px)")
 
-        return matches
+        return lines, best_match
 
     def generate_report(self, matches: list, output_path: str = "forensic_report.txt"):
         """Generate a text report of the analysis."""
@@ -414,6 +455,7 @@ def main():
 
     # Load candidates
     if args.csv:
+        import pandas as pd  # Only needed for --csv
         df = pd.read_csv(args.csv)
         candidates = df.to_dict('records')
     elif args.candidates:
@@ -3,14 +3,21 @@
 Final verification: "Anne Marie" against all three pillars
 """
 
-from PIL import ImageFont
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from width_cache import text_widths
 
 FONT_PATH = "fonts/fonts/times.ttf"
 TARGET_W = 962
 
 # Font setup
 font_size = int(12 * 1200 / 72)
-font = ImageFont.truetype(FONT_PATH, font_size)
+# Every width this report needs, measured once and cached on disk between runs
+widths = text_widths(FONT_PATH, font_size, [
+    "Anne Marie", *set("Anne Marie"), "Bill", "Andrew", "Maria Elena", "Sarah", "Nadia", "Hammond",
+])
 
 print("="*100)
 print("FINAL VERIFICATION: Three-Pillar Analysis for 'Anne Marie'")
@@ -18,7 +25,7 @@ print("="*100)
 
 # PILLAR 1: WIDTH ANALYSIS
 print(f"\n[✓] PILLAR 1: WIDTH ANALYSIS")
-anne_marie_width = font.getlength("Anne Marie")
+anne_marie_width = widths["Anne Marie"]
 diff = abs(anne_marie_width - TARGET_W)
 pct = diff / anne_marie_width * 100
 
@@ -57,7 +64,7 @@ for i, char in enumerate("Anne Marie"):
         width = 5
         print(f"  [{i+1}] ' ' (space): {width:.1f}px")
     else:
-        width = font.getlength(char)
+        width = widths[char]
         marker = ""
         if char == "A":
             marker = " ← First letter (UPPER)"
@@ -74,12 +81,12 @@ print(f"  Difference:       {abs(total - TARGET_W):.1f}px")
 print(f"\n[COMPARISON] Top candidates ranked by error:")
 
 candidates = [
-    ("Anne Marie", font.getlength("Anne Marie")),
-    ("Bill + Andrew", font.getlength("Bill") + 5 + font.getlength("Andrew")),
-    ("Andrew + Bill", font.getlength("Andrew") + 5 + font.getlength("Bill")),
-    ("Maria Elena", font.getlength("Maria Elena")),
-    ("Sarah + Nadia", font.getlength("Sarah") + 5 + font.getlength("Nadia")),
-    ("Hammond", font.getlength("Hammond")),
+    ("Anne Marie", widths["Anne Marie"]),
+    ("Bill + Andrew", widths["Bill"] + 5 + widths["Andrew"]),
+    ("Andrew + Bill", widths["Andrew"] + 5 + widths["Bill"]),
+    ("Maria Elena", widths["Maria Elena"]),
+    ("Sarah + Nadia", widths["Sarah"] + 5 + widths["Nadia"]),
+    ("Hammond", widths["Hammond"]),
 ]
 
 print(f"{'Candidate':<25} {'Width':<12} {'Diff':<10} {'Error':<10} {'Rating'}")
@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 """Verify Marcinkova against the 962px redaction"""
 
-from PIL import ImageFont
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from width_cache import text_widths
 
 FONT_PATH = "fonts/fonts/times.ttf"
 TARGET_W = 962
 
 font_size = int(12 * 1200 / 72)
-font = ImageFont.truetype(FONT_PATH, font_size)
+# Every width this report needs, measured once and cached on disk between runs
+widths = text_widths(FONT_PATH, font_size,
+                     ["Marcinkova", "Anne Marie", "Nadia Marcinkova", *set("Marcinkova")])
 
 print("="*80)
 print("VERIFICATION: Marcinkova vs Anne Marie")
@@ -16,7 +22,7 @@ print(f"\nTarget redaction width: {TARGET_W}px")
 
 # Test Marcinkova
 name = "Marcinkova"
-width = font.getlength(name)
+width = widths[name]
 diff = abs(width - TARGET_W)
 pct = diff / width * 100
 
@@ -26,7 +32,7 @@ print(f"  Difference: {diff:.1f}px ({pct:.2f}%)")
 print(f"  Letters: {len(name)}")
 
 # Test Anne Marie for comparison
-anne_marie = font.getlength("Anne Marie")
+anne_marie = widths["Anne Marie"]
 diff2 = abs(anne_marie - TARGET_W)
 pct2 = diff2 / anne_marie * 100
 
@@ -36,7 +42,7 @@ print(f"  Difference: {diff2:.1f}px ({pct2:.2f}%)")
 print(f"  Letters: {len('Anne Marie'.replace(' ', ''))}")
 
 # Test Nadia Marcinkova
-nadia_marcinkova = font.getlength("Nadia Marcinkova")
+nadia_marcinkova = widths["Nadia Marcinkova"]
 diff3 = abs(nadia_marcinkova - TARGET_W)
 pct3 = diff3 / nadia_marcinkova * 100
 
@@ -48,8 +54,8 @@ print(f"  Letters: {len('NadiaMarcinkova')}")
 # Letter-by-letter breakdown for Marcinkova
 print(f"\n[DETAIL] Letter breakdown for 'Marcinkova':")
 total = 0
-for char in "Marcinkova":
-    w = font.getlength(char)
+for char in name:
+    w = widths[char]
     total += w
     marker = ""
     if char == "M":
@@ -8,12 +8,12 @@ This ensures pixel-perfect forensic artifact integrity.
 
 import cv2
 import numpy as np
-from pdf2image import convert_from_path
 from PIL import Image, ImageFont, ImageDraw
 import os
 import sys
 sys.path.append(os.path.dirname(__file__))
-from label_utils import add_safe_header, add_safe_footer
+from label_utils import add_safe_header, add_safe_footer, hconcat_with_gutter
+from raster_cache import load_page
 
 FILE_PATH = "files/EFTA00037366.pdf"
 FONT_PATH = "fonts/fonts/times.ttf"
@@ -37,9 +37,8 @@ print("="*100)
 
 # Load document at 600 DPI
 print(f"\n[STEP 1] Loading document at 600 DPI...")
-images = convert_from_path(FILE_PATH, dpi=600)
-img = np.array(images[0])
-gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+# Cached grayscale page (rasterized by pdftoppm on first run)
+gray = load_page(FILE_PATH, dpi=600)
 
 # Extract the actual artifact region
 print(f"\n[STEP 2] Extracting actual artifacts...")
@@ -51,7 +50,12 @@ roi_w = min(gray.shape[1] - roi_x, MATCH_W + padding * 2)
 roi_h = min(gray.shape[0] - roi_y, MATCH_H + padding * 2)
 
 actual_roi = gray[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]
-actual_enhanced = cv2.normalize(actual_roi, None, 0, 255, cv2.NORM_MINMAX)
+# Min-max stretch: one min/max scan, then one scale pass. convertScaleAbs rounds
+# like cv2.normalize(NORM_MINMAX), so the output is bit-identical, including
+# all-zero for a flat ROI.
+roi_min, roi_max = int(actual_roi.min()), int(actual_roi.max())
+stretch = 255.0 / (roi_max - roi_min) if roi_max > roi_min else 0.0
+actual_enhanced = cv2.convertScaleAbs(actual_roi, alpha=stretch, beta=-roi_min * stretch)
 
 # Save actual artifact
 cv2.imwrite(f"{OUTPUT_DIR}/01_actual_artifact.png", actual_enhanced)
@@ -124,8 +128,7 @@ template_with_header = add_safe_header(template_color, "EXPECTED PATTERN", heade
 
 # Stack horizontally with gutter
 gutter_width = 30
-gutter = np.ones((actual_with_header.shape[0], gutter_width, 3), dtype=np.uint8) * 255
-comparison = np.hstack([actual_with_header, gutter, template_with_header])
+comparison = hconcat_with_gutter([actual_with_header, template_with_header], gutter_width)
 cv2.imwrite(f"{OUTPUT_DIR}/06_comparison.png", comparison)
 print(f"  ✓ Saved: {OUTPUT_DIR}/06_comparison.png")
 
@@ -141,8 +144,7 @@ actual_edges_with_header = add_safe_header(actual_edges_color, "ACTUAL EDGES", h
 template_edges_with_header = add_safe_header(template_edges_color, "EXPECTED EDGES", header_height=40, text_color=(0, 200, 0))
 
 # Stack horizontally with gutter
-gutter = np.ones((actual_edges_with_header.shape[0], gutter_width, 3), dtype=np.uint8) * 255
-edge_comparison = np.hstack([actual_edges_with_header, gutter, template_edges_with_header])
+edge_comparison = hconcat_with_gutter([actual_edges_with_header, template_edges_with_header], gutter_width)
 cv2.imwrite(f"{OUTPUT_DIR}/07_edge_comparison.png", edge_comparison)
 print(f"  ✓ Saved: {OUTPUT_DIR}/07_edge_comparison.png")
 
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of font advance widths.
+
+The verify scripts load Times at 1200 DPI and measure the same names and
+letters on every run. This module keeps the ImageFont.getlength() results
+as JSON next to the cached page rasters, keyed by the font file's absolute
+path, modification time and pixel size, so later runs never load the font.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sys
+from PIL import ImageFont
+
+sys.path.append(os.path.dirname(__file__))
+from raster_cache import CACHE_DIR
+
+
+def _cache_path(font_path: str, size_px: int) -> str:
+    """Cache file for one font size; changes whenever the font file is modified."""
+    abspath = os.path.abspath(font_path)
+    mtime = os.stat(abspath).st_mtime
+    key = f"{abspath}|{mtime}|{size_px}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.widths.json")
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_widths(font_path: str, size_px: int) -> dict:
+    """Widths stored on disk for one font size, loaded once per process."""
+    path = _cache_path(font_path, size_px)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def text_widths(font_path: str, size_px: int, texts) -> dict:
+    """
+    ImageFont.getlength() of each text, reusing the on-disk cache.
+
+    Args:
+        font_path: Path to the TrueType font
+        size_px: Font size in pixels
+        texts: Strings to measure
+
+    Returns:
+        Dictionary mapping each text to its advance width in pixels
+    """
+    widths = _cached_widths(font_path, size_px)
+    missing = [text for text in dict.fromkeys(texts) if text not in widths]
+    if missing:
+        font = ImageFont.truetype(font_path, size_px)
+        for text in missing:
+            widths[text] = font.getlength(text)
+
+        path = _cache_path(font_path, size_px)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temp name first so an interrupted run never leaves a bad cache entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(widths, f)
+        os.replace(tmp_path, path)
+    return {text: widths[text] for text in texts}
+
+
+def get_width(font_path: str, size_px: int, text: str) -> float:
+    """text_widths() for a single string."""
+    return text_widths(font_path, size_px, [text])[text]
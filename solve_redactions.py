@@ -12,29 +12,29 @@ Author: Unredactron Master Module
 """
 
 import argparse
+import csv
 import sys
 import os
-import pandas as pd
+import re
 from typing import List, Dict, Optional
-from pdf2image import convert_from_path
-import cv2
-import numpy as np
-from contextlib import redirect_stdout, suppress
-import io
+from concurrent.futures import ThreadPoolExecutor
 
 # Add helpers to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'helpers'))
 
-from helpers.detect_font_v2 import detect_best_font
-from helpers.unredactron_forensic import ForensicRedactionAnalyzer
-from helpers.letter_reconstruction import verify_artifact_pattern
-from helpers.generate_evidence_card import EvidenceCardGenerator
+# Letters whose tall strokes make the evidence card's highlight easy to read
+HIGHLIGHT_RE = re.compile('[bdfhijkltABDFHIJKLT]')
 
 
 def load_candidates(csv_path: str) -> List[Dict]:
     """Load candidates from CSV file."""
-    df = pd.read_csv(csv_path)
-    return df.to_dict('records')
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        candidates = list(csv.DictReader(f))
+    # Confidences are numbers downstream; blanks become NaN as with pandas
+    for candidate in candidates:
+        if 'confidence' in candidate:
+            candidate['confidence'] = float(candidate['confidence'] or 'nan')
+    return candidates
 
 
 def run_master_analysis(
@@ -59,6 +59,13 @@ def run_master_analysis(
     Returns:
         Dictionary with analysis results
     """
+    # Deferred so --help and input validation do not pay for OpenCV/Tesseract imports
+    from helpers.detect_font_v2 import detect_best_font
+    from helpers.unredactron_forensic import ForensicRedactionAnalyzer
+    from helpers.letter_reconstruction import verify_artifact_pattern
+    from helpers.generate_evidence_card import EvidenceCardGenerator
+    from helpers.raster_cache import load_page_mmap
+
     results = {
         'pdf_path': pdf_path,
         'matches': [],
@@ -70,10 +77,13 @@ def run_master_analysis(
     # ========================================================================
     print(f"[*] Analyzing {pdf_path}...")
 
-    # Suppress verbose output from font detection
-    null_fd = io.StringIO()
-    with redirect_stdout(null_fd):
-        font_profile = detect_best_font(pdf_path, verbose=False)
+    # Font detection (its own render + OCR) does not need the analysis page; render
+    # that into the raster cache meanwhile; both wait on subprocesses outside the GIL.
+    # detect_best_font only prints when verbose
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        font_future = executor.submit(detect_best_font, pdf_path, verbose=False)
+        load_page_mmap(pdf_path, dpi)
+        font_profile = font_future.result()
 
     if font_profile is None:
         print("[!] Font detection failed, using fallback: times.ttf")
@@ -104,14 +114,13 @@ def run_master_analysis(
     # Find redactions
     redactions = analyzer.find_redactions()
 
-    # Match candidates (suppress verbose output)
-    null_fd = io.StringIO()
-    with redirect_stdout(null_fd):
-        matches = analyzer.match_candidates_to_redactions(
-            candidates=candidates,
-            redactions=redactions,
-            scale_factor=scale_factor
-        )
+    # Match candidates without the per-redaction report
+    matches = analyzer.match_candidates_to_redactions(
+        candidates=candidates,
+        redactions=redactions,
+        scale_factor=scale_factor,
+        verbose=False
+    )
 
     # Filter for high-confidence matches (>90%)
     high_confidence_matches = [
@@ -187,11 +196,8 @@ def run_master_analysis(
         evidence_path = f"{evidence_output_dir}/match_{i:03d}_{safe_name}.png"
 
         # Find highlight position if there are ascenders
-        highlight_pos = None
-        for j, char in enumerate(candidate_name):
-            if char in 'bdfhijkltABDFHIJKLT':
-                highlight_pos = j
-                break
+        highlight = HIGHLIGHT_RE.search(candidate_name)
+        highlight_pos = highlight.start() if highlight else None
 
         try:
             output_path = evidence_generator.create_evidence_card(
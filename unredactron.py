@@ -6,16 +6,22 @@ Uses width analysis + CSV candidate database to identify redacted text
 Now with automated typographic profiling for font detection!
 """
 
-import cv2
+import io
 import numpy as np
-from pdf2image import convert_from_path
-from PIL import ImageFont
 import csv
 import sys
 import argparse
 
 # Import the font profiler
 from font_profiler import FontProfiler
+from helpers.pipeline import boxes_to_tuples, locate_bars
+from helpers.raster_cache import load_page_mmap
+from helpers.width_cache import text_widths
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
 
 # Configuration
 FILE_PATH = "files/EFTA00037366.pdf"
@@ -23,30 +29,92 @@ FONT_PATH = "fonts/fonts/times.ttf"
 CANDIDATES_CSV = "candidates.csv"
 OUTPUT_DIR = "analysis_output"
 
-def load_candidates(csv_path):
-    """Load candidates from simple CSV format"""
+
+# score_redactions(expected, confidences, ws) -> (best, score, pct_error):
+# per redaction width, the first candidate with the lowest combined score
+# (width % error - confidence / 10), its score and its % error. Candidates
+# with a non-positive expected width count as a 100% error.
+def _score_redactions_numpy(expected, confidences, ws):
+    """Score every redaction against every candidate as one (R, C) matrix."""
+    positive = expected > 0
+    safe = np.where(positive, expected, 1.0)
+    pct_errors = np.where(positive, np.abs(expected - ws[:, None]) / safe * 100, 100.0)
+    scores = pct_errors - confidences / 10
+    best = scores.argmin(axis=1)
+    rows = np.arange(ws.size)
+    return best, scores[rows, best], pct_errors[rows, best]
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def score_redactions(expected, confidences, ws):
+        # One fused pass per redaction, no (R, C) temporaries; redactions run in parallel
+        n = ws.size
+        best = np.empty(n, dtype=np.int64)
+        best_scores = np.empty(n, dtype=np.float64)
+        best_pcts = np.empty(n, dtype=np.float64)
+        for r in prange(n):
+            w = ws[r]
+            bi, bs, bp = 0, np.inf, 100.0
+            for c in range(expected.size):
+                e = expected[c]
+                pct = abs(e - w) / e * 100 if e > 0 else 100.0
+                score = pct - confidences[c] / 10
+                if score < bs:
+                    bi, bs, bp = c, score, pct
+            best[r] = bi
+            best_scores[r] = bs
+            best_pcts[r] = bp
+        return best, best_scores, best_pcts
+else:
+    score_redactions = _score_redactions_numpy
+
+
+def load_candidates(csv_path, keep_duplicates=False):
+    """Load candidates from simple CSV format
+
+    Names listed more than once are kept once, at their highest confidence,
+    unless keep_duplicates is set.
+    """
     candidates = []
 
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            # Resolve column positions once instead of building a dict per row
+            columns = next(reader, [])
+            if 'name' not in columns:
+                return []
+            name_col = columns.index('name')
+            conf_col = columns.index('confidence') if 'confidence' in columns else None
+            notes_col = columns.index('notes') if 'notes' in columns else None
+
             for row in reader:
-                name = row.get('name', '').strip()
+                name = row[name_col].strip() if name_col < len(row) else ''
                 if not name or name.startswith('#'):  # Skip empty lines and comments
                     continue
 
-                confidence = float(row.get('confidence', 0)) if row.get('confidence') else 0
-                notes = row.get('notes', '')
+                confidence = row[conf_col] if conf_col is not None and conf_col < len(row) else ''
+                notes = row[notes_col] if notes_col is not None and notes_col < len(row) else ''
 
                 candidates.append({
                     'name': name,
-                    'confidence': confidence,
+                    'confidence': float(confidence) if confidence else 0,
                     'notes': notes
                 })
 
-        # Sort by confidence (highest first)
+        # Sort by confidence (highest first); the sort is stable, so the first
+        # occurrence of a name is its best-ranked one
         candidates.sort(key=lambda x: x['confidence'], reverse=True)
-        return candidates
+        if keep_duplicates:
+            return candidates
+        seen = set()
+        unique = []
+        for candidate in candidates:
+            if candidate['name'] not in seen:
+                seen.add(candidate['name'])
+                unique.append(candidate)
+        return unique
 
     except FileNotFoundError:
         print(f"Warning: {csv_path} not found. Using empty candidate list.")
@@ -70,78 +138,70 @@ def analyze_pdf(file_path, font_path, candidates, dpi=1200, font_profile=None):
     # Load PDF
     print(f"\nLoading PDF: {file_path}")
     print(f"Resolution: {dpi} DPI")
-    images = convert_from_path(file_path, dpi=dpi)
-    img = np.array(images[0])
-    gray = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-    gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+    # Read-only memmap of the cached grayscale page (pdftoppm -gray on the first run)
+    gray = load_page_mmap(file_path, dpi)
 
-    # Load font (use profile if available, otherwise fallback)
+    # Pick the font (use profile if available, otherwise fallback); it is only
+    # loaded if some candidate width is missing from the on-disk width cache
     if font_profile:
         font_size = int(font_profile.font_size)
-        font = ImageFont.truetype(font_profile.font_path, font_size)
+        font_file = font_profile.font_path
         scale_factor = font_profile.scale_factor
         tracking_offset = font_profile.tracking_offset
         print(f"Using auto-detected font: {font_profile.font_name}")
         print(f"Font size: {font_size}pt, Scale factor: {scale_factor:.4f}, Tracking: {tracking_offset:+.2f}px")
     else:
         font_size = int(12 * dpi / 72)
-        font = ImageFont.truetype(font_path, font_size)
+        font_file = font_path
         scale_factor = dpi / 72  # Basic DPI scaling
         tracking_offset = 0
         print(f"Using fallback font: {font_path}")
 
     # Find redactions
     print(f"Detecting redactions...")
-    _, black_mask = cv2.threshold(gray, 5, 255, cv2.THRESH_BINARY_INV)
-    contours, _ = cv2.findContours(black_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-    redactions = [(x, y, w, h) for cnt in contours
-                  for x, y, w, h in [cv2.boundingRect(cnt)]
-                  if w > 200 and h > 100]
+    # Located on a 150 DPI render; exact boxes come from the full-DPI page
+    redactions = boxes_to_tuples(locate_bars(file_path, gray, dpi, threshold=5, min_w=200, min_h=100))
 
     print(f"Found {len(redactions)} significant redactions")
     print(f"Testing {len(candidates)} candidates")
-
-    # Analyze each redaction
+    if not candidates:
+        return [], gray.shape
+
+    # Only names missing from the on-disk width cache get rendered
+    names = [candidate['name'] for candidate in candidates]
+    confidences = np.array([candidate['confidence'] for candidate in candidates], dtype=np.float64)
+    widths = text_widths(font_file, font_size, names)
+    base_widths = np.array([widths[name] for name in names], dtype=np.float64)
+    name_lengths = np.array([len(name) for name in names])
+    expected_widths = base_widths * scale_factor + (name_lengths * tracking_offset)
+
+    # Combined score: width error - (confidence / 10)
+    # Confidence acts as tie-breaker
+    ws = np.array([w for _, _, w, _ in redactions], dtype=np.float64)
+    best, scores, pct_errors = score_redactions(expected_widths, confidences, ws)
+
+    # Keep the plausible matches and order them by error percentage on the
+    # kernel's arrays; a stable sort keeps redaction order among equal errors
+    matched = np.flatnonzero((scores < 100) & (pct_errors < 30))
+    matched = matched[np.argsort(pct_errors[matched], kind='stable')]
+
+    # One result per matched redaction, already sorted by pct_error
     results = []
-    for i, (x, y, w, h) in enumerate(redactions):
-        best_match = None
-        best_error = 100
-
-        for candidate in candidates:
-            name = candidate['name']
-            confidence = candidate['confidence']
-
-            # Calculate expected width with calibration
-            base_width = font.getlength(name)
-            expected_width = base_width * scale_factor + (len(name) * tracking_offset)
-            diff = abs(expected_width - w)
-            pct_error = diff / expected_width * 100 if expected_width > 0 else 100
-
-            # Combined score: width error - (confidence / 10)
-            # Confidence acts as tie-breaker
-            combined_score = pct_error - (confidence / 10)
-
-            if combined_score < best_error:
-                best_error = combined_score
-                best_match = {
-                    'redaction_id': i,
-                    'position': (x, y),
-                    'size': (w, h),
-                    'candidate': name,
-                    'confidence': confidence,
-                    'expected_width': expected_width,
-                    'actual_width': w,
-                    'diff': diff,
-                    'pct_error': pct_error,
-                    'notes': candidate['notes']
-                }
-
-        if best_match and best_match['pct_error'] < 30:
-            results.append(best_match)
-
-    # Sort by error percentage
-    results.sort(key=lambda r: r['pct_error'])
+    for i in matched.tolist():
+        x, y, w, h = redactions[i]
+        c = int(best[i])
+        results.append({
+            'redaction_id': i,
+            'position': (x, y),
+            'size': (w, h),
+            'candidate': names[c],
+            'confidence': candidates[c]['confidence'],
+            'expected_width': float(expected_widths[c]),
+            'actual_width': w,
+            'diff': float(abs(expected_widths[c] - w)),
+            'pct_error': float(pct_errors[i]),
+            'notes': candidates[c]['notes']
+        })
 
     return results, gray.shape
 
@@ -153,33 +213,36 @@ def display_results(results, image_shape, font_profile=None):
         image_shape: Shape of the analyzed image
         font_profile: Optional FontProfile object to display
     """
+    # The report is built in memory and written once instead of one write per line
+    buf = io.StringIO()
 
     if font_profile:
-        print(f"\n{'='*100}")
-        print("FORENSIC DOCUMENT PROFILE")
-        print(f"{'='*100}")
-        print(f"  Detected Font:     {font_profile.font_name}")
-        print(f"  Font Size:         {font_profile.font_size:.1f} pt")
-        print(f"  Tracking Offset:   {font_profile.tracking_offset:+.2f} px")
-        print(f"  Kerning Mode:      {font_profile.kerning_mode}")
-        print(f"  Scale Factor:      {font_profile.scale_factor:.4f}")
-        print(f"  Confidence:        {font_profile.confidence:.1f}%")
+        print(f"\n{'='*100}", file=buf)
+        print("FORENSIC DOCUMENT PROFILE", file=buf)
+        print(f"{'='*100}", file=buf)
+        print(f"  Detected Font:     {font_profile.font_name}", file=buf)
+        print(f"  Font Size:         {font_profile.font_size:.1f} pt", file=buf)
+        print(f"  Tracking Offset:   {font_profile.tracking_offset:+.2f} px", file=buf)
+        print(f"  Kerning Mode:      {font_profile.kerning_mode}", file=buf)
+        print(f"  Scale Factor:      {font_profile.scale_factor:.4f}", file=buf)
+        print(f"  Confidence:        {font_profile.confidence:.1f}%", file=buf)
         print(f"  Reference:         '{font_profile.reference_word}' "
-              f"({font_profile.reference_width:.1f}px)")
-        print(f"  Accuracy Score:    {font_profile.calibration_accuracy:.2f}%")
-        print(f"{'='*100}\n")
+              f"({font_profile.reference_width:.1f}px)", file=buf)
+        print(f"  Accuracy Score:    {font_profile.calibration_accuracy:.2f}%", file=buf)
+        print(f"{'='*100}\n", file=buf)
 
     if not results:
-        print("\nNo matches found!")
+        print("\nNo matches found!", file=buf)
+        sys.stdout.write(buf.getvalue())
         return
 
-    print(f"\n{'='*100}")
-    print(f"DETECTED REDACTIONS - {len(results)} matches found")
-    print(f"{'='*100}")
+    print(f"\n{'='*100}", file=buf)
+    print(f"DETECTED REDACTIONS - {len(results)} matches found", file=buf)
+    print(f"{'='*100}", file=buf)
 
     print(f"\n{'Rank':<6} {'Detected Name':<30} {'Position':<18} {'Size':<12} "
-          f"{'Width':<12} {'Diff':<10} {'Error':<8} {'Conf':<6}")
-    print("-"*130)
+          f"{'Width':<12} {'Diff':<10} {'Error':<8} {'Conf':<6}", file=buf)
+    print("-"*130, file=buf)
 
     for i, match in enumerate(results[:20], 1):
         pos_str = f"({match['position'][0]}, {match['position'][1]})"
@@ -200,27 +263,28 @@ def display_results(results, image_shape, font_profile=None):
 
         print(f"{i:<6} {match['candidate']:<30} {pos_str:<18} {size_str:<12} "
               f"{match['expected_width']:>8.1f}px  {match['diff']:>6.1f}px   "
-              f"{match['pct_error']:>5.1f}%   {conf_display:<5} {rating}")
+              f"{match['pct_error']:>5.1f}%   {conf_display:<5} {rating}", file=buf)
 
-    # Statistics
-    perfect = sum(1 for r in results if r['pct_error'] < 1)
-    excellent = sum(1 for r in results if r['pct_error'] < 5)
-    good = sum(1 for r in results if r['pct_error'] < 10)
+    # Statistics: results are sorted by pct_error, so each count is a binary search
+    errors = np.fromiter((r['pct_error'] for r in results), dtype=np.float64, count=len(results))
+    perfect, excellent, good = (int(n) for n in np.searchsorted(errors, [1, 5, 10]))
 
-    print(f"\n{'='*100}")
-    print(f"STATISTICS:")
-    print(f"  Total matches: {len(results)}")
-    print(f"  Perfect (<1%): {perfect}")
-    print(f"  Excellent (<5%): {excellent}")
-    print(f"  Good (<10%): {good}")
-    print(f"{'='*100}")
+    print(f"\n{'='*100}", file=buf)
+    print(f"STATISTICS:", file=buf)
+    print(f"  Total matches: {len(results)}", file=buf)
+    print(f"  Perfect (<1%): {perfect}", file=buf)
+    print(f"  Excellent (<5%): {excellent}", file=buf)
+    print(f"  Good (<10%): {good}", file=buf)
+    print(f"{'='*100}", file=buf)
 
     # Show notes for top matches
-    print(f"\nTOP 5 - WITH NOTES:")
+    print(f"\nTOP 5 - WITH NOTES:", file=buf)
     for i, match in enumerate(results[:5], 1):
-        print(f"\n{i}. {match['candidate']} ({match['pct_error']:.1f}% error)")
+        print(f"\n{i}. {match['candidate']} ({match['pct_error']:.1f}% error)", file=buf)
         if match['notes']:
-            print(f"   Note: {match['notes']}")
+            print(f"   Note: {match['notes']}", file=buf)
+
+    sys.stdout.write(buf.getvalue())
 
 def main():
     """Main entry point"""
@@ -233,6 +297,8 @@ def main():
     parser.add_argument('--dpi', type=int, default=1200, help='Document DPI')
     parser.add_argument('--no-profile', action='store_true', help='Skip automatic font profiling')
     parser.add_argument('--save-profile', type=str, help='Save detected profile to file')
+    parser.add_argument('--keep-duplicates', action='store_true',
+                        help='Keep every CSV row for names listed more than once')
     args = parser.parse_args()
 
     # Step 1: Automatic Font Profiling (unless disabled)
@@ -257,7 +323,7 @@ def main():
     print("STEP 2: CANDIDATE LOADING")
     print(f"{'='*100}")
     print(f"Loading candidates from: {args.csv}")
-    candidates = load_candidates(args.csv)
+    candidates = load_candidates(args.csv, args.keep_duplicates)
 
     if not candidates:
         print("Warning: No candidates loaded!")